@@ -0,0 +1,168 @@
+"""Offline latency benchmarks for every baseball-cli command.
+
+Starts the StatsAPI stub server, runs each command as a separate
+`python -m src.cli` process pointed at it, and reports p50/p95 wall time,
+StatsAPI requests and response bytes per run.
+
+    python bench/run_benchmarks.py --iterations 5 --latency 25
+    python bench/run_benchmarks.py --warm      # reuse cache and indexes between runs
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from stub_server import player_ids, start_stub_server
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEAM_SIZES = (1, 5, 10, 20, 40)
+
+
+def team_csv(path, user, size):
+    """Write a --fantasy-import CSV putting `size` stub players on a user's team."""
+    ids = [pid for team_id in range(101, 131) for pid in player_ids(team_id)][:size]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("user,player,player_id\n")
+        for pid in ids:
+            f.write(f"{user},Stub Player {pid},{pid}\n")
+
+
+def benchmark_cases():
+    """Return (name, setup argv or None, timed argv) for every benchmarked command."""
+    cases = [
+        ("player season", None, ["--player", "Stub Player 10101", "--season", "2024"]),
+        ("player career", None, ["--player", "Stub Player 10101", "--career"]),
+        ("compare", None, ["--compare", "Stub Player 10101", "Stub Player 10214"]),
+        ("team stats", None, ["--team", "Stubs3"]),
+        ("roster", None, ["--roster", "Stubs3"]),
+        ("fantasy score", None, ["--fantasy-score", "Stub Player 10101", "--season", "2024"]),
+    ]
+    for size in TEAM_SIZES:
+        cases.append(
+            (
+                f"team score x{size}",
+                ["--fantasy-import", f"team{size}.csv"],
+                ["--fantasy-team-score", f"team{size}"],
+            )
+        )
+    cases.append(
+        (
+            "incremental score x20",
+            ["--fantasy-import", "team20.csv"],
+            ["--fantasy-team-score", "team20", "--incremental"],
+        )
+    )
+    cases.append(
+        (
+            "project x20",
+            ["--fantasy-import", "team20.csv"],
+            ["--project", "team20", "--games-left", "60", "--simulations", "2000"],
+        )
+    )
+    cases.append(("leaderboard (ingest)", None, ["--leaderboard", "10"]))
+    return cases
+
+
+def fetch_json(url):
+    """GET a stub server control URL and decode the JSON reply."""
+    with urllib.request.urlopen(url, timeout=10) as res:
+        return json.loads(res.read())
+
+
+def run_cli(argv, workdir, env):
+    """Run one baseball-cli command and return its wall time in seconds."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "src.cli", *argv],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv)} failed: {result.stderr.decode()}")
+    return elapsed
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def prepare_workdir(workdir):
+    """Create a working directory holding the team CSVs used by the team-score cases."""
+    os.makedirs(workdir, exist_ok=True)
+    for size in TEAM_SIZES:
+        team_csv(os.path.join(workdir, f"team{size}.csv"), f"team{size}", size)
+
+
+# pylint: disable=too-many-locals
+def run_benchmarks(iterations, latency_ms, warm):
+    """Run every case and return result rows."""
+    server = start_stub_server(latency_ms=latency_ms)
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, BASEBALL_CLI_API_URL=server.base_url)
+    root = tempfile.mkdtemp(prefix="baseball-bench-")
+    rows = []
+    try:
+        for name, setup, argv in benchmark_cases():
+            times = []
+            requests = []
+            sizes = []
+            workdir = os.path.join(root, "warm")
+            for i in range(iterations):
+                if not warm:
+                    workdir = os.path.join(root, f"{len(rows)}-{i}")
+                if not os.path.isdir(workdir):
+                    prepare_workdir(workdir)
+                if setup:
+                    run_cli(setup, workdir, env)
+                fetch_json(f"{server.base_url}/__reset")
+                times.append(run_cli(argv, workdir, env))
+                counters = fetch_json(f"{server.base_url}/__stats")
+                requests.append(counters["requests"])
+                sizes.append(counters["bytes"])
+            rows.append(
+                (
+                    name,
+                    percentile(times, 50) * 1000,
+                    percentile(times, 95) * 1000,
+                    statistics.mean(requests),
+                    statistics.mean(sizes),
+                )
+            )
+    finally:
+        server.shutdown()
+        shutil.rmtree(root, ignore_errors=True)
+    return rows
+
+
+def main():
+    """Parse arguments, run the benchmarks and print a report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=20, help="Stub latency per request in ms.")
+    parser.add_argument(
+        "--warm", action="store_true", help="Keep caches and indexes between iterations."
+    )
+    args = parser.parse_args()
+    rows = run_benchmarks(args.iterations, args.latency, args.warm)
+    mode = "warm" if args.warm else "cold"
+    print(f"{args.iterations} iterations, {args.latency:g} ms stub latency, {mode} caches")
+    print(f"{'command':<22} {'p50 ms':>9} {'p95 ms':>9} {'requests':>9} {'bytes':>10}")
+    for name, p50, p95, requests, size in rows:
+        print(f"{name:<22} {p50:>9.1f} {p95:>9.1f} {requests:>9.1f} {size:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
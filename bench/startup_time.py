@@ -0,0 +1,92 @@
+"""Startup-time benchmark for baseball-cli.
+
+Runs commands that do no network work (help, a fantasy team listing, and
+a player lookup answered from the warm response cache) as fresh
+`python -m src.cli` processes and reports p50/p95 wall time, then prints
+the slowest imports of one run as measured by `python -X importtime`.
+
+    python bench/startup_time.py --iterations 20
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from run_benchmarks import percentile, run_cli
+from stub_server import start_stub_server
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+CASES = (
+    ("--help", ["--help"]),
+    ("fantasy list", ["--fantasy-list", "bench"]),
+    ("player (cached)", ["--player", "Stub Player 10101", "--season", "2024"]),
+)
+
+
+def import_trace(argv, workdir, env):
+    """Run one baseball-cli process under -X importtime and return its import report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.cli", *argv],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    return result.stderr.decode()
+
+
+def slowest_imports(importtime_output, top=15):
+    """Return (cumulative ms, self ms, module) for the top-level imports with the largest totals."""
+    rows = []
+    for match in IMPORT_RE.finditer(importtime_output):
+        self_us, cumulative_us, indent, module = match.groups()
+        if len(indent) == 1:
+            rows.append((int(cumulative_us) / 1000, int(self_us) / 1000, module))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    """Parse arguments, run the startup benchmark and print the report."""
+    parser = argparse.ArgumentParser(description="Measure baseball-cli process startup time.")
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    server = start_stub_server(latency_ms=0)
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, BASEBALL_CLI_API_URL=server.base_url)
+    workdir = tempfile.mkdtemp(prefix="baseball-startup-")
+    try:
+        baseline = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+            baseline.append(time.perf_counter() - start)
+        for _, argv in CASES:
+            run_cli(argv, workdir, env)  # warm the response cache and create the databases
+        print(f"{'command':<20} {'p50 ms':>8} {'p95 ms':>8}")
+        print("-" * 38)
+        print(f"{'python -c pass':<20} {percentile(baseline, 50) * 1000:>8.1f}")
+        for name, argv in CASES:
+            times = [run_cli(argv, workdir, env) for _ in range(args.iterations)]
+            print(
+                f"{name:<20} {percentile(times, 50) * 1000:>8.1f} "
+                f"{percentile(times, 95) * 1000:>8.1f}"
+            )
+        trace = import_trace(CASES[-1][1], workdir, env)
+        print(f"\nSlowest top-level imports for `{' '.join(CASES[-1][1])}`:")
+        for cumulative, self_ms, module in slowest_imports(trace):
+            print(f"  {module:<32} {cumulative:>7.1f} ms (self {self_ms:.1f} ms)")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
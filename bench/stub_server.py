@@ -0,0 +1,341 @@
+"""Local stand-in for the MLB StatsAPI, serving a deterministic synthetic league.
+
+Mimics /teams, /teams/{id}/roster, /teams/{id}/stats, /people (including
+game-log hydrates), /people/{id} and /people/search with optional
+per-request latency, and counts requests and response bytes (GET /__stats,
+POST or GET /__reset).
+
+    python bench/stub_server.py --port 8765 --latency 25
+    baseball-cli --api-url http://127.0.0.1:8765 --player "Stub Player 10101"
+"""
+
+import argparse
+import datetime
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TEAM_COUNT = 30
+ROSTER_SIZE = 26
+FIRST_PITCHER = 14
+POSITIONS = ["C", "1B", "2B", "SS", "3B", "LF", "CF", "RF", "DH", "C", "2B", "SS", "CF"]
+SEASON_RE = re.compile(r"season=(\d{4})")
+START_DATE_RE = re.compile(r"startDate=(\d{4}-\d{2}-\d{2})")
+# Team games in each synthetic game log, one a day from the season's opening day.
+GAME_LOG_GAMES = 120
+OPENING_DAY = (3, 27)
+
+
+def team(index):
+    """Return the synthetic team dict for a 1-based team index."""
+    return {
+        "id": 100 + index,
+        "name": f"Stub City {index} Stubs{index}",
+        "teamName": f"Stubs{index}",
+        "locationName": f"Stub City {index}",
+        "abbreviation": f"S{index:02d}",
+        "shortName": f"Stub City {index}",
+        "sport": {"id": 1},
+    }
+
+
+TEAMS = [team(i) for i in range(1, TEAM_COUNT + 1)]
+
+
+def player_ids(team_id):
+    """Return the player IDs on a team's roster."""
+    return [team_id * 100 + k for k in range(1, ROSTER_SIZE + 1)]
+
+
+def is_known_player(player_id):
+    """Return True if the ID belongs to a synthetic rostered player."""
+    team_id, slot = divmod(player_id, 100)
+    return 101 <= team_id <= 100 + TEAM_COUNT and 1 <= slot <= ROSTER_SIZE
+
+
+def position(player_id):
+    """Return a player's position abbreviation."""
+    slot = player_id % 100
+    return "P" if slot >= FIRST_PITCHER else POSITIONS[slot - 1]
+
+
+def season_stat(player_id, season, group):
+    """Return a deterministic season stat line for a player."""
+    rng = random.Random(player_id * 10000 + int(season))
+    if group == "pitching":
+        starter = player_id % 100 < 20
+        outs = rng.randint(300, 550) if starter else rng.randint(90, 220)
+        return {
+            "gamesPitched": rng.randint(28, 33) if starter else rng.randint(45, 70),
+            "gamesStarted": rng.randint(26, 33) if starter else 0,
+            "inningsPitched": f"{outs // 3}.{outs % 3}",
+            "hits": rng.randint(outs // 4, outs // 3),
+            "earnedRuns": rng.randint(outs // 15, outs // 8),
+            "baseOnBalls": rng.randint(outs // 25, outs // 10),
+            "strikeOuts": rng.randint(outs // 5, outs // 3),
+            "wins": rng.randint(0, 16) if starter else rng.randint(0, 6),
+            "losses": rng.randint(0, 12) if starter else rng.randint(0, 6),
+            "saves": 0 if starter else rng.randint(0, 35),
+            "holds": 0 if starter else rng.randint(0, 25),
+            "era": f"{rng.uniform(2.2, 5.5):.2f}",
+        }
+    at_bats = rng.randint(250, 620)
+    hits = int(at_bats * rng.uniform(0.21, 0.31))
+    return {
+        "gamesPlayed": rng.randint(80, 160),
+        "atBats": at_bats,
+        "runs": rng.randint(30, 110),
+        "hits": hits,
+        "homeRuns": rng.randint(2, 45),
+        "totalBases": hits + rng.randint(20, 140),
+        "rbi": rng.randint(25, 120),
+        "baseOnBalls": rng.randint(15, 100),
+        "strikeOuts": rng.randint(40, 190),
+        "stolenBases": rng.randint(0, 40),
+        "avg": f"{hits / at_bats:.3f}"[1:],
+    }
+
+
+def game_stat(player_id, season, group, game):
+    """
+    Return a player's stat line for one team game, or None if they did not
+    play: hitters play most games, starters every fifth and relievers
+    every third.
+    """
+    rng = random.Random((player_id * 10000 + int(season)) * 1000 + game)
+    if group == "pitching":
+        starter = player_id % 100 < 20
+        if game % (5 if starter else 3) != player_id % (5 if starter else 3):
+            return None
+        outs = rng.randint(12, 21) if starter else rng.randint(2, 4)
+        return {
+            "gamesPitched": 1,
+            "gamesStarted": int(starter),
+            "inningsPitched": f"{outs // 3}.{outs % 3}",
+            "hits": rng.randint(0, outs // 3),
+            "earnedRuns": rng.randint(0, outs // 5),
+            "baseOnBalls": rng.randint(0, 2),
+            "strikeOuts": rng.randint(0, outs // 2),
+            "wins": int(starter and rng.random() < 0.35),
+            "losses": int(starter and rng.random() < 0.3),
+            "saves": int(not starter and rng.random() < 0.2),
+            "holds": int(not starter and rng.random() < 0.2),
+        }
+    if rng.random() < 0.1:
+        return None
+    at_bats = rng.randint(3, 5)
+    hits = sum(rng.random() < 0.26 for _ in range(at_bats))
+    home_runs = int(hits and rng.random() < 0.15)
+    return {
+        "gamesPlayed": 1,
+        "atBats": at_bats,
+        "runs": rng.randint(0, 1 + home_runs),
+        "hits": hits,
+        "homeRuns": home_runs,
+        "totalBases": hits + home_runs * 3,
+        "rbi": rng.randint(0, 1 + home_runs),
+        "baseOnBalls": int(rng.random() < 0.09),
+        "strikeOuts": rng.randint(0, 2),
+        "stolenBases": int(rng.random() < 0.05),
+    }
+
+
+def game_log(player_id, season, group, start_date=None):
+    """Return a player's game-log splits for a season, from start_date on."""
+    opening = datetime.date(int(season), *OPENING_DAY)
+    splits = []
+    for game in range(GAME_LOG_GAMES):
+        date = (opening + datetime.timedelta(days=game)).isoformat()
+        stat = None if start_date and date < start_date else game_stat(player_id, season, group, game)
+        if stat is not None:
+            splits.append(
+                {"date": date, "game": {"gamePk": int(season) * 1000 + game}, "stat": stat}
+            )
+    return splits
+
+
+def person(player_id, hydrate=""):
+    """Return a /people entry, hydrated with season or career stats if requested."""
+    pos = position(player_id)
+    entry = {
+        "id": player_id,
+        "fullName": f"Stub Player {player_id}",
+        "primaryPosition": {"abbreviation": pos, "name": "Pitcher" if pos == "P" else pos},
+        "currentTeam": {"id": player_id // 100},
+    }
+    if "stats(" not in hydrate:
+        return entry
+    group = "pitching" if pos == "P" else "hitting"
+    if "gameLog" in hydrate:
+        match = SEASON_RE.search(hydrate)
+        season = match.group(1) if match else "2025"
+        start = START_DATE_RE.search(hydrate)
+        splits = game_log(player_id, season, group, start and start.group(1))
+        entry["stats"] = [
+            {"group": {"displayName": group}, "type": {"displayName": "gameLog"}, "splits": splits}
+        ]
+        return entry
+    if "type=career" in hydrate:
+        seasons = [str(year) for year in range(2015, 2026)]
+        stat = {}
+        for season in seasons:
+            for key, value in season_stat(player_id, season, group).items():
+                if isinstance(value, int):
+                    stat[key] = stat.get(key, 0) + value
+        stat_type = "career"
+        season = None
+    else:
+        match = SEASON_RE.search(hydrate)
+        season = match.group(1) if match else "2025"
+        stat = season_stat(player_id, season, group)
+        stat_type = "season"
+    entry["stats"] = [
+        {
+            "group": {"displayName": group},
+            "type": {"displayName": stat_type},
+            "splits": [{"season": season, "stat": stat}],
+        }
+    ]
+    return entry
+
+
+# pylint: disable=too-many-return-statements
+def route(path, query):
+    """Return (status, payload) for a StatsAPI path and parsed query string."""
+    hydrate = query.get("hydrate", [""])[0]
+    if path == "/api/v1/teams":
+        return 200, {"teams": TEAMS}
+    match = re.fullmatch(r"/api/v1/teams/(\d+)/(roster|stats)", path)
+    if match:
+        team_id = int(match.group(1))
+        if not 101 <= team_id <= 100 + TEAM_COUNT:
+            return 404, {"message": "Team not found"}
+        if match.group(2) == "roster":
+            roster = [
+                {
+                    "person": {"id": pid, "fullName": f"Stub Player {pid}"},
+                    "jerseyNumber": str(pid % 100),
+                    "position": {"abbreviation": position(pid)},
+                }
+                for pid in player_ids(team_id)
+            ]
+            return 200, {"roster": roster}
+        season = query.get("season", ["2025"])[0]
+        stats = [
+            {
+                "group": {"displayName": group},
+                "type": {"displayName": "season"},
+                "splits": [{"stat": season_stat(team_id, season, group)}],
+            }
+            for group in ("hitting", "pitching")
+        ]
+        return 200, {"stats": stats}
+    if path == "/api/v1/people/search":
+        if "personIds" in query:
+            ids = [int(pid) for pid in query["personIds"]]
+        else:
+            name = query.get("names", [""])[0]
+            match = re.search(r"(\d+)", name)
+            ids = [int(match.group(1))] if match else []
+        return 200, {"people": [person(pid) for pid in ids if is_known_player(pid)]}
+    if path == "/api/v1/people":
+        ids = [int(pid) for pid in query.get("personIds", [""])[0].split(",") if pid]
+        return 200, {"people": [person(pid, hydrate) for pid in ids if is_known_player(pid)]}
+    match = re.fullmatch(r"/api/v1/people/(\d+)", path)
+    if match:
+        player_id = int(match.group(1))
+        if not is_known_player(player_id):
+            return 404, {"message": "Person not found"}
+        return 200, {"people": [person(player_id, hydrate)]}
+    return 404, {"message": f"Unknown endpoint {path}"}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler serving synthetic StatsAPI responses."""
+
+    server_version = "StatsAPIStub/1.0"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Serve one GET request."""
+        url = urlparse(self.path)
+        stats = self.server.stats
+        if url.path == "/__stats":
+            self._send(200, dict(stats))
+            return
+        if url.path == "/__reset":
+            self.server.reset()
+            self._send(200, {"reset": True})
+            return
+        time.sleep(self.server.latency)
+        status, payload = route(url.path, parse_qs(url.query))
+        size = self._send(status, payload)
+        with self.server.lock:
+            stats["requests"] += 1
+            stats["bytes"] += size
+
+    do_POST = do_GET
+
+    def _send(self, status, payload):
+        """Write a JSON response and return its body size in bytes."""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return len(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep the console quiet."""
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub server holding latency settings and request counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0):
+        super().__init__(address, StubHandler)
+        self.latency = latency_ms / 1000
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "bytes": 0}
+
+    def reset(self):
+        """Zero the request counters."""
+        with self.lock:
+            self.stats.update(requests=0, bytes=0)
+
+    @property
+    def base_url(self):
+        """The URL to pass to baseball-cli --api-url."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(port=0, latency_ms=0):
+    """Start a stub server on a background thread and return it."""
+    server = StubServer(("127.0.0.1", port), latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    """Run the stub server in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="Added latency per request in ms.")
+    args = parser.parse_args()
+    server = StubServer(("127.0.0.1", args.port), args.latency)
+    print(f"StatsAPI stub listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
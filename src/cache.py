@@ -0,0 +1,194 @@
+"""Persistent on-disk cache for MLB StatsAPI responses in the Fantasy Baseball CLI."""
+
+import datetime
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from src.instrument import endpoint_name, span
+from src.transport import StoredResponse, send, using_fixtures
+
+CACHE_DB_PATH = "statsapi_cache.db"
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+MEMORY_CACHE_ENTRIES = 256
+
+# Time-to-live (seconds) for each kind of response.
+PAST_SEASON_TTL = 365 * 24 * 3600
+CAREER_TTL = 7 * 24 * 3600
+DIRECTORY_TTL = 24 * 3600
+CURRENT_SEASON_TTL = 15 * 60
+
+_SEASON_RE = re.compile(r"season=(\d{4})")
+
+_settings = {"enabled": True, "refresh": False, "db_path": CACHE_DB_PATH}
+_state = {"conn": None, "path": None}
+_lock = threading.Lock()
+_memory = OrderedDict()
+
+
+def configure_cache(enabled=True, refresh=False, db_path=None):
+    """
+    Configure the response cache for this process.
+    enabled=False bypasses the cache entirely; refresh=True ignores cached
+    entries but stores the fresh responses.
+    """
+    _settings["enabled"] = enabled
+    _settings["refresh"] = refresh
+    if db_path:
+        _settings["db_path"] = db_path
+
+
+def cache_key(url, params=None):
+    """Build a stable cache key from a URL and its query parameters."""
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+
+
+def cache_ttl(url, params=None):
+    """
+    Choose a time-to-live for a request.
+    Completed past seasons and career splits are kept for a long time,
+    player/team directories for a day, and current season data briefly.
+    """
+    params = params or {}
+    query = " ".join(str(v) for v in params.values())
+    if "type=career" in query:
+        return CAREER_TTL
+    seasons = _SEASON_RE.findall(query)
+    if "season" in params:
+        seasons.append(str(params["season"]))
+    if seasons:
+        current_year = datetime.date.today().year
+        if all(int(s) < current_year for s in seasons):
+            return PAST_SEASON_TTL
+        return CURRENT_SEASON_TTL
+    if url.endswith("/teams") or url.endswith("/people/search"):
+        return DIRECTORY_TTL
+    return CURRENT_SEASON_TTL
+
+
+def _connect():
+    """Return the process-wide cache connection, creating the table on first use."""
+    path = _settings["db_path"]
+    if _state["conn"] is None or _state["path"] != path:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                body TEXT,
+                size INTEGER,
+                expires_at REAL,
+                last_access REAL
+            )
+        """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_http_cache_access ON http_cache (last_access)"
+        )
+        conn.commit()
+        _state["conn"] = conn
+        _state["path"] = path
+    return _state["conn"]
+
+
+def _remember(key, body, expires_at):
+    """Keep a body in the in-memory LRU layer in front of the on-disk cache."""
+    _memory[key] = (body, expires_at)
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_CACHE_ENTRIES:
+        _memory.popitem(last=False)
+
+
+def cache_lookup(key):
+    """
+    Return the cached body for key if present and not expired, else None.
+    Recently used bodies are answered from memory without touching SQLite.
+    """
+    now = time.time()
+    with _lock:
+        if key in _memory and _memory[key][1] >= now:
+            _memory.move_to_end(key)
+            return _memory[key][0]
+        conn = _connect()
+        row = conn.execute(
+            "SELECT body, expires_at FROM http_cache WHERE key=?", (key,)
+        ).fetchone()
+        if row is None or row[1] < now:
+            return None
+        conn.execute("UPDATE http_cache SET last_access=? WHERE key=?", (now, key))
+        conn.commit()
+        _remember(key, row[0], row[1])
+    return row[0]
+
+
+def cache_store(key, body, ttl, max_bytes=CACHE_MAX_BYTES):
+    """
+    Store a response body under key, then evict least-recently-used
+    entries until the cache fits within max_bytes.
+    """
+    now = time.time()
+    size = len(body.encode("utf-8"))
+    with _lock:
+        _remember(key, body, now + ttl)
+        conn = _connect()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO http_cache (key, body, size, expires_at, last_access)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (key, body, size, now + ttl, now),
+        )
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total > max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM http_cache ORDER BY last_access ASC"
+            ).fetchall()
+            evict = []
+            for old_key, old_size in rows:
+                if total <= max_bytes:
+                    break
+                evict.append((old_key,))
+                total -= old_size
+            conn.executemany("DELETE FROM http_cache WHERE key=?", evict)
+        conn.commit()
+
+
+def clear_cache():
+    """Remove every entry from the response cache."""
+    with _lock:
+        _memory.clear()
+        conn = _connect()
+        conn.execute("DELETE FROM http_cache")
+        conn.commit()
+
+
+def cached_get(url, params=None, timeout=None):
+    """
+    GET a StatsAPI URL through the response cache.
+    Only successful (200) responses are cached. While fixtures are being
+    recorded or replayed the cache is neither read nor written, so every
+    request reaches the fixtures. Returns a response object with
+    status_code, text and json().
+    """
+    key = cache_key(url, params)
+    enabled = _settings["enabled"] and not using_fixtures()
+    with span("http", endpoint_name(url), cache="off") as info:
+        if enabled and not _settings["refresh"]:
+            body = cache_lookup(key)
+            if body is not None:
+                info.update(cache="hit", status=200, bytes=len(body.encode("utf-8")))
+                return StoredResponse(200, body, from_cache=True)
+        res = send(url, params=params, timeout=timeout)
+        info.update(
+            cache="miss" if enabled else "off",
+            status=res.status_code,
+            bytes=len(res.content),
+        )
+        if enabled and res.status_code == 200:
+            cache_store(key, res.text, cache_ttl(url, params))
+    return res
@@ -1,24 +1,81 @@
 """Command-line interface for the Baseball CLI tool."""
 
 import argparse
-from src.utils import (
-    fetch_player_stats,
-    lookup_player_id,
-    fetch_team_stats,
-    fetch_team_roster,
-    lookup_team_id,
-)
-from src.commands import compare_players, get_player_fantasy_points
-from src.fantasy_db import (
-    init_fantasy_db,
-    add_player_to_team,
-    remove_player_from_team,
-    list_fantasy_team,
-    print_team_fantasy_scores,
+import os
+import sys
+
+from src import handlers
+from src.output import FORMATS
+
+# Default worker count for --jobs (the same default as src.fantasy_db.DEFAULT_JOBS,
+# not imported from there so that building the parser stays cheap).
+DEFAULT_JOBS = 8
+
+# Every command's flag (argparse dest) with the src.handlers functions that
+# run it as text and, if supported, as --format records. Handlers import
+# their dependencies when they run, so each command loads only what it uses.
+COMMANDS = (
+    ("player", "cmd_player", "cmd_player_records"),
+    ("team", "cmd_team", "cmd_team_records"),
+    ("compare", "cmd_compare", "cmd_compare_records"),
+    ("fantasy_score", "cmd_fantasy_score", "cmd_fantasy_score_records"),
+    ("fantasy_add", "cmd_fantasy_add", None),
+    ("fantasy_remove", "cmd_fantasy_remove", None),
+    ("fantasy_import", "cmd_fantasy_import", None),
+    ("fantasy_list", "cmd_fantasy_list", "cmd_fantasy_list_records"),
+    ("fantasy_team_score", "cmd_fantasy_team_score", "cmd_fantasy_team_score_records"),
+    ("roster", "cmd_roster", "cmd_roster_records"),
+    ("rebuild_index", "cmd_rebuild_index", None),
+    ("sync", "cmd_sync", None),
+    ("refresh_scores", "cmd_refresh_scores", None),
+    ("league_scores", "cmd_league_scores", "cmd_league_scores_records"),
+    ("league_standings", "cmd_league_standings", "cmd_league_standings_records"),
+    ("matchup", "cmd_matchup", "cmd_matchup_records"),
+    ("optimize_lineup", "cmd_optimize_lineup", "cmd_optimize_lineup_records"),
+    ("project", "cmd_project", "cmd_project_records"),
+    ("evaluate_trade", "cmd_evaluate_trade", "cmd_evaluate_trade_records"),
+    ("ingest", "cmd_ingest", None),
+    ("leaderboard", "cmd_leaderboard", "cmd_leaderboard_records"),
 )
 
+# Default number of Monte Carlo runs for --project and --evaluate-trade
+# (src.projection.DEFAULT_SIMULATIONS).
+DEFAULT_SIMULATIONS = 10000
+
+# Default polls per minute for --watch (src.watch.WATCH_BUDGET).
+DEFAULT_WATCH_BUDGET = 60
+
+# Commands that support --watch.
+WATCH_COMMANDS = {"roster", "team"}
+
+# Environment variable naming a `baseball-cli serve` daemon to run commands on.
+SERVER_ENV = "BASEBALL_CLI_SERVER"
+
+# Environment variables giving defaults for --api-url, --record and --replay
+# (src.transport.API_URL_ENV, RECORD_ENV and REPLAY_ENV).
+API_URL_ENV = "BASEBALL_CLI_API_URL"
+RECORD_ENV = "BASEBALL_CLI_RECORD"
+REPLAY_ENV = "BASEBALL_CLI_REPLAY"
 
-# pylint: disable=line-too-long
+# Commands that compute fantasy scores and so need a scoring profile.
+SCORING_COMMANDS = {
+    "fantasy_score", "fantasy_team_score", "leaderboard", "refresh_scores", "league_scores",
+    "league_standings", "matchup", "optimize_lineup", "project", "evaluate_trade",
+}
+
+
+def positive_int(text):
+    """argparse type for counts that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+# pylint: disable=line-too-long,too-many-statements
 def create_cli_parser():
     """Create and return the argument parser for the CLI tool."""
     parser = argparse.ArgumentParser(
@@ -28,19 +85,21 @@ def create_cli_parser():
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument(
         "--player",
-        type=str,
-        help='Get stats of a player by name (e.g., --player "Mike Trout").',
+        nargs="+",
+        metavar="PLAYER",
+        help='Get stats of one or more players by name (e.g., --player "Mike Trout" "Shohei Ohtani"). "-" reads names from stdin and @FILE from a file, one per line.',
     )
     group.add_argument(
         "--team",
-        type=str,
-        help='Get stats of a player by name (e.g., --team "San Francisco Giants").',
+        nargs="+",
+        metavar="TEAM_NAME",
+        help='Get stats of one or more teams by name (e.g., --team "San Francisco Giants"). Accepts "-" and @FILE like --player.',
     )
     group.add_argument(
         "--compare",
-        nargs=2,
-        metavar=("PLAYER1", "PLAYER2"),
-        help='Compare two players by name (e.g., --compare "Mike Trout" "Shohei Ohtani").',
+        nargs="+",
+        metavar="PLAYER",
+        help='Compare two or more players by name side by side (e.g., --compare "Mike Trout" "Shohei Ohtani"). Accepts "-" and @FILE like --player.',
     )
     group.add_argument(
         "--fantasy-add",
@@ -54,6 +113,11 @@ def create_cli_parser():
         metavar=("USER", "PLAYER"),
         help='Remove a player from a user\'s fantasy team (e.g., --fantasy-remove my-team "Mike Trout").',
     )
+    group.add_argument(
+        "--fantasy-import",
+        metavar="CSV",
+        help="Apply roster changes from a CSV with user,player[,player_id,action] columns in one transaction (e.g., --fantasy-import draft.csv).",
+    )
     group.add_argument(
         "--fantasy-list",
         metavar="USER",
@@ -73,9 +137,80 @@ def create_cli_parser():
     )
     group.add_argument(
         "--roster",
+        nargs="+",
+        metavar="TEAM_NAME",
+        help='Fetch the rosters of one or more teams for a season (e.g., --roster "Los Angeles Dodgers"). Accepts "-" and @FILE like --player.',
+    )
+    group.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rebuild the local player name index from every team's roster (e.g., --rebuild-index --season 2025).",
+    )
+    group.add_argument(
+        "--leaderboard",
+        nargs="?",
+        const=25,
+        type=positive_int,
+        metavar="N",
+        help="Rank the top N players (default 25) by fantasy score from the local stat store (e.g., --leaderboard 10 --position SS).",
+    )
+    group.add_argument(
+        "--sync",
+        action="store_true",
+        help="Pull only the games played since the last sync for every fantasy-rostered player into the local game log (e.g., --sync --season 2025).",
+    )
+    group.add_argument(
+        "--refresh-scores",
+        action="store_true",
+        help="Recompute the stored fantasy scores of every fantasy-rostered player that are missing or stale for the season and --scoring profile; --rescore recomputes all (e.g., --refresh-scores --season 2025).",
+    )
+    group.add_argument(
+        "--league-scores",
+        action="store_true",
+        help="Rank every user's fantasy team total from the stored scores, without fetching (e.g., --league-scores --season 2025).",
+    )
+    group.add_argument(
+        "--league-standings",
+        action="store_true",
+        help="Score every user's fantasy team, fetching each rostered player once, and rank them with category breakdowns (e.g., --league-standings --season 2025).",
+    )
+    group.add_argument(
+        "--matchup",
+        nargs=2,
+        metavar=("USER1", "USER2"),
+        help="Compare two fantasy teams head to head, category by category (e.g., --matchup my-team rival-team).",
+    )
+    group.add_argument(
+        "--optimize-lineup",
+        nargs="*",
+        metavar="USER",
+        help="Pick the highest-scoring starting lineup for each user's fantasy team under the --lineup-slots rules; every user if none are given (e.g., --optimize-lineup my-team).",
+    )
+    group.add_argument(
+        "--project",
+        metavar="USER",
+        help="Simulate the rest of the season from each player's game logs and show the distribution of the fantasy team's final total (e.g., --project my-team).",
+    )
+    group.add_argument(
+        "--evaluate-trade",
+        metavar="USER",
+        help="Compare a fantasy team's projected final total before and after a trade given with --give and --get (e.g., --evaluate-trade my-team --give \"Mike Trout\" --get \"Juan Soto\").",
+    )
+    group.add_argument(
+        "--ingest",
+        action="store_true",
+        help="Download season stats for every rostered player into the local stat store (e.g., --ingest --season 2025).",
+    )
+    parser.add_argument(
+        "--position",
+        type=str,
+        help="Filter --leaderboard by position (e.g., SS, OF, P).",
+    )
+    parser.add_argument(
+        "--team-filter",
         type=str,
-        metavar=("TEAM_NAME"),
-        help='Fetch the roster for a team by team ID and season (e.g., --roster "Los Angeles Dodgers").',
+        metavar="TEAM_NAME",
+        help='Filter --leaderboard by team (e.g., --team-filter "Dodgers").',
     )
     stat_group = parser.add_mutually_exclusive_group(required=False)
     stat_group.add_argument(
@@ -83,99 +218,349 @@ def create_cli_parser():
         type=str,
         help="Optionally specify a season/year for stats (e.g., --season 2021).",
     )
+    stat_group.add_argument(
+        "--seasons",
+        type=str,
+        metavar="RANGE",
+        help="Score --fantasy-score or --fantasy-team-score for every season in a range, with totals and trend (e.g., --seasons 2015-2025 or 2019,2021).",
+    )
     stat_group.add_argument(
         "--career",
         action="store_true",
         help="Show career stats instead of season stats.",
     )
+    parser.add_argument(
+        "--scoring",
+        type=str,
+        metavar="PROFILE",
+        help="Scoring profile for fantasy scores: a preset (default, batting, pitching) or a .toml/.json file.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Compute --fantasy-score, --fantasy-team-score, --league-standings, --matchup and --optimize-lineup from locally synced game logs, fetching only new games.",
+    )
+    parser.add_argument(
+        "--lineup-slots",
+        metavar="SLOTS",
+        help="Starting slots for --optimize-lineup, comma-separated from C, 1B, 2B, SS, 3B, OF, CI, MI, UTIL, SP, RP, P (default: C,1B,2B,SS,3B,OF,OF,OF,UTIL,SP,RP).",
+    )
+    parser.add_argument(
+        "--give",
+        nargs="+",
+        default=[],
+        metavar="PLAYER",
+        help="Players the team trades away in --evaluate-trade.",
+    )
+    parser.add_argument(
+        "--get",
+        nargs="+",
+        default=[],
+        metavar="PLAYER",
+        help="Players the team receives in --evaluate-trade.",
+    )
+    parser.add_argument(
+        "--simulations",
+        type=int,
+        default=DEFAULT_SIMULATIONS,
+        metavar="N",
+        help=f"Number of simulated seasons for --project and --evaluate-trade (default: {DEFAULT_SIMULATIONS}).",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Random seed for --project and --evaluate-trade; the same seed gives the same results (default: 0).",
+    )
+    parser.add_argument(
+        "--games-left",
+        type=int,
+        metavar="N",
+        help="Team games left to simulate for --project and --evaluate-trade (default: estimated from the calendar).",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="SECONDS",
+        help="Poll --roster or --team every SECONDS and print only what changed, until interrupted (e.g., --roster \"Dodgers\" --watch 60).",
+    )
+    parser.add_argument(
+        "--watch-budget",
+        type=int,
+        default=DEFAULT_WATCH_BUDGET,
+        metavar="N",
+        help=f"Maximum --watch requests per minute across all watched teams, 0 for no limit; polls are staggered and slowed to fit (default: {DEFAULT_WATCH_BUDGET}).",
+    )
+    parser.add_argument(
+        "--stored",
+        action="store_true",
+        help="Answer --fantasy-team-score from the stored scores kept by --refresh-scores instead of fetching.",
+    )
+    parser.add_argument(
+        "--rescore",
+        action="store_true",
+        help="With --refresh-scores, recompute every stored score, not only missing or stale ones.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar="N",
+        help=f"Number of concurrent requests used for multi-player, multi-team and league-wide commands (default: {DEFAULT_JOBS}).",
+    )
+    cache_group = parser.add_mutually_exclusive_group(required=False)
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk StatsAPI response cache for this run.",
+    )
+    cache_group.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached StatsAPI responses and re-fetch (the fresh responses are cached).",
+    )
+    transport_group = parser.add_mutually_exclusive_group(required=False)
+    transport_group.add_argument(
+        "--record",
+        default=os.environ.get(RECORD_ENV),
+        metavar="DIR",
+        help="Save every StatsAPI response as a fixture file in DIR.",
+    )
+    transport_group.add_argument(
+        "--replay",
+        default=os.environ.get(REPLAY_ENV),
+        metavar="DIR",
+        help="Answer StatsAPI requests from fixture files in DIR instead of the network.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="Output format: human-readable text (default), or json, ndjson or csv records streamed as they are fetched.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-command breakdown of network, cache, decode, scoring, formatting and DB time.",
+    )
+    parser.add_argument(
+        "--trace-out",
+        metavar="FILE",
+        help="Append one JSON line per network, cache, decode, scoring, formatting and DB event to FILE.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        metavar="RPS",
+        help="Maximum StatsAPI requests per second, 0 for no limit (default: 25, bursts of 50).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Read timeout for each StatsAPI request (default: 30; connecting times out after 3 s).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        metavar="N",
+        help="Retry 429/5xx responses and connection errors up to N times with jittered backoff (default: 4).",
+    )
+    parser.add_argument(
+        "--api-url",
+        default=os.environ.get(API_URL_ENV),
+        metavar="URL",
+        help="Send StatsAPI requests to another server, e.g. a local stub (default: https://statsapi.mlb.com).",
+    )
+    parser.add_argument(
+        "--server",
+        metavar="URL",
+        default=os.environ.get(SERVER_ENV),
+        help=f"Run the command on a `baseball-cli serve` daemon, e.g. http://127.0.0.1:8787 (also settable with {SERVER_ENV}).",
+    )
     return parser
 
 
-# pylint: disable=too-many-branches,too-many-locals,too-many-statements
-def main():
-    """Parse CLI arguments and print MLB statistics or manage fantasy teams."""
+def main(argv=None):
+    """
+    Parse CLI arguments and print MLB statistics or manage fantasy teams.
+    `baseball-cli shell` starts an interactive session, `baseball-cli
+    serve` a local HTTP daemon and `baseball-cli snapshot` exports or
+    imports the local data instead. With --server the command runs on
+    such a daemon.
+    """
+    # pylint: disable=import-outside-toplevel
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["shell"]:
+        from src.shell import run_shell
+
+        run_shell(create_cli_parser(), run_command)
+        return
+    if argv[:1] == ["serve"]:
+        from src.server import serve_main
+
+        serve_main(argv[1:], create_cli_parser, configure_run, execute)
+        return
+    if argv[:1] == ["snapshot"]:
+        from src.snapshot import snapshot_main
+
+        snapshot_main(argv[1:])
+        return
     parser = create_cli_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.server:
+        from src.server import run_remote
 
+        status = run_remote(args.server, argv)
+        if status:
+            sys.exit(status)
+        if status is not None:
+            return
+    run_command(parser, args)
+
+
+def selected_command(args):
+    """Return the COMMANDS entry for the command flag given on the command line."""
+    return next(
+        entry for entry in COMMANDS if getattr(args, entry[0]) not in (None, False)
+    )
+
+
+def configure_run(args):
+    """Apply the process-wide cache, transport and HTTP client options of a command line."""
+    # pylint: disable=import-outside-toplevel
+    from src.cache import configure_cache
+    from src.transport import configure_client, configure_transport
+
+    configure_cache(enabled=not args.no_cache, refresh=args.refresh)
+    configure_transport(
+        base_url=args.api_url, record_dir=args.record, replay_dir=args.replay
+    )
+    configure_client(
+        rate_limit=args.rate_limit,
+        read_timeout=args.timeout,
+        max_retries=args.retries,
+    )
+
+
+def run_command(parser, args):
+    """
+    Run one parsed command line. Used by main() and by the interactive shell.
+    With --profile a timing breakdown is printed afterwards; with --trace-out
+    every network, cache, decode, scoring, formatting and DB event is
+    appended to a JSON lines file.
+    """
+    configure_run(args)
+    execute(parser, args)
+
+
+def execute(parser, args):
+    """
+    Run a parsed command line under the options already configured by
+    configure_run(). The `serve` daemon calls this directly, so requests
+    share the server's cache and transport settings.
+    """
+    # pylint: disable=import-outside-toplevel
+    from src.instrument import Profiler, TraceWriter, add_hook, remove_hook
+
+    command = selected_command(args)
+    profile = prepare_command(parser, args, command)
+
+    hooks = []
+    if args.profile:
+        hooks.append(Profiler())
+    if args.trace_out:
+        options = {
+            key: value
+            for key, value in vars(args).items()
+            if value != parser.get_default(key)
+        }
+        hooks.append(TraceWriter(args.trace_out, command=options))
+    for hook in hooks:
+        add_hook(hook)
     try:
-        init_fantasy_db()
-        if args.player:
-            player_id = lookup_player_id(args.player)
-            if player_id:
-                if args.career:
-                    stats = fetch_player_stats(player_id)
-                else:
-                    stats = fetch_player_stats(player_id, season=args.season)
-                print(stats)
-        elif args.team:
-            fetch_team_stats(args.team, season=args.season)
-        elif args.compare:
-            player_id_1 = lookup_player_id(args.compare[0])
-            player_id_2 = lookup_player_id(args.compare[1])
-            if player_id_1 and player_id_2:
-                comparison = compare_players(
-                    player_id_1, player_id_2, season=args.season, career=args.career
-                )
-                print(comparison)
-        elif args.fantasy_score:
-            player_id = lookup_player_id(args.fantasy_score)
-            if player_id:
-                get_player_fantasy_points(player_id, args.season)
-            else:
-                print(f"Player '{args.fantasy_score}' not found.")
-        elif args.fantasy_add:
-            user, player_name = args.fantasy_add
-            player_id = lookup_player_id(player_name)
-            if player_id:
-                add_player_to_team(user, player_id, player_name)
-                print(
-                    f"Added {player_name} (ID: {player_id}) to {user}'s fantasy team."
-                )
-            else:
-                print(f"Player '{player_name}' not found.")
-        elif args.fantasy_remove:
-            user, player_name = args.fantasy_remove
-            player_id = lookup_player_id(player_name)
-            if player_id:
-                remove_player_from_team(user, player_id)
-                print(
-                    f"Removed {player_name} (ID: {player_id}) from {user}'s fantasy team."
-                )
+        if args.format == "text" or command[2] is None:
+            dispatch(command[1], args, profile)
+        else:
+            dispatch_records(command[2], args, profile)
+    finally:
+        for hook in hooks:
+            remove_hook(hook)
+            if isinstance(hook, TraceWriter):
+                hook.close()
             else:
-                print(f"Player '{player_name}' not found.")
-        elif args.fantasy_list:
-            user = args.fantasy_list
-            team = list_fantasy_team(user)
-            if team:
-                print(f"{user}'s fantasy team:")
-                for pid, pname in team:
-                    print(f"{pname} (ID: {pid})")
-            else:
-                print(f"{user} has no players on their fantasy team.")
-        elif args.fantasy_team_score:
-            user = args.fantasy_team_score
-            team = list_fantasy_team(user)
-            if team:
-                print_team_fantasy_scores(user)
-            else:
-                print(f"{user} has no players on their fantasy team.")
-        elif args.roster:
-            team_id = lookup_team_id(args.roster)
-            season = args.season if args.season else "2025"
-            roster = fetch_team_roster(team_id, season)
-            if roster:
-                print(f"Roster for team {args.roster} in {season}:")
-                for player in roster:
-                    print(
-                        f"{player['person']['fullName']} ({player['jerseyNumber']}) - {player['position']['abbreviation']}"
-                    )
-            else:
-                print(f"No roster found for team {team_id} in {season}.")
+                print(hook.report(), file=sys.stderr if args.format != "text" else sys.stdout)
+
+
+def prepare_command(parser, args, command):
+    """
+    Check options that depend on the selected command, parse --seasons
+    and load the scoring profile the command needs (None if it scores
+    nothing). Reports problems through parser.error().
+    """
+    # pylint: disable=import-outside-toplevel
+    profile = None
+    try:
+        if args.scoring or command[0] in SCORING_COMMANDS:
+            from src.scoring import load_scoring_profile
+
+            profile = load_scoring_profile(args.scoring)
+        if args.seasons and not isinstance(args.seasons, list):
+            from src.season_store import parse_seasons
+
+            args.seasons = parse_seasons(args.seasons)
+        if args.lineup_slots and not isinstance(args.lineup_slots, tuple):
+            from src.lineup import parse_slots
+
+            args.lineup_slots = parse_slots(args.lineup_slots)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.watch is not None:
+        if command[0] not in WATCH_COMMANDS or args.format != "text":
+            parser.error("--watch works with --roster and --team in text format.")
+        if args.watch <= 0:
+            parser.error("--watch needs a positive interval.")
+    if args.rescore and command[0] != "refresh_scores":
+        parser.error("--rescore works with --refresh-scores.")
+    if (args.give or args.get) and command[0] != "evaluate_trade":
+        parser.error("--give and --get work with --evaluate-trade.")
+    if command[0] == "evaluate_trade" and not (args.give or args.get):
+        parser.error("--evaluate-trade needs players to --give and/or --get.")
+    if args.simulations <= 0 or (args.games_left is not None and args.games_left < 0):
+        parser.error("--simulations must be positive and --games-left not negative.")
+    return profile
+
+
+def dispatch(handler, args, profile):
+    """Run a text handler from src.handlers, reporting argument and key errors."""
+    try:
+        getattr(handlers, handler)(args, profile)
     except argparse.ArgumentError as e:
         print(f"Argument error: {e}")
     except KeyError as e:
         print(f"Key error: {e}")
 
 
+def dispatch_records(handler, args, profile):
+    """
+    Run a records handler from src.handlers and stream its results to
+    stdout as args.format records. Messages the command prints along the
+    way (errors, progress) go to stderr so the records stay parseable.
+    """
+    # pylint: disable=import-outside-toplevel
+    from src.output import messages_to_stderr, write_records
+
+    with messages_to_stderr() as out:
+        try:
+            selected = getattr(handlers, handler)(args, profile)
+            if selected is not None:
+                write_records(*selected, args.format, out)
+        except argparse.ArgumentError as e:
+            print(f"Argument error: {e}")
+        except KeyError as e:
+            print(f"Key error: {e}")
+
+
 if __name__ == "__main__":
     main()
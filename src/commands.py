@@ -1,72 +1,299 @@
 """Commands for comparing players and calculating fantasy points in the Fantasy Baseball CLI."""
 
-import requests
+import sys
+
+from src.cache import cached_get
+from src.game_log import season_totals, sync_game_logs
+from src.player_index import store_players
+from src.scoring import load_scoring_profile, score_players, score_trend
+from src.season_store import load_player_seasons
+from src.stat_store import (
+    STAT_STORE_PATH,
+    build_stat_store,
+    leaderboard,
+    load_stat_store,
+    save_stat_store,
+)
+from src.stats import PlayerStats, group_sort_key
+from src.team_index import store_teams
+from src.transport import TransportError
 from src.utils import (
-    fetch_player_stats,
-    parse_stats,
-    lookup_player_name,
-    calculate_fantasy_score,
+    fetch_players,
+    fetch_teams,
+    iter_team_rosters,
+    lookup_team_id,
+    player_stats_params,
 )
 
-# pylint: disable=too-many-locals
-def compare_players(player_id_1, player_id_2, season=None, career=False):
+
+def fetch_compared_players(player_ids, season=None, career=False, jobs=1):
+    """
+    Fetch the stats of the players to compare with batched requests, for a
+    season (default 2025) or their careers.
+    Returns a list of PlayerStats in input order, or None if any is missing.
+    """
+    players = fetch_players(
+        player_ids, season=None if career else season or "2025", jobs=jobs
+    )
+    compared = [players.get(int(player_id)) for player_id in dict.fromkeys(player_ids)]
+    if not all(compared):
+        return None
+    return compared
+
+
+def comparison_rows(players):
+    """
+    Yield (group, stat, values) for every stat any of the players has, in
+    group order; values holds one entry per player, None where a player
+    lacks the stat.
     """
-    Compare two players' statistics and return a side-by-side formatted string.
+    stats = [
+        {(group, stat): value for group, _, stat, value in player.items()}
+        for player in players
+    ]
+    keys = set().union(*stats)
+    for key in sorted(keys, key=group_sort_key):
+        yield key[0], key[1], [player_stats.get(key) for player_stats in stats]
+
+
+def compare_players(player_ids, season=None, career=False, jobs=1):
+    """
+    Compare players' statistics and return a side-by-side formatted string
+    with one column per player.
     Optionally compare for a specific season or for career stats.
+    All players are fetched with batched requests and compared stat by
+    stat within each group, so e.g. batting and pitching hits are separate
+    rows.
     """
-    if career:
-        stats1_str = fetch_player_stats(player_id_1)
-        stats2_str = fetch_player_stats(player_id_2)
-    else:
-        stats1_str = fetch_player_stats(player_id_1, season=season)
-        stats2_str = fetch_player_stats(player_id_2, season=season)
-
-        if not stats1_str or not stats2_str:
-            return "Could not retrieve stats for one or both players."
-
-        stats1 = parse_stats(stats1_str)
-        stats2 = parse_stats(stats2_str)
-
-        all_keys = sorted(set(stats1.keys()) | set(stats2.keys()))
-        player1_name = lookup_player_name(player_id_1)
-        player2_name = lookup_player_name(player_id_2)
-        header = f"{'Stat':<20} | {player1_name} | {player2_name}"
-        sep = "-" * len(header)
-        rows = [header, sep]
-        for key in all_keys:
-            val1 = stats1.get(key, "-")
-            val2 = stats2.get(key, "-")
-            rows.append(
-                f"{key:<20} | {val1:<{len(player1_name)}} | {val2:<{len(player2_name)}}"
-            )
-        return "\n".join(rows)
+    players = fetch_compared_players(player_ids, season, career, jobs)
+    if players is None:
+        return "Could not retrieve stats for one or more players."
+    widths = [len(player.full_name) for player in players]
+    header = " | ".join([f"{'Stat':<28}"] + [player.full_name for player in players])
+    rows = [header, "-" * len(header)]
+    for group, stat, values in comparison_rows(players):
+        cells = [
+            f"{'-' if value is None else value!s:<{width}}"
+            for value, width in zip(values, widths)
+        ]
+        rows.append(" | ".join([f"{group + '.' + stat:<28}"] + cells))
+    return "\n".join(rows)
 
 
-def get_player_fantasy_points(player_id, season=None):
+def score_player(player, profile=None):
     """
-    Fetch a player's stats for a given season, calculate, and print their fantasy score.
+    Calculate the fantasy score for a PlayerStats under a scoring profile
+    (the default preset if None).
     Returns the fantasy score as a float.
     """
+    return float(score_players([player], profile)[0])
+
+
+def compute_player_fantasy_points(player_id, season=None, profile=None, incremental=False):
+    """
+    Fetch a player's stats for a given season and calculate their fantasy score.
+    With incremental, only games since the last sync are fetched and the
+    score is computed from the local running season totals.
+    Returns a (player_name, score) tuple.
+    Raises LookupError if the API returns an error or no player data.
+    """
+    if incremental:
+        sync_game_logs([player_id], season)
+        player = season_totals([player_id], season).get(int(player_id))
+        if player is None:
+            raise LookupError("No player data found.")
+        return player.full_name, score_player(player, profile)
     url = f"https://statsapi.mlb.com/api/v1/people/{player_id}"
+    try:
+        res = cached_get(url, params=player_stats_params(season or "2025"))
+    except TransportError as e:
+        raise LookupError(f"Error fetching stats for player ID {player_id}: {e}") from e
+    if res.status_code != 200:
+        raise LookupError(f"API Error: {res.status_code} - {res.text}")
+    data = res.json()
+    if "people" not in data or not data["people"]:
+        raise LookupError("No player data found.")
+    player = PlayerStats.from_api(data["people"][0])
+    return player.full_name, score_player(player, profile)
+
+
+def get_player_fantasy_points(player_id, season=None, profile=None, incremental=False):
+    """
+    Fetch a player's stats for a given season, calculate, and print their fantasy score.
+    Returns the fantasy score as a float.
+    """
+    season_used = season or "2025"
+    try:
+        player_name, score = compute_player_fantasy_points(
+            player_id, season, profile, incremental
+        )
+    except LookupError as e:
+        print(e)
+        return None
+    print(f"Fantasy score for {player_name} ({season_used}): {score}")
+    return score
+
+
+def season_scores(player_ids, seasons, profile=None, jobs=8):
+    """
+    Score players for every season in a range from the local
+    season-partitioned store (completed seasons are fetched only once).
+    Each season is scored in one vectorized pass under the profile.
+    Returns a list of (player_id, player_name, {season: score}, trend) in
+    input order; seasons without stats are missing from the mapping and
+    trend is the score change per season.
+    """
+    players = load_player_seasons(player_ids, seasons, jobs=jobs)
+    names = {pid: player.full_name for (pid, _), player in players.items()}
+    scores = {}
+    for season in seasons:
+        found = [
+            player for (_, player_season), player in players.items()
+            if player_season == season and player.groups
+        ]
+        for player, score in zip(found, score_players(found, profile)):
+            scores.setdefault(player.player_id, {})[season] = float(score)
+    rows = []
+    for player_id in dict.fromkeys(int(pid) for pid in player_ids):
+        by_season = scores.get(player_id, {})
+        rows.append(
+            (player_id, names.get(player_id, str(player_id)), by_season, score_trend(by_season))
+        )
+    return rows
+
+
+# pylint: disable=too-many-locals
+def print_season_scores(player_ids, seasons, profile=None, jobs=8, team_label=None):
+    """
+    Print one row of per-season fantasy scores per player, with total,
+    average and trend (points per season). With team_label a team total
+    row is added.
+    """
+    rows = season_scores(player_ids, seasons, profile, jobs)
+    short = [season[-2:] if len(seasons) > 6 else season for season in seasons]
+    header = f"{'Player':<24} " + " ".join(f"{label:>7}" for label in short)
+    header += f" {'Total':>8} {'Avg':>7} {'Trend':>6}"
+    print(header)
+    print("-" * len(header))
+    totals = dict.fromkeys(seasons, 0.0)
+    for _, name, by_season, trend in rows:
+        cells = " ".join(
+            f"{by_season[season]:>7.1f}" if season in by_season else f"{'-':>7}"
+            for season in seasons
+        )
+        total = sum(by_season.values())
+        average = total / len(by_season) if by_season else 0.0
+        print(f"{name[:24]:<24} {cells} {total:>8.1f} {average:>7.1f} {trend:>+6.1f}")
+        for season, score in by_season.items():
+            totals[season] += score
+    if team_label:
+        print("-" * len(header))
+        cells = " ".join(f"{totals[season]:>7.1f}" for season in seasons)
+        trend = score_trend(totals)
+        print(f"{team_label[:24]:<24} {cells} {sum(totals.values()):>8.1f} {'':>7} {trend:>+6.1f}")
+    return rows
+
+
+def fetch_league_rosters(season=None, jobs=8):
+    """
+    Fetch every MLB team's roster for a season, refreshing the local team
+    directory along the way. Rosters are fetched by up to `jobs`
+    concurrent workers.
+    Returns a list of roster entry dicts (player_id, full_name, team_id,
+    team, position), one per player, or None if the team list is unavailable.
+    """
     season_used = season or "2025"
-    params = {
-        "hydrate": f"stats(group=[hitting,pitching,fielding],type=season,season={season_used})"
-    }
-    res = requests.get(url, params=params, timeout=120)
-    if res.status_code == 200:
-        data = res.json()
-        if "people" in data and data["people"]:
-            player = data["people"][0]
-            stat_dicts = []
-            for stat_group in player.get("stats", []):
-                for split in stat_group.get("splits", []):
-                    stat_dicts.append(split.get("stat", {}))
-            score = calculate_fantasy_score(stat_dicts)
-            print(
-                f"Fantasy score for {player.get('fullName')} ({season_used}): {score}"
+    teams = fetch_teams()
+    if teams is None:
+        return None
+    store_teams(teams)
+    rosters = dict(iter_team_rosters([team["id"] for team in teams], season_used, jobs))
+    entries = {}
+    for team in teams:
+        roster = rosters[team["id"]]
+        for entry in roster or []:
+            entries.setdefault(
+                entry["person"]["id"],
+                {
+                    "player_id": entry["person"]["id"],
+                    "full_name": entry["person"]["fullName"],
+                    "team_id": team["id"],
+                    "team": team.get("abbreviation"),
+                    "position": entry.get("position", {}).get("abbreviation"),
+                },
             )
-            return score
-        else:
-            print("No player data found.")
-    else:
-        print(f"API Error: {res.status_code} - {res.text}")
+    return list(entries.values())
+
+
+def rebuild_player_index(season=None, jobs=8):
+    """
+    Rebuild the local player index from every MLB team's roster for a season.
+    Returns the number of players indexed, or None if the team list is unavailable.
+    """
+    entries = fetch_league_rosters(season, jobs)
+    if entries is None:
+        return None
+    return store_players(entries, replace=True)
+
+
+def ingest_league_stats(season=None, jobs=8, path=STAT_STORE_PATH):
+    """
+    Download season stats for every rostered MLB player (rosters plus
+    batched /people requests) into the local columnar stat store.
+    Returns the number of players stored, or None if rosters are unavailable.
+    """
+    season_used = season or "2025"
+    entries = fetch_league_rosters(season_used, jobs)
+    if entries is None:
+        return None
+    store_players(entries)
+    players = fetch_players(
+        [entry["player_id"] for entry in entries], season=season_used, jobs=jobs
+    )
+    save_stat_store(build_stat_store(entries, players, season_used), path)
+    return len(entries)
+
+
+# pylint: disable=too-many-arguments
+def league_leaderboard(
+    top_n=25, season=None, position=None, team_name=None, profile=None, *, jobs=8,
+    path=STAT_STORE_PATH,
+):
+    """
+    Return the top_n (player_id, name, team, position, score) rows by
+    fantasy score from the local stat store, optionally filtered by position
+    and team, or None if the store or team cannot be loaded. The store is
+    ingested first if it is missing or holds a different season.
+    """
+    season_used = season or "2025"
+    store = load_stat_store(path)
+    if store is None or str(store["season"]) != season_used:
+        print(f"Ingesting {season_used} league stats...", file=sys.stderr)
+        if ingest_league_stats(season_used, jobs, path) is None:
+            return None
+        store = load_stat_store(path)
+    team_id = None
+    if team_name:
+        team_id = lookup_team_id(team_name)
+        if team_id is None:
+            return None
+    profile = profile or load_scoring_profile()
+    return leaderboard(store, profile, top_n=top_n, position=position, team_id=team_id)
+
+
+# pylint: disable=too-many-arguments
+def print_leaderboard(
+    top_n=25, season=None, position=None, team_name=None, profile=None, *, jobs=8,
+    path=STAT_STORE_PATH,
+):
+    """Print the leaderboard returned by league_leaderboard as a table."""
+    rows = league_leaderboard(top_n, season, position, team_name, profile, jobs=jobs, path=path)
+    if rows is None:
+        return
+    if not rows:
+        print("No players match the leaderboard filters.")
+        return
+    print(f"{'Rank':<5} {'Player':<28} {'Team':<5} {'Pos':<4} {'Score':>8}")
+    print("-" * 54)
+    for rank, (_, name, team, pos, score) in enumerate(rows, 1):
+        print(f"{rank:<5} {name:<28} {team:<5} {pos:<4} {score:>8.1f}")
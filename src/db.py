@@ -0,0 +1,108 @@
+"""Shared SQLite connection management for the Fantasy Baseball CLI's local database."""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DB_PATH = "fantasy_team.db"
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA busy_timeout=5000",
+)
+
+_schemas = []
+_connections = {}
+_registry_lock = threading.Lock()
+
+
+def register_schema(sql):
+    """
+    Register CREATE TABLE/INDEX statements for the local database.
+    Schemas are applied lazily, the first time a connection is used after
+    they were registered, so commands that never touch the database never
+    create it.
+    """
+    with _registry_lock:
+        if sql not in _schemas:
+            _schemas.append(sql)
+
+
+def register_column(table, column, sql_type):
+    """
+    Register a column added to a table after it was first released, so
+    databases created before it get the column too. Registered after the
+    table's own schema; new databases create it with the table.
+    """
+    register_schema((table, column, sql_type))
+
+
+def _apply_schema(conn, schema):
+    """Run one registered schema: a CREATE script or a (table, column, type) addition."""
+    if isinstance(schema, str):
+        conn.executescript(schema)
+        return
+    table, column, sql_type = schema
+    if column not in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}")
+
+
+def _entry(db_path):
+    """Return the {conn, lock, applied} record for db_path, opening it on first use."""
+    with _registry_lock:
+        entry = _connections.get(db_path)
+        if entry is None:
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            entry = {"conn": conn, "lock": threading.RLock(), "applied": 0}
+            _connections[db_path] = entry
+        schemas = list(_schemas)
+    if entry["applied"] < len(schemas):
+        with entry["lock"]:
+            for schema in schemas[entry["applied"] :]:
+                _apply_schema(entry["conn"], schema)
+            entry["conn"].commit()
+            entry["applied"] = len(schemas)
+    return entry
+
+
+def get_connection(db_path=DB_PATH):
+    """Return the long-lived connection for db_path with all registered schemas applied."""
+    return _entry(db_path)["conn"]
+
+
+@contextmanager
+def connection(db_path=DB_PATH):
+    """Hold the connection for db_path exclusively for a block of reads."""
+    entry = _entry(db_path)
+    with entry["lock"]:
+        yield entry["conn"]
+
+
+@contextmanager
+def transaction(db_path=DB_PATH):
+    """
+    Run a block of writes as one transaction on the shared connection:
+    committed on success, rolled back if the block raises.
+    """
+    entry = _entry(db_path)
+    with entry["lock"]:
+        conn = entry["conn"]
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def close_connections():
+    """Close every open database connection."""
+    with _registry_lock:
+        for entry in _connections.values():
+            entry["conn"].close()
+        _connections.clear()
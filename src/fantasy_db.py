@@ -1,30 +1,51 @@
 """Database functions for managing fantasy teams in the Fantasy Baseball CLI."""
 
-import sqlite3
-from src.commands import get_player_fantasy_points
+import csv
+import datetime
+import time
 
-FANTASY_DB_PATH = "fantasy_team.db"
+from src.db import DB_PATH, connection, get_connection, register_schema, transaction
+from src.game_log import season_totals, sync_game_logs
+from src.instrument import timed
+from src.season_store import season_complete
+from src.utils import iter_player_chunks, lookup_player_id, lookup_player_name
+
+FANTASY_DB_PATH = DB_PATH
+DEFAULT_JOBS = 8
+
+# Scores of a season in progress are refreshed after this many seconds;
+# scores computed after a season ended never go stale.
+MAX_SCORE_AGE = 6 * 3600
+
+register_schema(
+    """
+    CREATE TABLE IF NOT EXISTS fantasy_team (
+        user TEXT,
+        player_id INTEGER,
+        player_name TEXT,
+        PRIMARY KEY (user, player_id)
+    );
+    CREATE TABLE IF NOT EXISTS player_scores (
+        profile TEXT,
+        season TEXT,
+        player_id INTEGER,
+        player_name TEXT,
+        score REAL,
+        final INTEGER,
+        computed_at REAL,
+        PRIMARY KEY (profile, season, player_id)
+    );
+"""
+)
 
 
 def init_fantasy_db(db_path=FANTASY_DB_PATH):
     """
     Initialize the fantasy team database.
-    Creates the fantasy_team table if it does not exist.
-    """
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS fantasy_team (
-            user TEXT,
-            player_id INTEGER,
-            player_name TEXT,
-            PRIMARY KEY (user, player_id)
-        )
+    Creates the fantasy_team table if it does not exist. Other functions in
+    this module do this on first use, so calling it is optional.
     """
-    )
-    conn.commit()
-    conn.close()
+    get_connection(db_path)
 
 
 def add_player_to_team(user, player_id, player_name, db_path=FANTASY_DB_PATH):
@@ -32,72 +53,548 @@ def add_player_to_team(user, player_id, player_name, db_path=FANTASY_DB_PATH):
     Add a player to a user's fantasy team.
     If the player is already on the team, do nothing.
     """
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    c.execute(
-        """
-        INSERT OR IGNORE INTO fantasy_team (user, player_id, player_name)
-        VALUES (?, ?, ?)
-    """,
-        (user, player_id, player_name),
-    )
-    conn.commit()
-    conn.close()
+    add_players_to_team(user, [(player_id, player_name)], db_path=db_path)
+
+
+@timed("db")
+def add_players_to_team(user, players, db_path=FANTASY_DB_PATH):
+    """
+    Add many (player_id, player_name) pairs to a user's fantasy team in a
+    single transaction. Players already on the team are left unchanged.
+    """
+    with transaction(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO fantasy_team (user, player_id, player_name)
+            VALUES (?, ?, ?)
+        """,
+            [(user, player_id, player_name) for player_id, player_name in players],
+        )
 
 
 def remove_player_from_team(user, player_id, db_path=FANTASY_DB_PATH):
     """
     Remove a player from a user's fantasy team.
     """
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    c.execute(
-        """
-        DELETE FROM fantasy_team WHERE user=? AND player_id=?
-    """,
-        (user, player_id),
-    )
-    conn.commit()
-    conn.close()
+    remove_players_from_team(user, [player_id], db_path=db_path)
 
 
+@timed("db")
+def remove_players_from_team(user, player_ids, db_path=FANTASY_DB_PATH):
+    """
+    Remove many players from a user's fantasy team in a single transaction.
+    """
+    with transaction(db_path) as conn:
+        conn.executemany(
+            """
+            DELETE FROM fantasy_team WHERE user=? AND player_id=?
+        """,
+            [(user, player_id) for player_id in player_ids],
+        )
+
+
+@timed("db")
+def import_fantasy_rosters(csv_path, db_path=FANTASY_DB_PATH):
+    """
+    Apply roster changes from a CSV file in a single transaction.
+    The CSV needs a header with user and player columns, and may add
+    player_id (skips the name lookup) and action (add or remove, default add).
+    Added players given only by player_id get their name from the player
+    index (or the StatsAPI).
+    Returns (applied, skipped) where skipped lists rows whose player
+    could not be resolved or whose player_id is not a number.
+    """
+    adds = []
+    removes = []
+    skipped = []
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            user = (row.get("user") or "").strip()
+            player_name = (row.get("player") or "").strip()
+            player_id = (row.get("player_id") or "").strip()
+            if player_id and not player_id.isdigit():
+                skipped.append(row)
+                continue
+            player_id = int(player_id) if player_id else lookup_player_id(player_name)
+            if not user or not player_id:
+                skipped.append(row)
+                continue
+            if (row.get("action") or "add").strip().lower() == "remove":
+                removes.append((user, player_id))
+                continue
+            player_name = player_name or lookup_player_name(player_id)
+            if not player_name:
+                skipped.append(row)
+                continue
+            adds.append((user, player_id, player_name))
+    with transaction(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO fantasy_team (user, player_id, player_name)
+            VALUES (?, ?, ?)
+        """,
+            adds,
+        )
+        conn.executemany("DELETE FROM fantasy_team WHERE user=? AND player_id=?", removes)
+    return len(adds) + len(removes), skipped
+
+
+@timed("db")
 def list_fantasy_team(user, db_path=FANTASY_DB_PATH):
     """
     List all players on a user's fantasy team.
     Returns a list of (player_id, player_name) tuples.
     """
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-    c.execute(
-        """
-        SELECT player_id, player_name FROM fantasy_team WHERE user=?
-    """,
-        (user,),
+    with connection(db_path) as conn:
+        return conn.execute(
+            """
+            SELECT player_id, player_name FROM fantasy_team WHERE user=?
+        """,
+            (user,),
+        ).fetchall()
+
+
+# pylint: disable=too-many-arguments
+def _iter_scored_chunks(player_ids, season, jobs, profile, *, incremental, db_path):
+    """
+    Fetch and score players in batched chunks, yielding a list of
+    (player_id, PlayerStats or None, score or None, category points or
+    None) per chunk; category points follow the profile's columns.
+    """
+    from src.scoring import score_breakdown  # pylint: disable=import-outside-toplevel
+
+    if incremental:
+        chunks = [_synced_totals(player_ids, season, jobs, db_path)]
+    else:
+        chunks = iter_player_chunks(player_ids, season=season, jobs=jobs)
+    for chunk in chunks:
+        found = [player for _, player in chunk if player]
+        scores, points = score_breakdown(found, profile)
+        rows = {p.player_id: (float(score), row) for p, score, row in zip(found, scores, points)}
+        yield [
+            (player_id, player, *(rows[player_id] if player else (None, None)))
+            for player_id, player in chunk
+        ]
+
+
+# pylint: disable=too-many-arguments
+def iter_team_fantasy_scores(
+    user, season=None, jobs=DEFAULT_JOBS, profile=None, *, db_path=FANTASY_DB_PATH,
+    incremental=False, stored=False,
+):
+    """
+    Yield (player_id, player_name, score) for every player on a user's
+    fantasy team, in roster order, as soon as each batched request
+    completes. Each chunk is scored in one pass under the scoring profile
+    (the default preset if None). score is None for players whose stats
+    could not be fetched; player_name is the API's full name when available.
+    With incremental, only games since the last sync are fetched and scores
+    come from the local running season totals. Computed scores are saved
+    to the player_scores table; with stored, scores are read from it
+    instead and nothing is fetched.
+    """
+    from src.scoring import load_scoring_profile  # pylint: disable=import-outside-toplevel
+
+    season_used = season or "2025"
+    profile = profile or load_scoring_profile()
+    if stored:
+        for player_id, player_name, score, _ in stored_team_scores(
+            user, season_used, profile.key(), db_path=db_path
+        ):
+            yield player_id, player_name, score
+        return
+    team = dict(list_fantasy_team(user, db_path=db_path))
+    for chunk in _iter_scored_chunks(
+        list(team), season_used, jobs, profile, incremental=incremental, db_path=db_path
+    ):
+        store_player_scores(
+            season_used,
+            profile.key(),
+            [(pid, player.full_name, score) for pid, player, score, _ in chunk if player],
+            db_path=db_path,
+        )
+        for player_id, player, score, _ in chunk:
+            yield player_id, player.full_name if player else team[player_id], score
+
+
+@timed("db")
+def store_player_scores(season, profile_key, scores, db_path=FANTASY_DB_PATH):
+    """
+    Save (player_id, player_name, score) rows for a season and scoring
+    profile key (ScoringProfile.key()) to the player_scores table.
+    """
+    final = int(season_complete(season))
+    now = time.time()
+    with transaction(db_path) as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO player_scores VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (profile_key, season, player_id, player_name, score, final, now)
+                for player_id, player_name, score in scores
+            ],
+        )
+
+
+@timed("db")
+def stale_score_players(season, profile_key, max_age=MAX_SCORE_AGE, db_path=FANTASY_DB_PATH):
+    """
+    Return the IDs of fantasy-rostered players whose stored score for a
+    season and profile is missing, or older than max_age seconds and
+    computed before the season ended.
+    """
+    with connection(db_path) as conn:
+        return [
+            row[0]
+            for row in conn.execute(
+                """
+                SELECT DISTINCT f.player_id FROM fantasy_team f
+                LEFT JOIN player_scores s
+                    ON s.profile=? AND s.season=? AND s.player_id=f.player_id
+                WHERE s.player_id IS NULL OR (s.final=0 AND s.computed_at < ?)
+            """,
+                (profile_key, season, time.time() - max_age),
+            )
+        ]
+
+
+# pylint: disable=too-many-arguments
+def refresh_player_scores(
+    season=None, jobs=DEFAULT_JOBS, profile=None, *, incremental=False, force=False,
+    db_path=FANTASY_DB_PATH,
+):
+    """
+    Score every fantasy-rostered player whose stored score is stale (every
+    rostered player with force) and save the results to player_scores.
+    With incremental, scores come from locally synced game logs.
+    Returns a (refreshed, failed) tuple of player counts.
+    """
+    from src.scoring import load_scoring_profile  # pylint: disable=import-outside-toplevel
+
+    season_used = season or "2025"
+    profile = profile or load_scoring_profile()
+    if force:
+        with connection(db_path) as conn:
+            player_ids = [
+                row[0] for row in conn.execute("SELECT DISTINCT player_id FROM fantasy_team")
+            ]
+    else:
+        player_ids = stale_score_players(season_used, profile.key(), db_path=db_path)
+    refreshed = failed = 0
+    for chunk in _iter_scored_chunks(
+        player_ids, season_used, jobs, profile, incremental=incremental, db_path=db_path
+    ):
+        scored = [(pid, player.full_name, score) for pid, player, score, _ in chunk if player]
+        store_player_scores(season_used, profile.key(), scored, db_path=db_path)
+        refreshed += len(scored)
+        failed += len(chunk) - len(scored)
+    return refreshed, failed
+
+
+@timed("db")
+def stored_team_scores(user, season, profile_key, db_path=FANTASY_DB_PATH):
+    """
+    Read a user's team from the player_scores table.
+    Returns a list of (player_id, player_name, score, computed_at) tuples;
+    score and computed_at are None for players without a stored score.
+    """
+    with connection(db_path) as conn:
+        return conn.execute(
+            """
+            SELECT f.player_id, COALESCE(s.player_name, f.player_name), s.score, s.computed_at
+            FROM fantasy_team f
+            LEFT JOIN player_scores s
+                ON s.profile=? AND s.season=? AND s.player_id=f.player_id
+            WHERE f.user=?
+        """,
+            (profile_key, season, user),
+        ).fetchall()
+
+
+@timed("db")
+def league_score_totals(season, profile_key, db_path=FANTASY_DB_PATH):
+    """
+    Total every user's stored player scores in one query.
+    Returns a list of (user, players, scored, total, oldest computed_at)
+    tuples, highest total first; scored counts players with a stored score.
+    """
+    with connection(db_path) as conn:
+        return conn.execute(
+            """
+            SELECT f.user, COUNT(*), COUNT(s.score), COALESCE(SUM(s.score), 0.0),
+                MIN(s.computed_at)
+            FROM fantasy_team f
+            LEFT JOIN player_scores s
+                ON s.profile=? AND s.season=? AND s.player_id=f.player_id
+            GROUP BY f.user
+            ORDER BY 4 DESC, f.user
+        """,
+            (profile_key, season),
+        ).fetchall()
+
+
+@timed("db")
+def fantasy_rosters(users=None, db_path=FANTASY_DB_PATH):
+    """
+    Return {user: [player_id, ...]} for every fantasy team, or only for
+    the given users, in one query. Users without players are missing.
+    """
+    query = "SELECT user, player_id FROM fantasy_team"
+    params = ()
+    if users is not None:
+        query += f" WHERE user IN ({', '.join('?' * len(users))})"
+        params = tuple(users)
+    rosters = {}
+    with connection(db_path) as conn:
+        for user, player_id in conn.execute(query + " ORDER BY user", params):
+            rosters.setdefault(user, []).append(player_id)
+    return rosters
+
+
+# pylint: disable=too-many-arguments,too-many-locals
+def score_rosters(
+    season=None, jobs=DEFAULT_JOBS, profile=None, *, incremental=False, users=None,
+    db_path=FANTASY_DB_PATH,
+):
+    """
+    Fetch and score every player on any user's fantasy team (or only the
+    given users' teams) for a season. Each player is fetched and scored
+    once, however many teams roster them, and the scores are saved to
+    player_scores.
+    Returns (rosters, scored): fantasy_rosters() output and
+    {player_id: (PlayerStats, score, category points)} for every player
+    with data, where category points follow the profile's columns.
+    """
+    from src.scoring import load_scoring_profile  # pylint: disable=import-outside-toplevel
+
+    season_used = season or "2025"
+    profile = profile or load_scoring_profile()
+    rosters = fantasy_rosters(users, db_path=db_path)
+    player_ids = list(dict.fromkeys(pid for roster in rosters.values() for pid in roster))
+    scored = {}
+    for chunk in _iter_scored_chunks(
+        player_ids, season_used, jobs, profile, incremental=incremental, db_path=db_path
+    ):
+        found = [(pid, player.full_name, score) for pid, player, score, _ in chunk if player]
+        store_player_scores(season_used, profile.key(), found, db_path=db_path)
+        scored.update(
+            (pid, (player, score, points)) for pid, player, score, points in chunk if player
+        )
+    return rosters, scored
+
+
+def league_standings(
+    season=None, jobs=DEFAULT_JOBS, profile=None, *, incremental=False, users=None,
+    db_path=FANTASY_DB_PATH,
+):
+    """
+    Score every user's fantasy team (or only the given users') for a season,
+    fetching each player once (see score_rosters).
+    Returns a list of (user, players, scored, total, category points)
+    tuples, highest total first, where category points is an array
+    following the profile's columns and scored counts players with data.
+    """
+    # pylint: disable=import-outside-toplevel
+    import numpy as np
+    from src.scoring import load_scoring_profile
+
+    profile = profile or load_scoring_profile()
+    rosters, scored = score_rosters(
+        season, jobs, profile, incremental=incremental, users=users, db_path=db_path
     )
-    players = c.fetchall()
-    conn.close()
-    return players
+    standings = []
+    for user, roster in rosters.items():
+        found = [scored[pid] for pid in roster if pid in scored]
+        standings.append(
+            (
+                user,
+                len(roster),
+                len(found),
+                sum(score for _, score, _ in found),
+                sum((points for _, _, points in found), np.zeros(len(profile.columns))),
+            )
+        )
+    return sorted(standings, key=lambda row: (-row[3], row[0]))
+
+
+def sync_fantasy_game_logs(season=None, jobs=DEFAULT_JOBS, db_path=FANTASY_DB_PATH):
+    """
+    Pull new game logs for every player on any user's fantasy team.
+    Returns a (players, games) tuple: players synced and game rows written.
+    """
+    with connection(db_path) as conn:
+        player_ids = [
+            row[0] for row in conn.execute("SELECT DISTINCT player_id FROM fantasy_team")
+        ]
+    games = sync_game_logs(player_ids, season, jobs=jobs, db_path=db_path)
+    return len(player_ids), games
+
+
+def _synced_totals(player_ids, season, jobs, db_path):
+    """Sync the players' game logs and return (player_id, PlayerStats or None) pairs."""
+    sync_game_logs(player_ids, season, jobs=jobs, db_path=db_path)
+    totals = season_totals(player_ids, season, db_path=db_path)
+    return [(player_id, totals.get(player_id)) for player_id in player_ids]
 
 
-def print_team_fantasy_scores(user, db_path=FANTASY_DB_PATH):
+# pylint: disable=too-many-arguments
+def print_team_fantasy_scores(
+    user, db_path=FANTASY_DB_PATH, season=None, jobs=DEFAULT_JOBS, profile=None, *,
+    incremental=False, stored=False,
+):
     """
     Print the fantasy scores for all players on a user's fantasy team and the total score.
+    The roster is fetched with batched multi-player requests, spread over up
+    to `jobs` concurrent workers, and scored under the scoring profile (the
+    default preset if None). Results are printed in roster order and a
+    failure for one player does not abort the total. With incremental,
+    scores come from locally synced game logs, and with stored from the
+    player_scores table (see iter_team_fantasy_scores).
     """
-    team = list_fantasy_team(user, db_path=db_path)
-    if not team:
+    if not list_fantasy_team(user, db_path=db_path):
         print(f"No players found for user '{user}'.")
         return
 
+    season_used = season or "2025"
     total_score = 0
     print(f"Fantasy Team: {user}:\n{'-'*40}")
-    for player_id, player_name in team:
-        try:
-            score = get_player_fantasy_points(player_id)
-        except sqlite3.Error as e:
-            print(
-                f"Database error fetching score for {player_name} (ID {player_id}): {e}"
-            )
+    for player_id, player_name, score in iter_team_fantasy_scores(
+        user, season_used, jobs, profile, db_path=db_path, incremental=incremental,
+        stored=stored,
+    ):
+        if score is None and stored:
+            print(f"No stored score for {player_name} (ID {player_id}); run --refresh-scores.")
+            continue
+        if score is None:
+            print(f"Error fetching score for {player_name} (ID {player_id}): No player data found.")
             continue
+        print(f"Fantasy score for {player_name} ({season_used}): {score}")
         total_score += score
     print("-" * 40)
     print(f"Season Fantasy Score: {total_score}")
+
+
+def print_league_scores(season=None, profile=None, db_path=FANTASY_DB_PATH):
+    """
+    Print every user's team total from the player_scores table, highest
+    first. Nothing is fetched; stored scores come from --refresh-scores
+    and earlier --fantasy-team-score runs.
+    """
+    from src.scoring import load_scoring_profile  # pylint: disable=import-outside-toplevel
+
+    season_used = season or "2025"
+    profile = profile or load_scoring_profile()
+    rows = league_score_totals(season_used, profile.key(), db_path=db_path)
+    if not rows:
+        print("No fantasy teams found.")
+        return
+    print(f"League scores ({season_used}, {profile.name} scoring):")
+    print(f"{'#':>3}  {'User':<20} {'Players':>7} {'Score':>10}")
+    print("-" * 44)
+    missing = 0
+    oldest = None
+    for rank, (user, players, scored, total, computed_at) in enumerate(rows, start=1):
+        print(f"{rank:>3}  {user:<20} {players:>7} {total:>10.1f}")
+        missing += players - scored
+        if computed_at is not None:
+            oldest = min(oldest or computed_at, computed_at)
+    if oldest is not None:
+        as_of = datetime.datetime.fromtimestamp(oldest).strftime("%Y-%m-%d %H:%M")
+        print(f"Scores as of {as_of}.")
+    if missing:
+        print(f"{missing} roster spots have no stored score; run --refresh-scores.")
+
+
+def print_league_standings(season=None, jobs=DEFAULT_JOBS, profile=None, incremental=False):
+    """
+    Print every user's fantasy team ranked by total score, with hitting
+    and pitching subtotals and the leading team in each scoring category.
+    """
+    from src.scoring import load_scoring_profile  # pylint: disable=import-outside-toplevel
+
+    season_used = season or "2025"
+    profile = profile or load_scoring_profile()
+    standings = league_standings(season_used, jobs, profile, incremental=incremental)
+    if not standings:
+        print("No fantasy teams found.")
+        return
+    groups = [group for group, _ in profile.columns]
+    print(f"League standings ({season_used}, {profile.name} scoring):")
+    print(f"{'#':>3}  {'User':<20} {'Players':>7} {'Hitting':>9} {'Pitching':>9} {'Total':>10}")
+    print("-" * 63)
+    for rank, (user, players, _, total, points) in enumerate(standings, start=1):
+        hitting = sum(p for p, group in zip(points, groups) if group == "hitting")
+        pitching = sum(p for p, group in zip(points, groups) if group == "pitching")
+        print(
+            f"{rank:>3}  {user:<20} {players:>7} {hitting:>9.1f} {pitching:>9.1f} {total:>10.1f}"
+        )
+    print("\nCategory leaders:")
+    for j, name in enumerate(profile.column_names()):
+        leader = max(standings, key=lambda row, j=j: row[4][j])
+        print(f"  {name:<28} {leader[0]:<20} {leader[4][j]:>9.1f}")
+    missing = sum(players - scored for _, players, scored, _, _ in standings)
+    if missing:
+        print(f"No player data found for {missing} roster spots.")
+
+
+def matchup_rows(
+    user, opponent, season=None, jobs=DEFAULT_JOBS, profile=None, *, incremental=False
+):
+    """
+    Score two fantasy teams head to head, fetching each player once.
+    Returns (category, points, opponent points, result) rows for every
+    category of the profile followed by a "total" row, where result is
+    "win", "loss" or "tie" for the user; None if either team is empty.
+    """
+    from src.scoring import load_scoring_profile  # pylint: disable=import-outside-toplevel
+
+    profile = profile or load_scoring_profile()
+    standings = {row[0]: row for row in league_standings(
+        season, jobs, profile, incremental=incremental, users=[user, opponent]
+    )}
+    for name in (user, opponent):
+        if name not in standings:
+            print(f"{name} has no players on their fantasy team.")
+            return None
+    ours, theirs = standings[user], standings[opponent]
+    rows = [
+        (name, float(ours[4][j]), float(theirs[4][j]))
+        for j, name in enumerate(profile.column_names())
+    ]
+    rows.append(("total", ours[3], theirs[3]))
+    return [(name, points, other, matchup_result(points, other)) for name, points, other in rows]
+
+
+def matchup_result(points, opponent_points):
+    """Return "win", "loss" or "tie" for one category of a matchup."""
+    if points > opponent_points:
+        return "win"
+    if points < opponent_points:
+        return "loss"
+    return "tie"
+
+
+def print_matchup(
+    user, opponent, season=None, jobs=DEFAULT_JOBS, profile=None, *, incremental=False
+):
+    """Print a head-to-head comparison of two fantasy teams, category by category."""
+    rows = matchup_rows(user, opponent, season, jobs, profile, incremental=incremental)
+    if rows is None:
+        return
+    print(f"Matchup ({season or '2025'}): {user} vs {opponent}")
+    print(f"{'Category':<28} {user:>14} {opponent:>14}")
+    print("-" * 58)
+    results = {"win": 0, "loss": 0, "tie": 0}
+    for name, points, opponent_points, result in rows[:-1]:
+        results[result] += 1
+        print(f"{name:<28} {points:>14.1f} {opponent_points:>14.1f}")
+    _, total, opponent_total, _ = rows[-1]
+    print("-" * 58)
+    print(f"{'Total':<28} {total:>14.1f} {opponent_total:>14.1f}")
+    print(
+        f"Categories for {user}: {results['win']} won, {results['loss']} lost, "
+        f"{results['tie']} tied."
+    )
+    if total == opponent_total:
+        print("The matchup is tied.")
+    else:
+        print(f"{user if total > opponent_total else opponent} wins the matchup.")
@@ -0,0 +1,281 @@
+"""Incremental game-log sync: per-game stat rows and running season totals in the local database."""
+
+import json
+import time
+
+from src.db import DB_PATH, connection, register_column, register_schema, transaction
+from src.instrument import timed
+from src.stats import INNINGS_STATS, PlayerStats, StatGroup, StatSplit, stat_number
+from src.transport import ContextThreadPool, send
+from src.utils import fetch_people
+
+GAME_LOG_DB_PATH = DB_PATH
+GAME_LOG_CHUNK_SIZE = 50
+# Player IDs per "IN (...)" query, below SQLite's bound-variable limit.
+SQL_VARIABLE_CHUNK = 500
+
+# Stat groups synced from game logs; fielding lines are not scored.
+GAME_LOG_GROUPS = ("hitting", "pitching")
+
+register_schema(
+    """
+    CREATE TABLE IF NOT EXISTS player_game_log (
+        player_id INTEGER,
+        season TEXT,
+        group_name TEXT,
+        game_pk INTEGER,
+        game_date TEXT,
+        stats TEXT,
+        PRIMARY KEY (player_id, season, group_name, game_pk)
+    );
+    CREATE TABLE IF NOT EXISTS player_season_totals (
+        player_id INTEGER,
+        season TEXT,
+        group_name TEXT,
+        stat TEXT,
+        value REAL,
+        PRIMARY KEY (player_id, season, group_name, stat)
+    );
+    CREATE TABLE IF NOT EXISTS game_log_checkpoint (
+        player_id INTEGER,
+        season TEXT,
+        full_name TEXT,
+        last_game_date TEXT,
+        synced_at REAL,
+        position TEXT,
+        PRIMARY KEY (player_id, season)
+    );
+"""
+)
+register_column("game_log_checkpoint", "position", "TEXT")
+
+
+def counting_stats(stat):
+    """
+    Return the stats of one game line that can be summed into season
+    totals, as floats; rate stats such as avg and era are left out.
+    """
+    return {
+        name: stat_number(name, value)
+        for name, value in stat.items()
+        if isinstance(value, (int, float)) or name in INNINGS_STATS
+    }
+
+
+def innings_text(innings):
+    """Format a fractional innings total back to StatsAPI notation, e.g. 50.333 -> "50.1"."""
+    outs = round(innings * 3)
+    return f"{outs // 3}.{outs % 3}"
+
+
+def game_log_params(season, start_date=None):
+    """Build the /people query parameters hydrating game logs, optionally from start_date on."""
+    window = f",startDate={start_date}" if start_date else ""
+    return {
+        "hydrate": f"stats(group=[hitting,pitching],type=[gameLog],season={season}{window})",
+        "season": season,
+    }
+
+
+def _fetch_game_log_chunk(chunk, season, start_date):
+    """
+    Fetch one chunk of players' game logs. Returns a list of player dicts.
+    Requests bypass the response cache: the game log tables already hold
+    everything before the checkpoint, and the checkpoint day must be fresh.
+    """
+    return fetch_people(chunk, game_log_params(season, start_date), get=send)
+
+
+def game_log_rows(person, start_date=None):
+    """
+    Return (group, game_pk, game_date, stat) for every game-log split of a
+    /people entry, skipping games before start_date. Other stat types and
+    splits without a game are ignored.
+    """
+    rows = []
+    for stat_group in person.get("stats", []):
+        group_name = stat_group.get("group", {}).get("displayName", "")
+        stat_type = stat_group.get("type", {}).get("displayName", "")
+        if group_name not in GAME_LOG_GROUPS or stat_type != "gameLog":
+            continue
+        for split in stat_group.get("splits", []):
+            game_pk = split.get("game", {}).get("gamePk")
+            game_date = split.get("date", "")
+            if game_pk is None or (start_date and game_date < start_date):
+                continue
+            rows.append((group_name, game_pk, game_date, split.get("stat", {})))
+    return rows
+
+
+@timed("db")
+def sync_checkpoints(player_ids, season, db_path=GAME_LOG_DB_PATH):
+    """Return {player_id: last synced game date} for players synced for a season before."""
+    with connection(db_path) as conn:
+        rows = conn.execute(
+            "SELECT player_id, last_game_date FROM game_log_checkpoint WHERE season=?",
+            (season,),
+        ).fetchall()
+    wanted = set(player_ids)
+    return {player_id: last_date for player_id, last_date in rows if player_id in wanted}
+
+
+# pylint: disable=too-many-locals
+@timed("db")
+def apply_game_logs(people, season, checkpoints, db_path=GAME_LOG_DB_PATH):
+    """
+    Store the game logs of fetched /people entries in one transaction.
+    New games are inserted and re-fetched games (the checkpoint day is
+    always re-read, for double-headers and games in progress) replace their
+    old row; season totals are adjusted by the difference only, so the work
+    is proportional to the number of fetched games.
+    Returns the number of game rows written.
+    """
+    written = 0
+    now = time.time()
+    with transaction(db_path) as conn:
+        for person in people:
+            player_id = person["id"]
+            last_date = checkpoints.get(player_id)
+            for group_name, game_pk, game_date, stat in game_log_rows(person, last_date):
+                key = (player_id, season, group_name, game_pk)
+                old = conn.execute(
+                    """
+                    SELECT stats FROM player_game_log
+                    WHERE player_id=? AND season=? AND group_name=? AND game_pk=?
+                """,
+                    key,
+                ).fetchone()
+                delta = counting_stats(stat)
+                for name, value in counting_stats(json.loads(old[0]) if old else {}).items():
+                    delta[name] = delta.get(name, 0.0) - value
+                conn.execute(
+                    "INSERT OR REPLACE INTO player_game_log VALUES (?, ?, ?, ?, ?, ?)",
+                    key + (game_date, json.dumps(stat)),
+                )
+                conn.executemany(
+                    """
+                    INSERT INTO player_season_totals VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (player_id, season, group_name, stat)
+                    DO UPDATE SET value = value + excluded.value
+                """,
+                    [(player_id, season, group_name, name, value) for name, value in delta.items()],
+                )
+                last_date = max(last_date or "", game_date)
+                written += 1
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO game_log_checkpoint
+                    (player_id, season, full_name, last_game_date, synced_at, position)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    player_id,
+                    season,
+                    person.get("fullName", ""),
+                    last_date,
+                    now,
+                    person.get("primaryPosition", {}).get("name", ""),
+                ),
+            )
+    return written
+
+
+def sync_game_logs(player_ids, season=None, jobs=1, db_path=GAME_LOG_DB_PATH):
+    """
+    Pull only the games played since each player's last checkpoint and
+    fold them into the local game log and season totals. Players are
+    fetched in batched /people requests, grouped by checkpoint date, with
+    up to `jobs` concurrent workers.
+    Returns the number of game rows written.
+    """
+    season_used = season or "2025"
+    unique_ids = list(dict.fromkeys(int(pid) for pid in player_ids))
+    checkpoints = sync_checkpoints(unique_ids, season_used, db_path=db_path)
+    batches = {}
+    for player_id in unique_ids:
+        batches.setdefault(checkpoints.get(player_id), []).append(player_id)
+    requests_to_send = [
+        (ids[i : i + GAME_LOG_CHUNK_SIZE], start_date)
+        for start_date, ids in batches.items()
+        for i in range(0, len(ids), GAME_LOG_CHUNK_SIZE)
+    ]
+    written = 0
+    with ContextThreadPool(max_workers=max(1, jobs)) as pool:
+        results = pool.map(
+            lambda request: _fetch_game_log_chunk(request[0], season_used, request[1]),
+            requests_to_send,
+        )
+        for people in results:
+            written += apply_game_logs(people, season_used, checkpoints, db_path=db_path)
+    return written
+
+
+def _id_chunks(player_ids):
+    """Yield ("?, ?, ...", ids) for distinct player IDs in chunks of SQL_VARIABLE_CHUNK."""
+    wanted = list(dict.fromkeys(int(pid) for pid in player_ids))
+    for start in range(0, len(wanted), SQL_VARIABLE_CHUNK):
+        chunk = wanted[start : start + SQL_VARIABLE_CHUNK]
+        yield ", ".join("?" * len(chunk)), chunk
+
+
+@timed("db")
+def season_totals(player_ids, season=None, db_path=GAME_LOG_DB_PATH):
+    """
+    Build PlayerStats from the running season totals of synced players,
+    with their primary position (game logs have no fielding lines).
+    Returns {player_id: PlayerStats}; players never synced are missing,
+    synced players without games have no stat groups.
+    """
+    season_used = season or "2025"
+    names, totals = [], []
+    with connection(db_path) as conn:
+        for placeholders, chunk in _id_chunks(player_ids):
+            names += conn.execute(
+                "SELECT player_id, full_name, position FROM game_log_checkpoint "
+                f"WHERE season=? AND player_id IN ({placeholders})",
+                (season_used, *chunk),
+            ).fetchall()
+            totals += conn.execute(
+                "SELECT player_id, group_name, stat, value FROM player_season_totals "
+                f"WHERE season=? AND player_id IN ({placeholders})",
+                (season_used, *chunk),
+            ).fetchall()
+    players = {
+        player_id: PlayerStats(player_id, full_name, position or "")
+        for player_id, full_name, position in names
+    }
+    for player_id, group_name, stat, value in totals:
+        if player_id not in players:
+            continue
+        groups = players[player_id].groups
+        if (group_name, "season") not in groups:
+            groups[(group_name, "season")] = StatGroup(
+                group_name, "season", [StatSplit({}, season_used)]
+            )
+        split = groups[(group_name, "season")].splits[0]
+        split.stat[stat] = innings_text(value) if stat in INNINGS_STATS else value
+    return players
+
+
+@timed("db")
+def game_lines(player_ids, season=None, db_path=GAME_LOG_DB_PATH):
+    """
+    Return every synced game of the players for a season as
+    {player_id: [{group: [stat dict]}, ...]}, one mapping per game in date
+    order (two-way players have hitting and pitching lines in one game).
+    """
+    season_used = season or "2025"
+    games = {}
+    with connection(db_path) as conn:
+        for placeholders, chunk in _id_chunks(player_ids):
+            for player_id, game_pk, group_name, stats in conn.execute(
+                f"""
+                SELECT player_id, game_pk, group_name, stats FROM player_game_log
+                WHERE season=? AND player_id IN ({placeholders})
+                ORDER BY game_date, game_pk
+            """,
+                (season_used, *chunk),
+            ):
+                game = games.setdefault(player_id, {}).setdefault(game_pk, {})
+                game.setdefault(group_name, []).append(json.loads(stats))
+    return {player_id: list(by_game.values()) for player_id, by_game in games.items()}
@@ -0,0 +1,595 @@
+"""Command handlers for the Baseball CLI.
+
+cmd_<command>(args, profile) runs a command and prints text;
+cmd_<command>_records(args, profile) returns (kind, records) for --format
+json/ndjson/csv, or None if the player or team cannot be found.
+Each handler imports what it uses when it runs, so a command only pays
+for its own dependencies (no NumPy for a roster lookup, no network stack
+for a fantasy team listing).
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import argparse
+import sys
+
+
+def read_names(values):
+    """
+    Expand a multi-name flag's values. "-" reads names from stdin and
+    "@FILE" from a file, one per line (blank lines and # comments are
+    ignored). Duplicates are dropped, keeping the first occurrence.
+    Raises argparse.ArgumentError if a name file cannot be read.
+    """
+    names = []
+    for value in values:
+        if value == "-":
+            lines = sys.stdin.read().splitlines()
+        elif value.startswith("@"):
+            try:
+                with open(value[1:], encoding="utf-8") as f:
+                    lines = f.read().splitlines()
+            except OSError as e:
+                message = f"could not read names from {value[1:]}: {e.strerror or e}"
+                raise argparse.ArgumentError(None, message) from e
+        else:
+            lines = [value]
+        names.extend(
+            line.strip() for line in lines if line.strip() and not line.strip().startswith("#")
+        )
+    return list(dict.fromkeys(names))
+
+
+def resolve_players(names, jobs=1):
+    """
+    Resolve player names concurrently, reporting names that are not found.
+    Returns the distinct player IDs in input order.
+    """
+    from src.utils import lookup_player_ids
+
+    player_ids = []
+    for name, player_id in lookup_player_ids(names, jobs=jobs):
+        if player_id:
+            player_ids.append(player_id)
+        else:
+            print(f"Player '{name}' not found.")
+    return list(dict.fromkeys(player_ids))
+
+
+def resolve_teams(names):
+    """
+    Resolve team names (lookup_team_id reports names that are not found).
+    Returns a dict mapping team ID to the name it was requested by, in input order.
+    """
+    from src.utils import lookup_team_ids
+
+    teams = {}
+    for name, team_id in lookup_team_ids(names):
+        if team_id:
+            teams.setdefault(team_id, name)
+    return teams
+
+
+def cmd_player(args, _profile):
+    """--player: print each player's stats as soon as its batch arrives."""
+    from src.utils import format_player_stats, iter_player_chunks
+
+    player_ids = resolve_players(read_names(args.player), args.jobs)
+    season = None if args.career else args.season
+    for chunk in iter_player_chunks(player_ids, season=season, jobs=args.jobs):
+        for player_id, stats in chunk:
+            if stats:
+                print(format_player_stats(stats))
+            else:
+                print(f"No player data found for ID {player_id}.")
+
+
+def cmd_player_records(args, _profile):
+    """--player records: one player_stats record per stat."""
+    from src.output import player_stat_records
+    from src.utils import iter_player_chunks
+
+    player_ids = resolve_players(read_names(args.player), args.jobs)
+    season = None if args.career else args.season
+    chunks = iter_player_chunks(player_ids, season=season, jobs=args.jobs)
+    return "player_stats", (
+        record
+        for chunk in chunks
+        for _, stats in chunk
+        if stats
+        for record in player_stat_records(stats)
+    )
+
+
+def cmd_team(args, _profile):
+    """--team: print each team's season stats, or with --watch the changes to them."""
+    from src.utils import format_team_stats, iter_team_stat_groups
+
+    teams = resolve_teams(read_names(args.team))
+    if args.watch:
+        from src.watch import team_stats_target, watch
+
+        targets = [team_stats_target(tid, name, args.season) for tid, name in teams.items()]
+        if targets:
+            watch(targets, args.watch, args.watch_budget)
+        return
+    for team_id, stat_groups in iter_team_stat_groups(
+        list(teams), season=args.season, jobs=args.jobs
+    ):
+        if len(teams) > 1:
+            print(f"{teams[team_id]}:")
+        if stat_groups is not None:
+            print(format_team_stats(stat_groups.values()))
+
+
+def cmd_team_records(args, _profile):
+    """--team records: one team_stats record per stat."""
+    from src.output import team_stat_records
+    from src.utils import iter_team_stat_groups
+
+    season = args.season or "2025"
+    teams = resolve_teams(read_names(args.team))
+    results = iter_team_stat_groups(list(teams), season=season, jobs=args.jobs)
+    return "team_stats", (
+        record
+        for team_id, stat_groups in results
+        if stat_groups is not None
+        for record in team_stat_records(team_id, teams[team_id], season, stat_groups)
+    )
+
+
+def cmd_compare(args, _profile):
+    """--compare: print a side-by-side table of two or more players."""
+    from src.commands import compare_players
+
+    player_ids = resolve_players(read_names(args.compare), args.jobs)
+    if len(player_ids) < 2:
+        print("--compare needs at least two different players.")
+        return
+    print(compare_players(player_ids, season=args.season, career=args.career, jobs=args.jobs))
+
+
+def cmd_compare_records(args, _profile):
+    """--compare records: one compare record per stat and player."""
+    from src.commands import comparison_rows, fetch_compared_players
+    from src.output import compare_records
+
+    player_ids = resolve_players(read_names(args.compare), args.jobs)
+    if len(player_ids) < 2:
+        print("--compare needs at least two different players.")
+        return None
+    players = fetch_compared_players(
+        player_ids, season=args.season, career=args.career, jobs=args.jobs
+    )
+    if players is None:
+        print("Could not retrieve stats for one or more players.")
+        return None
+    return "compare", compare_records(players, comparison_rows(players))
+
+
+def cmd_fantasy_score(args, profile):
+    """--fantasy-score: print a player's fantasy score, or per-season scores with --seasons."""
+    from src.commands import get_player_fantasy_points, print_season_scores
+    from src.utils import lookup_player_id
+
+    player_id = lookup_player_id(args.fantasy_score)
+    if player_id and args.seasons:
+        print_season_scores([player_id], args.seasons, profile, jobs=args.jobs)
+    elif player_id:
+        get_player_fantasy_points(player_id, args.season, profile, incremental=args.incremental)
+    else:
+        print(f"Player '{args.fantasy_score}' not found.")
+
+
+def cmd_fantasy_score_records(args, profile):
+    """--fantasy-score records: one fantasy_score record, or season_scores with --seasons."""
+    from src.commands import compute_player_fantasy_points, season_scores
+    from src.output import season_score_records
+    from src.utils import lookup_player_id
+
+    season = args.season or "2025"
+    player_id = lookup_player_id(args.fantasy_score)
+    if not player_id:
+        print(f"Player '{args.fantasy_score}' not found.")
+        return None
+    if args.seasons:
+        rows = season_scores([player_id], args.seasons, profile, jobs=args.jobs)
+        return "season_scores", season_score_records(rows)
+    try:
+        name, score = compute_player_fantasy_points(
+            player_id, season, profile, incremental=args.incremental
+        )
+    except LookupError as e:
+        print(e)
+        return None
+    record = {"player_id": player_id, "player": name, "season": season, "score": score}
+    return "fantasy_score", iter([record])
+
+
+def cmd_fantasy_add(args, _profile):
+    """--fantasy-add: add a player to a user's fantasy team."""
+    from src.fantasy_db import add_player_to_team
+    from src.utils import lookup_player_id
+
+    user, player_name = args.fantasy_add
+    player_id = lookup_player_id(player_name)
+    if player_id:
+        add_player_to_team(user, player_id, player_name)
+        print(f"Added {player_name} (ID: {player_id}) to {user}'s fantasy team.")
+    else:
+        print(f"Player '{player_name}' not found.")
+
+
+def cmd_fantasy_remove(args, _profile):
+    """--fantasy-remove: remove a player from a user's fantasy team."""
+    from src.fantasy_db import remove_player_from_team
+    from src.utils import lookup_player_id
+
+    user, player_name = args.fantasy_remove
+    player_id = lookup_player_id(player_name)
+    if player_id:
+        remove_player_from_team(user, player_id)
+        print(f"Removed {player_name} (ID: {player_id}) from {user}'s fantasy team.")
+    else:
+        print(f"Player '{player_name}' not found.")
+
+
+def cmd_fantasy_import(args, _profile):
+    """--fantasy-import: apply roster changes from a CSV in one transaction."""
+    from src.fantasy_db import import_fantasy_rosters
+
+    try:
+        applied, skipped = import_fantasy_rosters(args.fantasy_import)
+    except OSError as e:
+        print(f"Could not read {args.fantasy_import}: {e.strerror or e}")
+        return
+    print(f"Applied {applied} roster changes from {args.fantasy_import}.")
+    for row in skipped:
+        print(f"Skipped row (player not found or invalid player_id): {row}")
+
+
+def cmd_fantasy_list(args, _profile):
+    """--fantasy-list: print the players on a user's fantasy team."""
+    from src.fantasy_db import list_fantasy_team
+
+    user = args.fantasy_list
+    team = list_fantasy_team(user)
+    if team:
+        print(f"{user}'s fantasy team:")
+        for pid, pname in team:
+            print(f"{pname} (ID: {pid})")
+    else:
+        print(f"{user} has no players on their fantasy team.")
+
+
+def cmd_fantasy_list_records(args, _profile):
+    """--fantasy-list records: one fantasy_list record per player."""
+    from src.fantasy_db import list_fantasy_team
+
+    team = list_fantasy_team(args.fantasy_list)
+    return "fantasy_list", (
+        {"user": args.fantasy_list, "player_id": pid, "player": name} for pid, name in team
+    )
+
+
+def cmd_fantasy_team_score(args, profile):
+    """--fantasy-team-score: print every player's score and the team total."""
+    from src.fantasy_db import list_fantasy_team, print_team_fantasy_scores
+
+    user = args.fantasy_team_score
+    team = list_fantasy_team(user)
+    if team and args.seasons:
+        from src.commands import print_season_scores
+
+        print(f"Fantasy Team: {user}")
+        print_season_scores(
+            [pid for pid, _ in team], args.seasons, profile, jobs=args.jobs, team_label=user
+        )
+    elif team:
+        print_team_fantasy_scores(
+            user,
+            season=args.season,
+            jobs=args.jobs,
+            profile=profile,
+            incremental=args.incremental,
+            stored=args.stored,
+        )
+    else:
+        print(f"{user} has no players on their fantasy team.")
+
+
+def cmd_fantasy_team_score_records(args, profile):
+    """--fantasy-team-score records: team_score records, or season_scores with --seasons."""
+    from src.fantasy_db import iter_team_fantasy_scores, list_fantasy_team
+    from src.output import season_score_records, team_score_records
+
+    season = args.season or "2025"
+    if args.seasons:
+        from src.commands import season_scores
+
+        team = list_fantasy_team(args.fantasy_team_score)
+        rows = season_scores([pid for pid, _ in team], args.seasons, profile, jobs=args.jobs)
+        return "season_scores", season_score_records(rows)
+    scores = iter_team_fantasy_scores(
+        args.fantasy_team_score,
+        season,
+        jobs=args.jobs,
+        profile=profile,
+        incremental=args.incremental,
+        stored=args.stored,
+    )
+    return "team_score", team_score_records(args.fantasy_team_score, season, scores)
+
+
+def cmd_roster(args, _profile):
+    """--roster: print each team's roster, or with --watch the changes to it."""
+    from src.utils import iter_team_rosters
+
+    season = args.season if args.season else "2025"
+    teams = resolve_teams(read_names(args.roster))
+    if args.watch:
+        from src.watch import roster_target, watch
+
+        targets = [roster_target(tid, name, season) for tid, name in teams.items()]
+        if targets:
+            watch(targets, args.watch, args.watch_budget)
+        return
+    for team_id, roster in iter_team_rosters(list(teams), season, jobs=args.jobs):
+        if roster:
+            print(f"Roster for team {teams[team_id]} in {season}:")
+            for player in roster:
+                print(
+                    f"{player['person']['fullName']} ({player['jerseyNumber']}) - "
+                    f"{player['position']['abbreviation']}"
+                )
+        else:
+            print(f"No roster found for team {team_id} in {season}.")
+
+
+def cmd_roster_records(args, _profile):
+    """--roster records: one roster record per player."""
+    from src.output import roster_records
+    from src.utils import iter_team_rosters
+
+    season = args.season or "2025"
+    teams = resolve_teams(read_names(args.roster))
+    results = iter_team_rosters(list(teams), season, jobs=args.jobs)
+    return "roster", (
+        record
+        for team_id, roster in results
+        if roster
+        for record in roster_records(team_id, teams[team_id], season, roster)
+    )
+
+
+def cmd_rebuild_index(args, _profile):
+    """--rebuild-index: rebuild the player index from every roster."""
+    from src.commands import rebuild_player_index
+
+    count = rebuild_player_index(season=args.season, jobs=args.jobs)
+    if count is not None:
+        print(f"Indexed {count} players.")
+
+
+def cmd_sync(args, _profile):
+    """--sync: pull new game logs for every fantasy-rostered player."""
+    from src.fantasy_db import sync_fantasy_game_logs
+
+    players, games = sync_fantasy_game_logs(season=args.season, jobs=args.jobs)
+    print(f"Synced {games} new or updated games for {players} players.")
+
+
+def cmd_refresh_scores(args, profile):
+    """--refresh-scores: recompute stale stored scores of every fantasy-rostered player."""
+    from src.fantasy_db import refresh_player_scores
+
+    refreshed, failed = refresh_player_scores(
+        season=args.season,
+        jobs=args.jobs,
+        profile=profile,
+        incremental=args.incremental,
+        force=args.rescore,
+    )
+    print(f"Refreshed stored scores for {refreshed} players.")
+    if failed:
+        print(f"No player data found for {failed} players.")
+
+
+def cmd_league_scores(args, profile):
+    """--league-scores: print every user's team total from the stored scores."""
+    from src.fantasy_db import print_league_scores
+
+    print_league_scores(season=args.season, profile=profile)
+
+
+def cmd_league_scores_records(args, profile):
+    """--league-scores records: one league_scores record per user."""
+    from src.fantasy_db import league_score_totals
+    from src.output import league_score_records
+
+    season = args.season or "2025"
+    rows = league_score_totals(season, profile.key())
+    return "league_scores", league_score_records(season, profile.name, rows)
+
+
+def cmd_league_standings(args, profile):
+    """--league-standings: score every fantasy team once per player and rank them."""
+    from src.fantasy_db import print_league_standings
+
+    print_league_standings(
+        season=args.season, jobs=args.jobs, profile=profile, incremental=args.incremental
+    )
+
+
+def cmd_league_standings_records(args, profile):
+    """--league-standings records: one standings record per user and category."""
+    from src.fantasy_db import league_standings
+    from src.output import standings_records
+
+    season = args.season or "2025"
+    standings = league_standings(season, args.jobs, profile, incremental=args.incremental)
+    return "standings", standings_records(season, profile.column_names(), standings)
+
+
+def cmd_matchup(args, profile):
+    """--matchup: compare two fantasy teams category by category."""
+    from src.fantasy_db import print_matchup
+
+    user, opponent = args.matchup
+    print_matchup(user, opponent, args.season, args.jobs, profile, incremental=args.incremental)
+
+
+def cmd_matchup_records(args, profile):
+    """--matchup records: one matchup record per category and the total."""
+    from src.fantasy_db import matchup_rows
+    from src.output import matchup_records
+
+    user, opponent = args.matchup
+    season = args.season or "2025"
+    rows = matchup_rows(user, opponent, season, args.jobs, profile, incremental=args.incremental)
+    if rows is None:
+        return None
+    return "matchup", matchup_records(user, opponent, season, rows)
+
+
+def cmd_optimize_lineup(args, profile):
+    """--optimize-lineup: print the best starting lineup of each fantasy team."""
+    from src.lineup import LINEUP_SLOTS, print_optimal_lineups
+
+    print_optimal_lineups(
+        users=args.optimize_lineup or None,
+        season=args.season,
+        jobs=args.jobs,
+        profile=profile,
+        slots=args.lineup_slots or LINEUP_SLOTS,
+        incremental=args.incremental,
+    )
+
+
+def cmd_optimize_lineup_records(args, profile):
+    """--optimize-lineup records: one lineup record per slot and bench player."""
+    from src.lineup import LINEUP_SLOTS, lineup_table, optimize_lineups
+    from src.output import lineup_records
+
+    season = args.season or "2025"
+    lineups = optimize_lineups(
+        args.optimize_lineup or None,
+        season,
+        args.jobs,
+        profile,
+        args.lineup_slots or LINEUP_SLOTS,
+        incremental=args.incremental,
+    )
+    return "lineup", lineup_records(season, lineup_table(lineups))
+
+
+def cmd_project(args, profile):
+    """--project: simulate the rest of the season for a fantasy team."""
+    from src.projection import print_team_projection
+
+    print_team_projection(
+        args.project, args.season, profile=profile, jobs=args.jobs,
+        simulations=args.simulations, seed=args.seed, games_left=args.games_left,
+    )
+
+
+def cmd_project_records(args, profile):
+    """--project records: one projection record for the team's season total."""
+    from src.output import projection_records
+    from src.projection import project_team, projection_summary_rows
+
+    season = args.season or "2025"
+    result = project_team(
+        args.project, season, profile=profile, jobs=args.jobs, simulations=args.simulations,
+        seed=args.seed, games_left=args.games_left,
+    )
+    if result is None:
+        return None
+    return "projection", projection_records(
+        args.project, season, args.simulations, args.seed, projection_summary_rows(result[1])
+    )
+
+
+def _trade_player_ids(args):
+    """Look up the --give and --get players; returns (give, get) IDs or None."""
+    from src.utils import lookup_player_id
+
+    ids = ([], [])
+    for names, found in zip((args.give, args.get), ids):
+        for name in names:
+            player_id = lookup_player_id(name)
+            if not player_id:
+                print(f"Player '{name}' not found.")
+                return None
+            found.append(int(player_id))
+    return ids
+
+
+def cmd_evaluate_trade(args, profile):
+    """--evaluate-trade: compare a team's projection before and after a trade."""
+    from src.projection import print_trade_evaluation
+
+    trade = _trade_player_ids(args)
+    if trade is not None:
+        print_trade_evaluation(
+            args.evaluate_trade, *trade, args.season, profile=profile, jobs=args.jobs,
+            simulations=args.simulations, seed=args.seed, games_left=args.games_left,
+        )
+
+
+def cmd_evaluate_trade_records(args, profile):
+    """--evaluate-trade records: before, after and change projection records."""
+    from src.output import projection_records
+    from src.projection import evaluate_trade, projection_summary_rows
+
+    season = args.season or "2025"
+    trade = _trade_player_ids(args)
+    result = trade and evaluate_trade(
+        args.evaluate_trade, *trade, season, profile=profile, jobs=args.jobs,
+        simulations=args.simulations, seed=args.seed, games_left=args.games_left,
+    )
+    if not result:
+        return None
+    return "projection", projection_records(
+        args.evaluate_trade, season, args.simulations, args.seed,
+        projection_summary_rows(result[0]),
+    )
+
+
+def cmd_ingest(args, _profile):
+    """--ingest: download league-wide season stats into the stat store."""
+    from src.commands import ingest_league_stats
+
+    count = ingest_league_stats(season=args.season, jobs=args.jobs)
+    if count is not None:
+        print(f"Stored season stats for {count} players.")
+
+
+def cmd_leaderboard(args, profile):
+    """--leaderboard: print the top players from the stat store."""
+    from src.commands import print_leaderboard
+
+    print_leaderboard(
+        top_n=args.leaderboard,
+        season=args.season,
+        position=args.position,
+        team_name=args.team_filter,
+        profile=profile,
+        jobs=args.jobs,
+    )
+
+
+def cmd_leaderboard_records(args, profile):
+    """--leaderboard records: one leaderboard record per ranked player."""
+    from src.commands import league_leaderboard
+    from src.output import leaderboard_records
+
+    rows = league_leaderboard(
+        top_n=args.leaderboard,
+        season=args.season,
+        position=args.position,
+        team_name=args.team_filter,
+        profile=profile,
+        jobs=args.jobs,
+    )
+    return ("leaderboard", leaderboard_records(rows)) if rows is not None else None
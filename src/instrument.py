@@ -0,0 +1,132 @@
+"""Lightweight instrumentation hooks for network, cache, decode, scoring, formatting and DB work."""
+
+import functools
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+_hooks = []
+_ID_RE = re.compile(r"/\d+(?=/|$)")
+
+
+def add_hook(hook):
+    """Register hook(event) to be called for every recorded event."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Unregister a hook added with add_hook."""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def endpoint_name(url):
+    """Reduce a URL to its path template, e.g. /api/v1/people/{id}."""
+    return _ID_RE.sub("/{id}", urlparse(url).path)
+
+
+def emit(kind, name, duration, **fields):
+    """Send an event to every hook; duration is in seconds."""
+    if not _hooks:
+        return
+    event = {
+        "ts": time.time(),
+        "kind": kind,
+        "name": name,
+        "duration_ms": round(duration * 1000, 3),
+        "thread": threading.current_thread().name,
+    }
+    event.update(fields)
+    for hook in list(_hooks):
+        hook(event)
+
+
+@contextmanager
+def span(kind, name, **fields):
+    """
+    Time a block and emit one event for it. The block may add fields
+    (status, bytes, cache, ...) to the yielded dict.
+    """
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        emit(kind, name, time.perf_counter() - start, **fields)
+
+
+def timed(kind):
+    """Decorator emitting a `kind` event named after the function for every call."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return func(*args, **kwargs)
+            with span(kind, func.__name__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class Profiler:
+    """Hook that collects events and prints a per-(kind, name) breakdown."""
+
+    def __init__(self):
+        self.events = []
+        self.start = time.perf_counter()
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def report(self):
+        """Return the breakdown table as a string."""
+        rows = {}
+        for event in self.events:
+            row = rows.setdefault(
+                (event["kind"], event["name"]),
+                {"calls": 0, "total": 0.0, "bytes": 0, "hits": 0},
+            )
+            row["calls"] += 1
+            row["total"] += event["duration_ms"]
+            row["bytes"] += event.get("bytes") or 0
+            row["hits"] += 1 if event.get("cache") == "hit" else 0
+        lines = [
+            f"{'kind':<8} {'name':<36} {'calls':>6} {'total ms':>10} "
+            f"{'avg ms':>8} {'bytes':>10} {'hits':>5}",
+            "-" * 89,
+        ]
+        for (kind, name), row in sorted(rows.items(), key=lambda item: -item[1]["total"]):
+            lines.append(
+                f"{kind:<8} {name:<36} {row['calls']:>6} {row['total']:>10.1f} "
+                f"{row['total'] / row['calls']:>8.2f} {row['bytes']:>10} {row['hits']:>5}"
+            )
+        lines.append("-" * 89)
+        wall_ms = (time.perf_counter() - self.start) * 1000
+        lines.append(f"command wall time: {wall_ms:.1f} ms")
+        return "\n".join(lines)
+
+
+class TraceWriter:
+    """Hook that appends every event as one JSON line to a file."""
+
+    def __init__(self, path, command=None):
+        self.lock = threading.Lock()
+        self.command = command
+        self.file = open(path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def __call__(self, event):
+        if self.command:
+            event = dict(event, command=self.command)
+        line = json.dumps(event)
+        with self.lock:
+            self.file.write(line + "\n")
+
+    def close(self):
+        """Flush and close the trace file."""
+        with self.lock:
+            self.file.close()
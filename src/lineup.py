@@ -0,0 +1,223 @@
+"""Optimal fantasy lineups: assign players to positional slots to maximize points.
+
+The assignment is solved exactly with the Hungarian algorithm on a
+players x (slots + bench) score matrix, so a 25-man roster takes a few
+hundred small NumPy steps instead of a permutation search.
+"""
+
+import numpy as np
+from src.fantasy_db import DEFAULT_JOBS, FANTASY_DB_PATH, score_rosters
+from src.scoring import load_scoring_profile
+
+# Starting slots, in display order; every other player is on the bench.
+LINEUP_SLOTS = ("C", "1B", "2B", "SS", "3B", "OF", "OF", "OF", "UTIL", "SP", "RP")
+BENCH = "BN"
+
+HITTER_POSITIONS = frozenset({"C", "1B", "2B", "SS", "3B", "OF", "DH"})
+
+# The player positions each slot accepts.
+SLOT_POSITIONS = {
+    "C": {"C"},
+    "1B": {"1B"},
+    "2B": {"2B"},
+    "SS": {"SS"},
+    "3B": {"3B"},
+    "OF": {"OF"},
+    "CI": {"1B", "3B"},
+    "MI": {"2B", "SS"},
+    "UTIL": HITTER_POSITIONS,
+    "SP": {"SP"},
+    "RP": {"RP"},
+    "P": {"SP", "RP"},
+}
+
+# StatsAPI position names and abbreviations mapped to lineup positions.
+POSITION_ALIASES = {
+    "Catcher": "C",
+    "First Base": "1B",
+    "Second Base": "2B",
+    "Third Base": "3B",
+    "Shortstop": "SS",
+    "Outfielder": "OF",
+    "Left Field": "OF",
+    "Center Field": "OF",
+    "Right Field": "OF",
+    "LF": "OF",
+    "CF": "OF",
+    "RF": "OF",
+    "Designated Hitter": "DH",
+    "Pitcher": "P",
+    "Two-Way Player": "TWP",
+}
+
+# Cost of an assignment that is not allowed; far above any real score.
+INELIGIBLE = 1e9
+
+
+def parse_slots(text):
+    """
+    Parse a comma-separated slot list such as "C,1B,2B,SS,3B,OF,OF,OF,UTIL,SP,RP".
+    Raises ValueError for unknown slots.
+    """
+    slots = tuple(slot.strip().upper() for slot in text.split(",") if slot.strip())
+    unknown = sorted(set(slots) - set(SLOT_POSITIONS))
+    if unknown or not slots:
+        known = ", ".join(SLOT_POSITIONS)
+        raise ValueError(f"Unknown lineup slots {', '.join(unknown)} (known: {known}).")
+    return slots
+
+
+def eligible_positions(player):
+    """
+    Return the lineup positions a PlayerStats can fill: its primary
+    position, any position it has a fielding line at, and SP and/or RP for
+    pitchers depending on how many of their games were starts.
+    """
+    primary = POSITION_ALIASES.get(player.position, player.position)
+    positions = {primary}
+    for stat in player.stat_dicts("fielding"):
+        fielded = stat.get("position", {}).get("abbreviation")
+        if fielded:
+            positions.add(POSITION_ALIASES.get(fielded, fielded))
+    if primary in ("P", "TWP"):
+        starts = float(player.get("pitching", "gamesStarted", default=0) or 0)
+        games = float(player.get("pitching", "gamesPitched", default=0) or 0)
+        if not games:
+            positions.update({"SP", "RP"})
+        else:
+            positions.add("SP" if starts * 2 >= games else "RP")
+        if primary == "TWP":
+            positions.add("DH")
+    positions.discard("P")
+    positions.discard("TWP")
+    return positions
+
+
+# pylint: disable=too-many-locals
+def assign(cost):
+    """
+    Solve a rectangular assignment problem with the Hungarian algorithm.
+    cost is an (n, m) array with n <= m; returns, for each row, the column
+    it is assigned to so that the total cost is minimal.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=int)  # row (1-based) assigned to each column, 0 if none
+    way = np.zeros(m + 1, dtype=int)
+    padded = np.hstack([np.full((n, 1), np.inf), cost])
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current = owner[column]
+            slack = padded[current - 1] - u[current] - v
+            better = ~used & (slack < min_slack)
+            min_slack[better] = slack[better]
+            way[better] = column
+            candidates = np.where(used, np.inf, min_slack)
+            nxt = int(np.argmin(candidates))
+            delta = candidates[nxt]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_slack[~used] -= delta
+            column = nxt
+            if owner[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+    assignment = np.full(n, -1)
+    for column in range(1, m + 1):
+        if owner[column]:
+            assignment[owner[column] - 1] = column - 1
+    return assignment
+
+
+def optimal_lineup(players, slots=LINEUP_SLOTS):
+    """
+    Choose the starting lineup with the highest total score.
+    players is a list of (player_id, PlayerStats, score). A slot stays
+    empty when no eligible player would add points.
+    Returns (lineup, bench, total): lineup lists (slot, player entry or
+    None) in slot order and bench the remaining player entries.
+    """
+    if not players:
+        return [(slot, None) for slot in slots], [], 0.0
+    # Columns: one per slot, then one bench column per player (worth 0 points).
+    cost = np.zeros((len(players), len(slots) + len(players)))
+    for i, (_, player, score) in enumerate(players):
+        positions = eligible_positions(player)
+        for j, slot in enumerate(slots):
+            cost[i, j] = -score if positions & SLOT_POSITIONS[slot] else INELIGIBLE
+    assignment = assign(cost)
+    starters = {int(column): players[i] for i, column in enumerate(assignment)}
+    lineup = [(slot, starters.get(j)) for j, slot in enumerate(slots)]
+    bench = [players[i] for i, column in enumerate(assignment) if column >= len(slots)]
+    total = sum(entry[2] for _, entry in lineup if entry is not None)
+    return lineup, bench, total
+
+
+# pylint: disable=too-many-arguments
+def optimize_lineups(
+    users=None, season=None, jobs=DEFAULT_JOBS, profile=None, slots=LINEUP_SLOTS, *,
+    incremental=False, db_path=FANTASY_DB_PATH,
+):
+    """
+    Find the optimal lineup of every user's fantasy team (or only the given
+    users'), fetching and scoring each rostered player once.
+    Returns {user: (lineup, bench, total)} (see optimal_lineup); players
+    without data are left out.
+    """
+    profile = profile or load_scoring_profile()
+    rosters, scored = score_rosters(
+        season, jobs, profile, incremental=incremental, users=users, db_path=db_path
+    )
+    lineups = {}
+    for user, roster in rosters.items():
+        players = [(pid, scored[pid][0], scored[pid][1]) for pid in roster if pid in scored]
+        lineups[user] = optimal_lineup(players, slots)
+    return lineups
+
+
+def lineup_rows(lineup, bench):
+    """Yield (slot, player_id, player name, positions, score) rows, starters then bench."""
+    for slot, entry in lineup + [(BENCH, entry) for entry in bench]:
+        if entry is None:
+            yield slot, None, None, None, None
+        else:
+            player_id, player, score = entry
+            yield slot, player_id, player.full_name, "/".join(
+                sorted(eligible_positions(player))
+            ), score
+
+
+def lineup_table(lineups):
+    """Yield (user, slot, player_id, player name, positions, score) rows from optimize_lineups()."""
+    for user, (lineup, bench, _) in lineups.items():
+        for row in lineup_rows(lineup, bench):
+            yield (user, *row)
+
+
+# pylint: disable=too-many-arguments
+def print_optimal_lineups(
+    users=None, season=None, jobs=DEFAULT_JOBS, profile=None, slots=LINEUP_SLOTS, *,
+    incremental=False,
+):
+    """Print the optimal lineup and bench of every requested fantasy team."""
+    lineups = optimize_lineups(users, season, jobs, profile, slots, incremental=incremental)
+    for user in users or []:
+        if user not in lineups:
+            print(f"{user} has no players on their fantasy team.")
+    for user, (lineup, bench, total) in lineups.items():
+        print(f"Optimal lineup for {user} ({season or '2025'}):")
+        for slot, _, name, positions, score in lineup_rows(lineup, bench):
+            if name is None:
+                print(f"  {slot:<5} (empty)")
+            else:
+                print(f"  {slot:<5} {name:<28} {positions:<12} {score:>8.1f}")
+        print(f"  Starting lineup total: {total:.1f}\n")
@@ -0,0 +1,257 @@
+"""Machine-readable output for the Fantasy Baseball CLI: JSON, NDJSON and CSV records.
+
+Every command's records are produced by a generator and written as soon as
+each one is available, so consumers can start work before a command
+finishes and output never has to be held in memory.
+"""
+
+import csv
+import json
+import sys
+from contextlib import contextmanager, redirect_stdout
+
+FORMATS = ("text", "json", "ndjson", "csv")
+
+# Stable column order for each kind of record; every record has exactly these keys.
+SCHEMAS = {
+    "player_stats": ("player_id", "player", "group", "type", "stat", "value"),
+    "team_stats": ("team_id", "team", "season", "group", "type", "stat", "value"),
+    "compare": ("group", "stat", "player_id", "player", "value"),
+    "roster": ("team_id", "team", "season", "player_id", "player", "jersey_number", "position"),
+    "fantasy_score": ("player_id", "player", "season", "score"),
+    "team_score": ("user", "season", "player_id", "player", "score", "error"),
+    "season_scores": ("player_id", "player", "season", "score", "trend"),
+    "fantasy_list": ("user", "player_id", "player"),
+    "leaderboard": ("rank", "player_id", "player", "team", "position", "score"),
+    "league_scores": ("rank", "user", "season", "profile", "players", "scored", "total"),
+    "standings": ("rank", "user", "season", "players", "scored", "total", "category", "points"),
+    "matchup": ("user", "opponent", "season", "category", "points", "opponent_points", "result"),
+    "lineup": ("user", "season", "slot", "player_id", "player", "positions", "score"),
+    "projection": (
+        "user", "season", "roster", "simulations", "seed", "mean", "p10", "p25", "p50", "p75",
+        "p90",
+    ),
+}
+
+
+def player_stat_records(player):
+    """Yield one player_stats record per stat of a PlayerStats."""
+    for group, stat_type, stat, value in player.items():
+        yield {
+            "player_id": player.player_id,
+            "player": player.full_name,
+            "group": group,
+            "type": stat_type,
+            "stat": stat,
+            "value": value,
+        }
+
+
+def team_stat_records(team_id, team, season, stat_groups):
+    """Yield one team_stats record per stat of a team's StatGroups."""
+    for (group, stat_type), stat_group in stat_groups.items():
+        if not stat_group.splits:
+            continue
+        for stat, value in stat_group.splits[0].stat.items():
+            if not isinstance(value, dict):
+                yield {
+                    "team_id": team_id,
+                    "team": team,
+                    "season": season,
+                    "group": group,
+                    "type": stat_type,
+                    "stat": stat,
+                    "value": value,
+                }
+
+
+def compare_records(players, rows):
+    """
+    Yield compare records from comparison_rows() output: one per stat and
+    player, so any number of players share the same columns.
+    """
+    for group, stat, values in rows:
+        for player, value in zip(players, values):
+            yield {
+                "group": group,
+                "stat": stat,
+                "player_id": player.player_id,
+                "player": player.full_name,
+                "value": value,
+            }
+
+
+def roster_records(team_id, team, season, roster):
+    """Yield one roster record per entry of a /teams/{id}/roster response."""
+    for entry in roster:
+        yield {
+            "team_id": team_id,
+            "team": team,
+            "season": season,
+            "player_id": entry["person"]["id"],
+            "player": entry["person"]["fullName"],
+            "jersey_number": entry.get("jerseyNumber"),
+            "position": entry.get("position", {}).get("abbreviation"),
+        }
+
+
+def team_score_records(user, season, scores):
+    """Yield team_score records from iter_team_fantasy_scores() output."""
+    for player_id, player_name, score in scores:
+        yield {
+            "user": user,
+            "season": season,
+            "player_id": player_id,
+            "player": player_name,
+            "score": score,
+            "error": "No player data found." if score is None else None,
+        }
+
+
+def season_score_records(rows):
+    """Yield one season_scores record per player and scored season from season_scores() rows."""
+    for player_id, name, by_season, trend in rows:
+        for season, score in by_season.items():
+            yield {
+                "player_id": player_id,
+                "player": name,
+                "season": season,
+                "score": score,
+                "trend": trend,
+            }
+
+
+def leaderboard_records(rows):
+    """Yield ranked leaderboard records from league_leaderboard() rows."""
+    for rank, (player_id, name, team, position, score) in enumerate(rows, 1):
+        yield {
+            "rank": rank,
+            "player_id": player_id,
+            "player": name,
+            "team": team,
+            "position": position,
+            "score": score,
+        }
+
+
+def league_score_records(season, profile_name, rows):
+    """Yield ranked league_scores records from league_score_totals() rows."""
+    for rank, (user, players, scored, total, _) in enumerate(rows, 1):
+        yield {
+            "rank": rank,
+            "user": user,
+            "season": season,
+            "profile": profile_name,
+            "players": players,
+            "scored": scored,
+            "total": total,
+        }
+
+
+def standings_records(season, category_names, standings):
+    """Yield one standings record per user and scoring category from league_standings() rows."""
+    for rank, (user, players, scored, total, points) in enumerate(standings, 1):
+        for category, value in zip(category_names, points):
+            yield {
+                "rank": rank,
+                "user": user,
+                "season": season,
+                "players": players,
+                "scored": scored,
+                "total": total,
+                "category": category,
+                "points": float(value),
+            }
+
+
+def matchup_records(user, opponent, season, rows):
+    """Yield one matchup record per category (and the total) from matchup_rows() rows."""
+    for category, points, opponent_points, result in rows:
+        yield {
+            "user": user,
+            "opponent": opponent,
+            "season": season,
+            "category": category,
+            "points": points,
+            "opponent_points": opponent_points,
+            "result": result,
+        }
+
+
+@contextmanager
+def messages_to_stderr():
+    """
+    Send print() output to stderr for the duration of the block and yield
+    the original stdout, so records written to it stay parseable. Streams
+    that route output per request (see src.server) switch only the calling
+    request.
+    """
+    redirect = getattr(sys.stdout, "redirect_to", None)
+    if redirect is not None:
+        out = getattr(sys.stdout, "target")()
+        with redirect(sys.stderr):
+            yield out
+    else:
+        out = sys.stdout
+        with redirect_stdout(sys.stderr):
+            yield out
+
+
+def lineup_records(season, rows):
+    """Yield one lineup record per slot and bench player from lineup_table() rows."""
+    for user, slot, player_id, name, positions, score in rows:
+        yield {
+            "user": user,
+            "season": season,
+            "slot": slot,
+            "player_id": player_id,
+            "player": name,
+            "positions": positions,
+            "score": score,
+        }
+
+
+def projection_records(user, season, simulations, seed, summaries):
+    """Yield one projection record per roster from projection_summary_rows() rows."""
+    for roster, mean, percentiles in summaries:
+        record = {
+            "user": user,
+            "season": season,
+            "roster": roster,
+            "simulations": simulations,
+            "seed": seed,
+            "mean": mean,
+        }
+        record.update({f"p{p}": value for p, value in percentiles.items()})
+        yield record
+
+
+def write_records(kind, records, fmt, out=None):
+    """
+    Write records of one kind to out (stdout by default) as they arrive.
+    json writes a single array, ndjson one object per line and csv a header
+    row followed by one row per record, all in SCHEMAS[kind] column order.
+    Returns the number of records written.
+    """
+    out = out or sys.stdout
+    columns = SCHEMAS[kind]
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+    elif fmt == "json":
+        out.write("[")
+    for record in records:
+        row = {column: record.get(column) for column in columns}
+        if fmt == "csv":
+            writer.writerow(row)
+        elif fmt == "json":
+            out.write(("," if count else "") + "\n  " + json.dumps(row))
+        else:
+            out.write(json.dumps(row) + "\n")
+        count += 1
+        out.flush()
+    if fmt == "json":
+        out.write("\n]\n" if count else "]\n")
+    out.flush()
+    return count
@@ -0,0 +1,148 @@
+"""Local player directory used to resolve player names and IDs without the StatsAPI."""
+
+import re
+import time
+import unicodedata
+
+from src.db import DB_PATH, connection, register_schema, transaction
+from src.instrument import timed
+
+PLAYER_INDEX_DB_PATH = DB_PATH
+
+_settings = {"db_path": PLAYER_INDEX_DB_PATH}
+
+register_schema(
+    """
+CREATE TABLE IF NOT EXISTS player_index (
+    player_id INTEGER PRIMARY KEY,
+    full_name TEXT,
+    name_key TEXT,
+    last_key TEXT,
+    team_id INTEGER,
+    position TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_player_index_name ON player_index (name_key);
+CREATE INDEX IF NOT EXISTS idx_player_index_last ON player_index (last_key);
+"""
+)
+
+
+def normalize_name(name):
+    """
+    Normalize a player name for matching: strip accents, fold case,
+    drop periods and apostrophes, and collapse whitespace.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    stripped = re.sub(r"[.'’]", "", stripped.casefold())
+    return " ".join(stripped.split())
+
+
+def configure_player_index(db_path):
+    """Point the player index at a different SQLite database file."""
+    _settings["db_path"] = db_path
+
+
+@timed("db")
+def store_players(players, replace=False):
+    """
+    Add or update players in the index.
+    players is an iterable of dicts with player_id, full_name and optionally
+    team_id and position. replace=True clears the index first.
+    Returns the number of players stored.
+    """
+    now = time.time()
+    rows = []
+    for player in players:
+        name_key = normalize_name(player["full_name"])
+        rows.append(
+            (
+                player["player_id"],
+                player["full_name"],
+                name_key,
+                name_key.rsplit(" ", maxsplit=1)[-1],
+                player.get("team_id"),
+                player.get("position"),
+                now,
+            )
+        )
+    with transaction(_settings["db_path"]) as conn:
+        if replace:
+            conn.execute("DELETE FROM player_index")
+        conn.executemany(
+            """
+            INSERT INTO player_index
+                (player_id, full_name, name_key, last_key, team_id, position, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(player_id) DO UPDATE SET
+                full_name=excluded.full_name,
+                name_key=excluded.name_key,
+                last_key=excluded.last_key,
+                team_id=COALESCE(excluded.team_id, team_id),
+                position=COALESCE(excluded.position, position),
+                updated_at=excluded.updated_at
+        """,
+            rows,
+        )
+    return len(rows)
+
+
+def _prefix_bounds(prefix):
+    """Return (low, high) bounds matching every key that starts with prefix."""
+    return prefix, prefix + "\U0010ffff"
+
+
+@timed("db")
+def find_player_id(name):
+    """
+    Resolve a player name to an MLB player ID from the local index.
+    Tries an exact match, then a full-name prefix, then a last-name prefix.
+    Returns None if the index has no match.
+    """
+    key = normalize_name(name)
+    if not key:
+        return None
+    low, high = _prefix_bounds(key)
+    queries = [
+        ("SELECT player_id FROM player_index WHERE name_key=? ORDER BY player_id", (key,)),
+        (
+            "SELECT player_id FROM player_index WHERE name_key>=? AND name_key<? "
+            "ORDER BY name_key",
+            (low, high),
+        ),
+        (
+            "SELECT player_id FROM player_index WHERE last_key>=? AND last_key<? "
+            "ORDER BY last_key, name_key",
+            (low, high),
+        ),
+    ]
+    with connection(_settings["db_path"]) as conn:
+        for sql, params in queries:
+            row = conn.execute(sql + " LIMIT 1", params).fetchone()
+            if row:
+                return row[0]
+    return None
+
+
+@timed("db")
+def find_player_name(player_id):
+    """Return a player's full name from the local index, or None if unknown."""
+    with connection(_settings["db_path"]) as conn:
+        row = conn.execute(
+            "SELECT full_name FROM player_index WHERE player_id=?", (int(player_id),)
+        ).fetchone()
+    return row[0] if row else None
+
+
+@timed("db")
+def search_players(prefix, limit=20):
+    """Return up to `limit` indexed full names whose name starts with prefix."""
+    low, high = _prefix_bounds(normalize_name(prefix))
+    with connection(_settings["db_path"]) as conn:
+        rows = conn.execute(
+            "SELECT full_name FROM player_index WHERE name_key>=? AND name_key<? "
+            "ORDER BY name_key LIMIT ?",
+            (low, high, limit),
+        ).fetchall()
+    return [row[0] for row in rows]
@@ -0,0 +1,273 @@
+"""Rest-of-season Monte Carlo projections and trade evaluation for fantasy teams.
+
+Each player's past games (from the synced game log) are scored under the
+scoring profile, and the rest of the season is simulated by resampling
+those games: in every remaining team game a player appears at their
+observed appearance rate and scores like a randomly drawn past game.
+Simulations run as NumPy arrays in fixed-size batches, each with its own
+seed spawned from --seed, spread over a process pool; results depend only
+on the seed, not on the number of workers.
+"""
+
+import datetime
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from src.fantasy_db import DEFAULT_JOBS, list_fantasy_team
+from src.game_log import game_lines, season_totals, sync_game_logs
+from src.scoring import load_scoring_profile, score_players
+
+SEASON_GAMES = 162
+# Approximate regular-season calendar, as (month, day).
+SEASON_START = (3, 27)
+SEASON_END = (9, 28)
+
+DEFAULT_SIMULATIONS = 10000
+BATCH_SIZE = 2000
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def season_games_left(season, today=None):
+    """Estimate how many team games are left in a regular season from the calendar."""
+    today = today or datetime.date.today()
+    start = datetime.date(int(season), *SEASON_START)
+    end = datetime.date(int(season), *SEASON_END)
+    if today <= start:
+        return SEASON_GAMES
+    if today >= end:
+        return 0
+    return round(SEASON_GAMES * (end - today).days / (end - start).days)
+
+
+def player_game_points(player_ids, season, profile, jobs=DEFAULT_JOBS):
+    """
+    Sync the players' game logs and score every past game.
+    Returns {player_id: array of fantasy points per game played}.
+    """
+    sync_game_logs(player_ids, season, jobs=jobs)
+    lines = game_lines(player_ids, season)
+    return {
+        player_id: score_players(lines[player_id], profile) if player_id in lines else np.zeros(0)
+        for player_id in player_ids
+    }
+
+
+def _simulate_batch(game_points, rates, games_left, membership, batch):
+    """
+    Simulate the rest of the season for one (simulations, seed) batch (in
+    a worker process). Returns a (simulations, rosters) array of
+    rest-of-season points per roster, where membership[i, r] is 1 if
+    player i is on roster r.
+    """
+    simulations, seed = batch
+    rng = np.random.default_rng(seed)
+    player_totals = np.zeros((simulations, len(game_points)))
+    for i, (points, rate) in enumerate(zip(game_points, rates)):
+        if not points.size or not games_left or not rate:
+            continue
+        draws = rng.choice(points, size=(simulations, games_left))
+        plays = rng.random((simulations, games_left)) < rate
+        player_totals[:, i] = np.where(plays, draws, 0.0).sum(axis=1)
+    return player_totals @ membership
+
+
+# pylint: disable=too-many-arguments
+def simulate(
+    game_points, rates, games_left, membership, simulations, *, seed=0, jobs=DEFAULT_JOBS
+):
+    """
+    Run `simulations` rest-of-season simulations in batches of BATCH_SIZE,
+    each seeded from `seed`, on up to `jobs` worker processes. Workers are
+    spawned, not forked, since the server calls this from a request thread
+    and forking a multithreaded process can copy held locks.
+    Returns a (simulations, rosters) array (see _simulate_batch).
+    """
+    sizes = [BATCH_SIZE] * (simulations // BATCH_SIZE)
+    if simulations % BATCH_SIZE:
+        sizes.append(simulations % BATCH_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    batches = list(zip(sizes, seeds))
+    run = partial(_simulate_batch, game_points, rates, games_left, membership)
+    if jobs <= 1 or len(batches) == 1:
+        return np.vstack([run(batch) for batch in batches])
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(jobs, len(batches)), mp_context=context) as pool:
+        return np.vstack(list(pool.map(run, batches)))
+
+
+# pylint: disable=too-many-locals
+def project_rosters(
+    rosters, season=None, *, profile=None, jobs=DEFAULT_JOBS, simulations=DEFAULT_SIMULATIONS,
+    seed=0, games_left=None,
+):
+    """
+    Project season-end fantasy totals for rosters given as
+    {label: (banked player IDs, playing player IDs)}: points the banked
+    players have already scored plus simulated rest-of-season points of
+    the playing players (the same for a plain projection, different after
+    a trade, where points already scored stay with the team).
+    Returns (players, totals, games_left): {player_id: (name, games,
+    banked points, mean rest-of-season points)}, {label: array of
+    simulated season totals} and the team games simulated. All rosters
+    share the same simulated games, so their totals compare directly.
+    """
+    season_used = season or "2025"
+    profile = profile or load_scoring_profile()
+    player_ids = list(dict.fromkeys(pid for ids in rosters.values() for pid in ids[0] + ids[1]))
+    points = player_game_points(player_ids, season_used, profile, jobs)
+    names = {pid: stats.full_name for pid, stats in season_totals(player_ids, season_used).items()}
+    if games_left is None:
+        games_left = season_games_left(season_used)
+    elapsed = max(1, SEASON_GAMES - games_left)
+    rates = [min(1.0, len(points[pid]) / elapsed) for pid in player_ids]
+    membership = np.array(
+        [[float(pid in ids[1]) for ids in rosters.values()] for pid in player_ids]
+    ).reshape(len(player_ids), len(rosters))
+    rest = simulate(
+        [points[pid] for pid in player_ids], rates, games_left, membership, simulations,
+        seed=seed, jobs=jobs,
+    )
+    banked = {pid: float(points[pid].sum()) for pid in player_ids}
+    players = {
+        pid: (
+            names.get(pid, str(pid)),
+            len(points[pid]),
+            banked[pid],
+            games_left * rate * float(points[pid].mean()) if points[pid].size else 0.0,
+        )
+        for pid, rate in zip(player_ids, rates)
+    }
+    totals = {
+        label: sum(banked[pid] for pid in ids[0]) + rest[:, r]
+        for r, (label, ids) in enumerate(rosters.items())
+    }
+    return players, totals, games_left
+
+
+def summarize(totals):
+    """Return (mean, {percentile: value}) for an array of simulated totals."""
+    return float(totals.mean()), {
+        p: float(v) for p, v in zip(PERCENTILES, np.percentile(totals, PERCENTILES))
+    }
+
+
+def _print_summary(label, totals):
+    """Print one row of mean and percentiles."""
+    mean, percentiles = summarize(totals)
+    columns = " ".join(f"{percentiles[p]:>9.1f}" for p in PERCENTILES)
+    print(f"{label:<10} {mean:>9.1f} {columns}")
+
+
+def _print_summary_header():
+    """Print the header of the mean and percentile table."""
+    columns = " ".join(f"{'p' + str(p):>9}" for p in PERCENTILES)
+    print(f"{'':<10} {'mean':>9} {columns}")
+
+
+# pylint: disable=too-many-arguments
+def project_team(
+    user, season=None, *, profile=None, jobs=DEFAULT_JOBS, simulations=DEFAULT_SIMULATIONS,
+    seed=0, games_left=None,
+):
+    """
+    Project a user's fantasy team (see project_rosters), with its totals
+    under "team". Returns None if the user has no players.
+    """
+    team = [pid for pid, _ in list_fantasy_team(user)]
+    if not team:
+        print(f"{user} has no players on their fantasy team.")
+        return None
+    return project_rosters(
+        {"team": (team, team)}, season, profile=profile, jobs=jobs, simulations=simulations,
+        seed=seed, games_left=games_left,
+    )
+
+
+# pylint: disable=too-many-arguments
+def print_team_projection(
+    user, season=None, *, profile=None, jobs=DEFAULT_JOBS, simulations=DEFAULT_SIMULATIONS,
+    seed=0, games_left=None,
+):
+    """Print each player's projection and the distribution of the team's season total."""
+    result = project_team(
+        user, season, profile=profile, jobs=jobs, simulations=simulations, seed=seed,
+        games_left=games_left,
+    )
+    if result is None:
+        return
+    players, totals, games_left = result
+    print(
+        f"Season projection for {user} ({season or '2025'}, {games_left} team games left, "
+        f"{simulations} simulations, seed {seed}):"
+    )
+    print(f"{'Player':<28} {'Games':>6} {'Points':>9} {'Rest mean':>10}")
+    print("-" * 56)
+    for name, games, banked, rest in players.values():
+        print(f"{name:<28} {games:>6} {banked:>9.1f} {rest:>10.1f}")
+    print()
+    _print_summary_header()
+    _print_summary("total", totals["team"])
+
+
+def trade_rosters(team, give_ids, get_ids):
+    """Return the {label: (banked, playing)} rosters before and after a trade."""
+    after = [pid for pid in team if pid not in give_ids] + [
+        pid for pid in get_ids if pid not in team
+    ]
+    return {"before": (team, team), "after": (team, after)}
+
+
+# pylint: disable=too-many-arguments
+def evaluate_trade(
+    user, give_ids, get_ids, season=None, *, profile=None, jobs=DEFAULT_JOBS,
+    simulations=DEFAULT_SIMULATIONS, seed=0, games_left=None,
+):
+    """
+    Project a user's season total before and after trading away give_ids
+    for get_ids. Returns (totals, games_left) with "before", "after" and
+    "change" arrays of simulated totals, or None if the trade is invalid.
+    """
+    team = [pid for pid, _ in list_fantasy_team(user)]
+    missing = [pid for pid in give_ids if pid not in team]
+    if not team or missing:
+        print(f"{user} does not have every player to give away on their fantasy team.")
+        return None
+    _, totals, games_left = project_rosters(
+        trade_rosters(team, give_ids, get_ids), season, profile=profile, jobs=jobs,
+        simulations=simulations, seed=seed, games_left=games_left,
+    )
+    totals["change"] = totals["after"] - totals["before"]
+    return totals, games_left
+
+
+# pylint: disable=too-many-arguments
+def print_trade_evaluation(
+    user, give_ids, get_ids, season=None, *, profile=None, jobs=DEFAULT_JOBS,
+    simulations=DEFAULT_SIMULATIONS, seed=0, games_left=None,
+):
+    """Print the projected season-total distribution before and after a trade."""
+    result = evaluate_trade(
+        user, give_ids, get_ids, season, profile=profile, jobs=jobs, simulations=simulations,
+        seed=seed, games_left=games_left,
+    )
+    if result is None:
+        return
+    totals, games_left = result
+    print(
+        f"Trade evaluation for {user} ({season or '2025'}, {games_left} team games left, "
+        f"{simulations} simulations, seed {seed}):"
+    )
+    _print_summary_header()
+    for label in ("before", "after", "change"):
+        _print_summary(label, totals[label])
+    better = float((totals["change"] > 0).mean())
+    print(f"\nThe trade improves the season total in {better:.0%} of simulations.")
+
+
+def projection_summary_rows(totals):
+    """Yield (label, mean, {percentile: value}) for each array of simulated totals."""
+    for label, values in totals.items():
+        mean, percentiles = summarize(values)
+        yield label, mean, percentiles
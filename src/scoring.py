@@ -0,0 +1,216 @@
+"""Fantasy scoring engine: scoring profiles compiled to weight vectors and applied with NumPy."""
+
+import functools
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+from src.instrument import timed
+from src.stats import stat_number
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Built-in scoring profiles. Batting and pitching categories are separate,
+# so a batter's walks and a pitcher's walks allowed are scored independently.
+SCORING_PRESETS = {
+    "default": {
+        "hitting": {
+            "runs": 1,  # R
+            "totalBases": 1,  # TB
+            "rbi": 1,  # RBI
+            "baseOnBalls": 1,  # BB
+            "strikeOuts": -1,  # K
+            "stolenBases": 1,  # SB
+        },
+        "pitching": {
+            "inningsPitched": 3,  # IP
+            "hits": -1,  # H
+            "earnedRuns": -2,  # ER
+            "holds": 2,  # HD
+            "baseOnBalls": -1,  # BB
+            "strikeOuts": 1,  # K
+            "wins": 2,  # W
+            "losses": -2,  # L
+            "saves": 2,  # SV
+        },
+    },
+    "batting": {
+        "hitting": {
+            "runs": 1,
+            "totalBases": 1,
+            "rbi": 1,
+            "baseOnBalls": 1,
+            "strikeOuts": -1,
+            "stolenBases": 1,
+        },
+    },
+    "pitching": {
+        "pitching": {
+            "inningsPitched": 3,
+            "hits": -1,
+            "earnedRuns": -2,
+            "holds": 2,
+            "baseOnBalls": -1,
+            "strikeOuts": 1,
+            "wins": 2,
+            "losses": -2,
+            "saves": 2,
+        },
+    },
+}
+DEFAULT_PROFILE = "default"
+
+
+@dataclass(frozen=True)
+class ScoringProfile:
+    """
+    A compiled scoring profile: one column per (group, stat) category and
+    the matching weight vector.
+    """
+
+    name: str
+    columns: Tuple[Tuple[str, str], ...]
+    weights: np.ndarray
+
+    @classmethod
+    def from_dict(cls, name, rules):
+        """
+        Compile {group: {stat: points}} rules into a profile.
+        Raises ValueError if the rules are malformed.
+        """
+        columns = []
+        weights = []
+        for group, stats in rules.items():
+            if not isinstance(stats, dict):
+                continue
+            for stat, points in stats.items():
+                if isinstance(points, bool) or not isinstance(points, (int, float)):
+                    raise ValueError(f"Scoring weight for {group}.{stat} must be a number.")
+                columns.append((group, stat))
+                weights.append(float(points))
+        if not columns:
+            raise ValueError(f"Scoring profile '{name}' has no categories.")
+        return cls(name, tuple(columns), np.array(weights, dtype=np.float64))
+
+    def column_names(self):
+        """Return the category names as "group.stat" strings."""
+        return [f"{group}.{stat}" for group, stat in self.columns]
+
+    def key(self):
+        """
+        Return a stable identifier for the profile's rules, e.g.
+        "default-1a2b3c4d", so stored scores are never mixed across
+        profiles that share a name but weigh stats differently.
+        """
+        rules = json.dumps([self.columns, self.weights.tolist()])
+        return f"{self.name}-{hashlib.sha1(rules.encode()).hexdigest()[:8]}"
+
+
+@functools.lru_cache(maxsize=None)
+def _preset_profile(name):
+    """Compile a built-in preset once per process."""
+    return ScoringProfile.from_dict(name, SCORING_PRESETS[name])
+
+
+def load_scoring_profile(source=None):
+    """
+    Load a scoring profile from a built-in preset name or a .toml/.json file.
+    Files map stat groups to {stat: points} tables, e.g. [hitting] runs = 1.
+    Returns a ScoringProfile; raises ValueError if it cannot be loaded.
+    """
+    source = source or DEFAULT_PROFILE
+    if source in SCORING_PRESETS:
+        return _preset_profile(source)
+    if not os.path.isfile(source):
+        presets = ", ".join(sorted(SCORING_PRESETS))
+        raise ValueError(
+            f"Unknown scoring profile '{source}' (presets: {presets}, or a .toml/.json file)."
+        )
+    if source.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("TOML scoring profiles need Python 3.11+ or the tomli package.")
+        with open(source, "rb") as f:
+            rules = tomllib.load(f)
+    else:
+        with open(source, encoding="utf-8") as f:
+            try:
+                rules = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid scoring profile {source}: {e}") from e
+    if not isinstance(rules, dict):
+        raise ValueError(f"Invalid scoring profile {source}: expected a table of stat groups.")
+    name = rules.get("name", os.path.splitext(os.path.basename(source))[0])
+    return ScoringProfile.from_dict(name, rules)
+
+
+def stat_matrix(players, profile):
+    """
+    Build an (n_players, n_categories) matrix of stat totals.
+    Each entry of players is a PlayerStats or a {group: [stat dicts]} mapping;
+    every split of a group is added to that group's columns.
+    """
+    group_columns = {}
+    for j, (group, stat) in enumerate(profile.columns):
+        group_columns.setdefault(group, []).append((stat, j))
+    players = list(players)
+    matrix = np.zeros((len(players), len(profile.columns)), dtype=np.float64)
+    for i, player in enumerate(players):
+        for group, columns in group_columns.items():
+            if isinstance(player, dict):
+                splits = player.get(group, [])
+            else:
+                splits = player.stat_dicts(group)
+            for split in splits:
+                for stat, j in columns:
+                    if stat in split:
+                        matrix[i, j] += stat_number(stat, split[stat])
+    return matrix
+
+
+def score_matrix(matrix, profile):
+    """Score every row of a stat matrix with one matrix-vector product."""
+    return matrix @ profile.weights
+
+
+@timed("score")
+def score_players(players, profile=None):
+    """
+    Score many players at once under a profile (default preset if None).
+    Returns a NumPy array of fantasy scores in the order given.
+    """
+    profile = profile or load_scoring_profile()
+    return score_matrix(stat_matrix(players, profile), profile)
+
+
+@timed("score")
+def score_breakdown(players, profile=None):
+    """
+    Score many players and break their scores down by category.
+    Returns (scores, points): the score_players() array and an
+    (n_players, n_categories) array of points per profile column.
+    """
+    profile = profile or load_scoring_profile()
+    matrix = stat_matrix(players, profile)
+    return score_matrix(matrix, profile), matrix * profile.weights
+
+
+def score_trend(season_scores):
+    """
+    Return the least-squares slope of fantasy score per season for a
+    {season: score} mapping (rounded to 0.001), or 0.0 with fewer than
+    two seasons.
+    """
+    if len(season_scores) < 2:
+        return 0.0
+    seasons = np.array([int(season) for season in season_scores], dtype=np.float64)
+    scores = np.array(list(season_scores.values()), dtype=np.float64)
+    return round(float(np.polyfit(seasons, scores, 1)[0]), 3) + 0.0
@@ -0,0 +1,113 @@
+"""Local season-partitioned store of players' season stats, for multi-season scoring."""
+
+import datetime
+import json
+import time
+
+from src.db import DB_PATH, connection, register_schema, transaction
+from src.instrument import timed
+from src.stats import PlayerStats
+from src.transport import ContextThreadPool
+from src.utils import PEOPLE_CHUNK_SIZE, fetch_people, player_stats_params
+
+SEASON_STORE_DB_PATH = DB_PATH
+FIRST_SEASON = 1876
+
+register_schema(
+    """
+    CREATE TABLE IF NOT EXISTS player_season_stats (
+        player_id INTEGER,
+        season TEXT,
+        person TEXT,
+        complete INTEGER,
+        fetched_at REAL,
+        PRIMARY KEY (season, player_id)
+    );
+"""
+)
+
+
+def parse_seasons(text):
+    """
+    Parse a seasons argument: a range ("2015-2025"), a list ("2019,2021")
+    or a mix of both. Returns the seasons as sorted, distinct strings.
+    Raises ValueError on malformed input.
+    """
+    seasons = set()
+    for part in text.split(","):
+        start, _, end = part.strip().partition("-")
+        try:
+            first, last = int(start), int(end or start)
+        except ValueError:
+            message = f"Invalid seasons '{text}': use e.g. 2015-2025 or 2019,2021."
+            raise ValueError(message) from None
+        if not FIRST_SEASON <= first <= last:
+            raise ValueError(f"Invalid season range '{part.strip()}'.")
+        seasons.update(str(season) for season in range(first, last + 1))
+    return sorted(seasons)
+
+
+def season_complete(season):
+    """Return True if a season is over, so its stats can never change."""
+    return int(season) < datetime.date.today().year
+
+
+@timed("db")
+def stored_partitions(player_ids, seasons, db_path=SEASON_STORE_DB_PATH):
+    """
+    Return {(player_id, season): (person dict, complete)} for the requested
+    players and seasons that are already stored.
+    """
+    wanted = {int(pid) for pid in player_ids}
+    stored = {}
+    with connection(db_path) as conn:
+        for season in seasons:
+            for player_id, person, complete in conn.execute(
+                "SELECT player_id, person, complete FROM player_season_stats WHERE season=?",
+                (season,),
+            ):
+                if player_id in wanted:
+                    stored[(player_id, season)] = (json.loads(person), bool(complete))
+    return stored
+
+
+@timed("db")
+def store_partition(season, people, db_path=SEASON_STORE_DB_PATH):
+    """Store fetched /people entries for one season, marking completed seasons immutable."""
+    complete = int(season_complete(season))
+    now = time.time()
+    with transaction(db_path) as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO player_season_stats VALUES (?, ?, ?, ?, ?)",
+            [(person["id"], season, json.dumps(person), complete, now) for person in people],
+        )
+
+
+def load_player_seasons(player_ids, seasons, jobs=1, db_path=SEASON_STORE_DB_PATH):
+    """
+    Return {(player_id, season): PlayerStats} for every requested player
+    and season the API has data for.
+    Completed seasons already in the store are never fetched again; the
+    rest are fetched with batched /people requests, one per season and
+    chunk of players, by up to `jobs` concurrent workers, and stored.
+    """
+    unique_ids = list(dict.fromkeys(int(pid) for pid in player_ids))
+    stored = stored_partitions(unique_ids, seasons, db_path=db_path)
+    requests_to_send = []
+    for season in seasons:
+        missing = [
+            pid for pid in unique_ids if not stored.get((pid, season), (None, False))[1]
+        ]
+        requests_to_send.extend(
+            (season, missing[i : i + PEOPLE_CHUNK_SIZE])
+            for i in range(0, len(missing), PEOPLE_CHUNK_SIZE)
+        )
+    with ContextThreadPool(max_workers=max(1, jobs)) as pool:
+        results = pool.map(
+            lambda request: fetch_people(request[1], player_stats_params(request[0])),
+            requests_to_send,
+        )
+        for (season, _), people in zip(requests_to_send, results):
+            store_partition(season, people, db_path=db_path)
+            stored.update(((person["id"], season), (person, False)) for person in people)
+    return {key: PlayerStats.from_api(person) for key, (person, _) in stored.items()}
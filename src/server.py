@@ -0,0 +1,346 @@
+"""Resident query daemon for the Fantasy Baseball CLI.
+
+`baseball-cli serve` keeps one process running with a warm response cache,
+HTTP connection pool, database connection and name indexes, and runs
+command lines posted to it over a localhost HTTP API:
+
+    POST /run     {"argv": ["--player", "Mike Trout"], "stdin": null}
+                  -> {"status": 0, "stdout": "...", "stderr": "..."}
+    GET  /health  -> {"status": "ok", "requests": 12, "coalesced": 3, "uptime": 81.2}
+
+Identical command lines that arrive while one is running share its result.
+`baseball-cli --server URL ...` (or BASEBALL_CLI_SERVER) runs a command on
+the daemon and prints its output as if it had run locally.
+"""
+
+import argparse
+import contextvars
+import io
+import ipaddress
+import json
+import os
+import sys
+import time
+import urllib.request
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.transport import API_URL_ENV, RECORD_ENV, REPLAY_ENV, InflightCalls
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+CLIENT_TIMEOUT = 600
+
+# Options that configure the whole process. The daemon takes them when it
+# starts (or not at all, for per-run reports), never per request.
+SERVER_OPTIONS = {
+    "no_cache": "--no-cache",
+    "refresh": "--refresh",
+    "record": "--record",
+    "replay": "--replay",
+    "api_url": "--api-url",
+    "rate_limit": "--rate-limit",
+    "timeout": "--timeout",
+    "retries": "--retries",
+    "profile": "--profile",
+    "trace_out": "--trace-out",
+}
+
+# Flags whose value is a file path, made absolute before a command is sent.
+PATH_FLAGS = ("--fantasy-import", "--scoring")
+
+STARTED = time.time()
+
+# Command lines currently running; identical ones arriving meanwhile share the result.
+_commands = InflightCalls()
+
+
+class ThreadStream(io.TextIOBase):
+    """
+    A stand-in for sys.stdin, sys.stdout or sys.stderr that reads and
+    writes a per-request stream while one is set (see capture()) and the
+    original stream otherwise, so concurrent requests keep their output
+    apart. The stream is a context variable, so worker threads started
+    through src.transport.ContextThreadPool write to their request's stream.
+    """
+
+    def __init__(self, default):
+        super().__init__()
+        self._default = default
+        self._stream = contextvars.ContextVar(f"stream_{id(self)}", default=None)
+
+    def target(self):
+        """Return the stream the calling context currently uses."""
+        return self._stream.get() or self._default
+
+    def write(self, text):
+        return self.target().write(text)
+
+    def flush(self):
+        self.target().flush()
+
+    def read(self, size=-1):
+        return self.target().read(size)
+
+    def readline(self, size=-1):
+        return self.target().readline(size)
+
+    @contextmanager
+    def redirect_to(self, stream):
+        """Send the calling context's output to another stream for the block."""
+        token = self._stream.set(stream.target() if isinstance(stream, ThreadStream) else stream)
+        try:
+            yield
+        finally:
+            self._stream.reset(token)
+
+
+def install_thread_streams():
+    """Replace sys.stdin, sys.stdout and sys.stderr with ThreadStreams (once)."""
+    for name in ("stdin", "stdout", "stderr"):
+        stream = getattr(sys, name)
+        if not isinstance(stream, ThreadStream):
+            setattr(sys, name, ThreadStream(stream))
+
+
+@contextmanager
+def capture(stdin_text=None):
+    """
+    Give the calling thread its own stdin (stdin_text, or empty) and
+    stdout/stderr buffers for the block. Yields the (stdout, stderr) buffers.
+    """
+    # The sys streams are ThreadStreams once install_thread_streams() has run.
+    # pylint: disable=no-member
+    out, err = io.StringIO(), io.StringIO()
+    with sys.stdin.redirect_to(io.StringIO(stdin_text or "")):
+        with sys.stdout.redirect_to(out), sys.stderr.redirect_to(err):
+            yield out, err
+
+
+def run_request(parser, execute, argv, stdin_text=None):
+    """
+    Run one command line inside the daemon with its output captured.
+    Returns {"status", "stdout", "stderr"} as sent to the client.
+    """
+    status = 0
+    with capture(stdin_text) as (out, err):
+        try:
+            args = parser.parse_args(argv)
+            rejected = [
+                flag
+                for dest, flag in SERVER_OPTIONS.items()
+                if getattr(args, dest) != parser.get_default(dest)
+            ]
+            if args.watch:
+                print("--watch runs until interrupted; run it locally.", file=sys.stderr)
+                status = 2
+            elif rejected:
+                print(
+                    f"{', '.join(rejected)} cannot be set per request; "
+                    "pass them to `baseball-cli serve` instead.",
+                    file=sys.stderr,
+                )
+                status = 2
+            else:
+                execute(parser, args)
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(f"Server error: {e}", file=sys.stderr)
+            status = 1
+    return {"status": status, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+def is_loopback(host):
+    """Return True if host names or is a loopback address."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler for the /run and /health endpoints.
+    Requests from web pages are refused: any request with an Origin header,
+    and POSTs that are not application/json (which browsers cannot send
+    cross-origin without a preflight this server never answers).
+    """
+
+    server_version = "baseball-cli"
+
+    def _refuse_browsers(self, check_type=False):
+        """Reply 403/415 and return True if the request may come from a web page."""
+        if self.headers.get("Origin") is not None:
+            self._reply(403, {"error": "Cross-origin requests are not accepted."})
+            return True
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if check_type and content_type != "application/json":
+            self._reply(415, {"error": "Requests must be sent as application/json."})
+            return True
+        return False
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Report the daemon's status."""
+        if self._refuse_browsers():
+            return
+        if self.path != "/health":
+            self._reply(404, {"error": f"Unknown path {self.path}."})
+            return
+        self._reply(
+            200,
+            {
+                "status": "ok",
+                "requests": _commands.calls,
+                "coalesced": _commands.coalesced,
+                "uptime": round(time.time() - STARTED, 1),
+            },
+        )
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Run a posted command line and return its status and output."""
+        if self._refuse_browsers(check_type=True):
+            return
+        if self.path != "/run":
+            self._reply(404, {"error": f"Unknown path {self.path}."})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            argv = body["argv"]
+            stdin_text = body.get("stdin")
+            if not all(isinstance(arg, str) for arg in argv):
+                raise ValueError("argv must be a list of strings")
+        except (ValueError, KeyError, TypeError) as e:
+            self._reply(400, {"error": f"Invalid request: {e}"})
+            return
+        result = _commands.run(
+            json.dumps([argv, stdin_text]),
+            lambda: run_request(self.server.parser, self.server.execute, argv, stdin_text),
+        )
+        self._reply(200, result)
+
+    def _reply(self, code, payload):
+        """Send a JSON response."""
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_serve_parser():
+    """Create the argument parser for `baseball-cli serve`."""
+    parser = argparse.ArgumentParser(
+        prog="baseball-cli serve",
+        description="Run commands for local clients from one warm process.",
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Loopback address to listen on (default: {DEFAULT_HOST}).",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on, 0 for any free port (default: {DEFAULT_PORT}).",
+    )
+    parser.add_argument(
+        "--api-url",
+        default=os.environ.get(API_URL_ENV),
+        metavar="URL",
+        help="Send StatsAPI requests to another server.",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the on-disk StatsAPI response cache."
+    )
+    parser.add_argument(
+        "--rate-limit", type=float, metavar="RPS", help="Maximum StatsAPI requests per second."
+    )
+    parser.add_argument(
+        "--timeout", type=float, metavar="SECONDS", help="Read timeout for each StatsAPI request."
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        metavar="N",
+        help="Retries for 429/5xx responses and connection errors.",
+    )
+    parser.set_defaults(
+        refresh=False, record=os.environ.get(RECORD_ENV), replay=os.environ.get(REPLAY_ENV)
+    )
+    return parser
+
+
+def serve_main(argv, create_cli_parser, configure_run, execute):
+    """
+    Parse `baseball-cli serve` arguments, configure the process once and
+    serve requests until interrupted. Commands are parsed with the CLI's
+    parser and run with execute(parser, args).
+    """
+    parser = create_serve_parser()
+    args = parser.parse_args(argv)
+    if not is_loopback(args.host):
+        # Requests are not authenticated, so only local clients may connect.
+        parser.error(f"--host must be a loopback address, not {args.host}.")
+    configure_run(args)
+    install_thread_streams()
+    httpd = ThreadingHTTPServer((args.host, args.port), RequestHandler)
+    httpd.daemon_threads = True
+    httpd.parser = create_cli_parser()
+    httpd.execute = execute
+    print(f"Serving baseball-cli on http://{args.host}:{httpd.server_port} (Ctrl+C to stop).")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        httpd.server_close()
+
+
+def portable_argv(argv):
+    """
+    Rewrite a command line to run in the daemon's working directory:
+    @FILE name lists and file-path flags are made absolute.
+    """
+    portable = []
+    for i, arg in enumerate(argv):
+        flag, equals, value = arg.partition("=")
+        if arg.startswith("@"):
+            arg = "@" + os.path.abspath(arg[1:])
+        elif equals and flag in PATH_FLAGS and os.path.isfile(value):
+            arg = f"{flag}={os.path.abspath(value)}"
+        elif i and argv[i - 1] in PATH_FLAGS and os.path.isfile(arg):
+            arg = os.path.abspath(arg)
+        portable.append(arg)
+    return portable
+
+
+def run_remote(url, argv):
+    """
+    Run a command line on a `baseball-cli serve` daemon and print its output.
+    Returns the command's exit status, or None (after a warning) if the
+    daemon could not be reached, so the caller can run the command locally.
+    """
+    stdin_text = sys.stdin.read() if "-" in argv else None
+    payload = json.dumps({"argv": portable_argv(argv), "stdin": stdin_text}).encode()
+    request = urllib.request.Request(
+        url.rstrip("/") + "/run", data=payload, headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=CLIENT_TIMEOUT) as response:
+            result = json.load(response)
+    except (OSError, ValueError) as e:
+        print(
+            f"Could not reach baseball-cli server at {url} ({e}); running locally.",
+            file=sys.stderr,
+        )
+        if stdin_text is not None:
+            sys.stdin = io.StringIO(stdin_text)
+        return None
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return result["status"]
@@ -0,0 +1,107 @@
+"""Interactive shell for the Fantasy Baseball CLI.
+
+Each line takes the same flags as baseball-cli. The HTTP session, response
+cache, database connection and name indexes stay warm between commands.
+"""
+
+import shlex
+
+from src.player_index import search_players
+from src.team_index import search_teams
+
+try:
+    import readline
+except ImportError:  # e.g. Windows without pyreadline
+    readline = None
+
+PROMPT = "baseball> "
+EXIT_COMMANDS = {"exit", "quit"}
+PLAYER_FLAGS = {"--player", "--compare", "--fantasy-score", "--fantasy-add", "--fantasy-remove"}
+TEAM_FLAGS = {"--team", "--roster", "--team-filter"}
+
+
+def _flag_options(parser):
+    """Return every long option string the parser accepts."""
+    return sorted(
+        option
+        for action in parser._actions  # pylint: disable=protected-access
+        for option in action.option_strings
+        if option.startswith("--")
+    )
+
+
+def complete_line(line, text, flags):
+    """
+    Return completion candidates for `text`, the part of `line` after the
+    last quote. Inside a quoted name, player or team names are completed
+    depending on the flag before it; otherwise flags are completed.
+    """
+    if line.count('"') % 2 == 1:
+        words = line[: len(line) - len(text)].rstrip('" ').split()
+        flag = next((w for w in reversed(words) if w.startswith("--")), "")
+        if flag in TEAM_FLAGS:
+            names = search_teams(text)
+        elif flag in PLAYER_FLAGS:
+            names = search_players(text)
+        else:
+            names = []
+        return [f'{name}"' for name in names]
+    head, _, word = text.rpartition(" ")
+    prefix = f"{head} " if head else ""
+    return [prefix + flag for flag in flags if flag.startswith(word)]
+
+
+def _install_completer(flags):
+    """Register tab completion with readline, if it is available."""
+    if readline is None:
+        return
+    matches = []
+
+    def completer(text, state):
+        if state == 0:
+            matches[:] = complete_line(readline.get_line_buffer(), text, flags)
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer_delims('"')
+    readline.set_completer(completer)
+    readline.parse_and_bind("tab: complete")
+
+
+def run_shell(parser, run_command):
+    """
+    Read commands until exit/quit or end of input, parsing each line with
+    the CLI's parser and running it with run_command(parser, args).
+    Parse errors and errors raised by a command are reported without
+    leaving the shell.
+    """
+    _install_completer(_flag_options(parser))
+    print('Fantasy Baseball shell. Type flags as on the command line, "help" or "exit".')
+    while True:
+        try:
+            line = input(PROMPT).strip()
+        except EOFError:
+            print()
+            break
+        except KeyboardInterrupt:
+            print()
+            continue
+        if not line:
+            continue
+        if line in EXIT_COMMANDS:
+            break
+        if line == "help":
+            parser.print_help()
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"Could not parse line: {e}")
+            continue
+        try:
+            run_command(parser, parser.parse_args(argv))
+        except SystemExit:
+            continue
+        except KeyboardInterrupt:
+            print()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            print(f"Error: {e}")
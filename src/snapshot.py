@@ -0,0 +1,380 @@
+"""Portable snapshots of the local player, team and stat data.
+
+`baseball-cli snapshot export FILE` packs the player and team directories,
+fantasy and MLB roster memberships, per-season stat rows, stored fantasy
+scores, synced game logs and the league stat store into one file; `snapshot import FILE` loads it
+into a fresh machine's local database so it starts warm.
+
+File layout (little-endian):
+
+    MAGIC (8 bytes) | version (uint32) | header length (uint32) | JSON header
+    | padding | arrays, each starting on a 64-byte boundary
+
+The header lists every array's dtype, shape, codec and offset from the
+start of the array data, so a reader can memory-map the file and read any
+array without loading the rest. Table columns are stored one array each:
+integers as int64 and reals as float64 (with a null mask when needed),
+and text as one UTF-8 byte array plus int64 row offsets. Large JSON
+columns are zlib-compressed row by row, which keeps single rows readable
+without decompressing the whole column. Other large arrays that compress
+well are stored zlib-compressed as a whole; the rest (and everything in a
+--raw export) are stored as-is and read as zero-copy views of the map.
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+# The tables' schemas are registered when their modules are imported.
+# pylint: disable=unused-import
+import src.fantasy_db
+import src.game_log
+import src.player_index
+import src.season_store
+import src.team_index
+from src.db import DB_PATH, connection, transaction
+from src.stat_store import STAT_STORE_PATH, load_stat_store, save_stat_store
+
+MAGIC = b"BBCLISNP"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Arrays of at least this many bytes are compressed if that saves at least half.
+COMPRESS_MIN_BYTES = 4096
+
+# Tables copied into a snapshot; import upserts their rows by primary key.
+SNAPSHOT_TABLES = (
+    "player_index",
+    "team_directory",
+    "team_alias",
+    "fantasy_team",
+    "player_scores",
+    "player_season_stats",
+    "game_log_checkpoint",
+    "player_season_totals",
+    "player_game_log",
+)
+
+# Text columns compressed row by row (full /people responses, several KB each).
+COMPRESSED_COLUMNS = {("player_season_stats", "person")}
+
+STAT_STORE_PREFIX = "stat_store."
+
+
+def _aligned(offset):
+    """Round an offset up to the next ALIGNMENT boundary."""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _column_kind(sql_type):
+    """Map a SQLite column type to a snapshot column kind."""
+    sql_type = sql_type.upper()
+    if "INT" in sql_type:
+        return "int"
+    if "REAL" in sql_type:
+        return "float"
+    return "text"
+
+
+def encode_column(name, values, kind):
+    """
+    Encode a column's values as named arrays: {name: values} for int and
+    float columns, {name.data, name.offsets} for text and zlib columns,
+    plus {name.null} if any value is NULL.
+    """
+    arrays = {}
+    nulls = np.array([value is None for value in values], dtype=bool)
+    if nulls.any():
+        arrays[f"{name}.null"] = nulls
+    if kind in ("int", "float"):
+        dtype = np.int64 if kind == "int" else np.float64
+        arrays[name] = np.array([0 if v is None else v for v in values], dtype=dtype)
+        return arrays
+    encoded = [b"" if value is None else str(value).encode("utf-8") for value in values]
+    if kind == "zlib":
+        encoded = [zlib.compress(raw) for raw in encoded]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(raw) for raw in encoded], out=offsets[1:])
+    arrays[f"{name}.data"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    arrays[f"{name}.offsets"] = offsets
+    return arrays
+
+
+def _array_payload(array, compress):
+    """Return (bytes to store, header entry without offset) for one array."""
+    fortran = bool(array.ndim > 1 and array.flags.f_contiguous)
+    payload = array.tobytes(order="F" if fortran else "C")
+    codec = "raw"
+    if compress and len(payload) >= COMPRESS_MIN_BYTES:
+        packed = zlib.compress(payload)
+        if len(packed) * 2 <= len(payload):
+            payload, codec = packed, "zlib"
+    spec = {
+        "dtype": array.dtype.str,
+        "shape": list(array.shape),
+        "fortran": fortran,
+        "codec": codec,
+        "nbytes": len(payload),
+    }
+    return payload, spec
+
+
+# pylint: disable=too-many-locals
+def write_snapshot(path, arrays, meta, compress=True):
+    """
+    Write named arrays and a metadata dict to a snapshot file (atomically).
+    compress=False stores every array uncompressed.
+    """
+    layout = {}
+    payloads = []
+    offset = 0
+    for name, array in arrays.items():
+        payload, spec = _array_payload(array, compress)
+        offset = _aligned(offset)
+        layout[name] = {**spec, "offset": offset}
+        payloads.append(payload)
+        offset += len(payload)
+    header = json.dumps(
+        {"version": FORMAT_VERSION, **meta, "data_bytes": offset, "arrays": layout}
+    ).encode("utf-8")
+    prefix = MAGIC + struct.pack("<II", FORMAT_VERSION, len(header)) + header
+    data_start = _aligned(len(prefix))
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(prefix.ljust(data_start, b"\0"))
+        for spec, payload in zip(layout.values(), payloads):
+            f.write(b"\0" * (data_start + spec["offset"] - f.tell()))
+            f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """
+    A snapshot file opened through a read-only memory map. Uncompressed
+    arrays are views into the map, so only the parts that are read are
+    paged in; compressed arrays are decompressed once, when first read.
+    Raises ValueError if the file is not a snapshot this version can read.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            prefix = f.read(len(MAGIC) + 8)
+            if len(prefix) < len(MAGIC) + 8 or prefix[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a baseball-cli snapshot")
+            version, header_length = struct.unpack("<II", prefix[len(MAGIC) :])
+            if version > FORMAT_VERSION:
+                raise ValueError(
+                    f"{path} is snapshot version {version}; this version reads up to "
+                    f"{FORMAT_VERSION}"
+                )
+            self.header = json.loads(f.read(header_length))
+        self.path = path
+        self._data_start = _aligned(len(prefix) + header_length)
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        self._decompressed = {}
+        if self._map.size < self._data_start + self.header["data_bytes"]:
+            raise ValueError(f"{path} is truncated")
+
+    @property
+    def tables(self):
+        """{table: {"rows": n, "columns": [[name, kind], ...]}} for the stored tables."""
+        return self.header["tables"]
+
+    def array(self, name):
+        """Return a stored array (read-only)."""
+        spec = self.header["arrays"][name]
+        start = self._data_start + spec["offset"]
+        buffer, offset = self._map, start
+        if spec["codec"] == "zlib":
+            if name not in self._decompressed:
+                packed = self._map[start : start + spec["nbytes"]].tobytes()
+                self._decompressed[name] = zlib.decompress(packed)
+            buffer, offset = self._decompressed[name], 0
+        return np.ndarray(
+            tuple(spec["shape"]),
+            dtype=np.dtype(spec["dtype"]),
+            buffer=buffer,
+            offset=offset,
+            order="F" if spec["fortran"] else "C",
+        )
+
+    def _kind(self, table, column):
+        """Return a stored column's kind."""
+        return dict(self.tables[table]["columns"])[column]
+
+    def value(self, table, column, index):
+        """Decode one row's value of a column, reading only that row."""
+        name = f"{table}.{column}"
+        if f"{name}.null" in self.header["arrays"] and self.array(f"{name}.null")[index]:
+            return None
+        kind = self._kind(table, column)
+        if kind in ("int", "float"):
+            return self.array(name)[index].item()
+        start, end = self.array(f"{name}.offsets")[index : index + 2]
+        raw = self.array(f"{name}.data")[start:end].tobytes()
+        return (zlib.decompress(raw) if kind == "zlib" else raw).decode("utf-8")
+
+    def column(self, table, column):
+        """Decode every value of a column as a list (None for NULL)."""
+        name = f"{table}.{column}"
+        kind = self._kind(table, column)
+        if kind in ("int", "float"):
+            values = self.array(name).tolist()
+        else:
+            data = self.array(f"{name}.data").tobytes()
+            offsets = self.array(f"{name}.offsets").tolist()
+            chunks = (data[start:end] for start, end in zip(offsets, offsets[1:]))
+            if kind == "zlib":
+                chunks = (zlib.decompress(chunk) for chunk in chunks)
+            values = [chunk.decode("utf-8") for chunk in chunks]
+        if f"{name}.null" in self.header["arrays"]:
+            nulls = self.array(f"{name}.null")
+            values = [None if null else value for value, null in zip(values, nulls)]
+        return values
+
+    def rows(self, table, columns):
+        """Return a table's rows as tuples of the given columns."""
+        return list(zip(*(self.column(table, column) for column in columns)))
+
+    def stat_store(self):
+        """Return the league stat store's arrays (views of the file), or None if not included."""
+        arrays = {
+            name[len(STAT_STORE_PREFIX) :]: self.array(name)
+            for name in self.header["arrays"]
+            if name.startswith(STAT_STORE_PREFIX)
+        }
+        return arrays or None
+
+
+def export_snapshot(path, compress=True, db_path=DB_PATH, stat_store_path=STAT_STORE_PATH):
+    """
+    Write the local tables and stat store to a snapshot file
+    (see write_snapshot for compress).
+    Returns ({table: rows}, players in the stat store or None).
+    """
+    arrays = {}
+    tables = {}
+    with connection(db_path) as conn:
+        for table in SNAPSHOT_TABLES:
+            columns = [
+                (name, "zlib" if (table, name) in COMPRESSED_COLUMNS else _column_kind(sql_type))
+                for _, name, sql_type, *_ in conn.execute(f"PRAGMA table_info({table})")
+            ]
+            rows = conn.execute(
+                f"SELECT {', '.join(name for name, _ in columns)} FROM {table}"
+            ).fetchall()
+            tables[table] = {"rows": len(rows), "columns": [list(c) for c in columns]}
+            for j, (name, kind) in enumerate(columns):
+                arrays.update(encode_column(f"{table}.{name}", [row[j] for row in rows], kind))
+    store = load_stat_store(stat_store_path)
+    for key, array in (store or {}).items():
+        arrays[STAT_STORE_PREFIX + key] = array
+    write_snapshot(path, arrays, {"created_at": time.time(), "tables": tables}, compress)
+    return (
+        {table: spec["rows"] for table, spec in tables.items()},
+        len(store["player_id"]) if store else None,
+    )
+
+
+def import_snapshot(path, db_path=DB_PATH, stat_store_path=STAT_STORE_PATH):
+    """
+    Load a snapshot into the local database (upserting rows by primary key)
+    and replace the stat store if the snapshot has one. Tables or columns
+    this version does not know are skipped.
+    Returns ({table: rows}, players in the stat store or None).
+    Raises ValueError if the file is not a readable snapshot.
+    """
+    snapshot = Snapshot(path)
+    counts = {}
+    with transaction(db_path) as conn:
+        # Only known tables and columns are used, so nothing from the file reaches SQL.
+        for table in SNAPSHOT_TABLES:
+            if table not in snapshot.tables:
+                continue
+            stored = {name for name, _ in snapshot.tables[table]["columns"]}
+            columns = [
+                row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[1] in stored
+            ]
+            if not columns:
+                continue
+            rows = snapshot.rows(table, columns)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                rows,
+            )
+            counts[table] = len(rows)
+    store = snapshot.stat_store()
+    if store:
+        save_stat_store(store, stat_store_path)
+    return counts, len(store["player_id"]) if store else None
+
+
+def print_snapshot_info(path):
+    """Print a snapshot's version, age and contents, reading only its header."""
+    snapshot = Snapshot(path)
+    created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(snapshot.header["created_at"]))
+    size = os.path.getsize(path)
+    print(f"{path}: snapshot version {snapshot.header['version']}, created {created}, {size} bytes")
+    for table, spec in snapshot.tables.items():
+        print(f"  {table:<22} {spec['rows']:>9} rows")
+    store = snapshot.stat_store()
+    if store:
+        print(
+            f"  {'stat store':<22} {len(store['player_id']):>9} players, "
+            f"{len(store['columns'])} stats, season {store['season']}"
+        )
+
+
+def _print_counts(verb, path, counts, store_players):
+    """Print how many rows of each table a snapshot export or import covered."""
+    print(f"{verb} {sum(counts.values())} rows ({path}):")
+    for table, rows in counts.items():
+        print(f"  {table:<22} {rows:>9}")
+    if store_players is not None:
+        print(f"  {'stat store':<22} {store_players:>9} players")
+
+
+def create_snapshot_parser():
+    """Create the argument parser for `baseball-cli snapshot`."""
+    parser = argparse.ArgumentParser(
+        prog="baseball-cli snapshot",
+        description="Export or import the local player, team and stat data as one file.",
+    )
+    actions = parser.add_subparsers(dest="action", required=True)
+    export = actions.add_parser("export", help="Write the local data to a snapshot file.")
+    export.add_argument("file", help="Snapshot file to write.")
+    export.add_argument(
+        "--raw",
+        action="store_true",
+        help="Store every array uncompressed, so readers can map all of it without decompressing.",
+    )
+    load = actions.add_parser("import", help="Load a snapshot file into the local data.")
+    load.add_argument("file", help="Snapshot file to read.")
+    info = actions.add_parser("info", help="Show a snapshot file's version and contents.")
+    info.add_argument("file", help="Snapshot file to read.")
+    return parser
+
+
+def snapshot_main(argv):
+    """Run `baseball-cli snapshot export|import|info FILE`."""
+    args = create_snapshot_parser().parse_args(argv)
+    start = time.perf_counter()
+    try:
+        if args.action == "export":
+            _print_counts("Exported", args.file, *export_snapshot(args.file, not args.raw))
+        elif args.action == "import":
+            _print_counts("Imported", args.file, *import_snapshot(args.file))
+        else:
+            print_snapshot_info(args.file)
+            return
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Snapshot {args.action} failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Done in {time.perf_counter() - start:.2f}s.")
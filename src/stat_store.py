@@ -0,0 +1,118 @@
+"""Local columnar store of league-wide season stats, used for leaderboards."""
+
+import os
+
+import numpy as np
+
+from src.stats import stat_number
+
+STAT_STORE_PATH = "stat_store.npz"
+
+# Stat groups ingested into the store; fielding lines are not scored.
+STORE_GROUPS = ("hitting", "pitching")
+
+# Position filters that cover several roster positions.
+POSITION_GROUPS = {
+    "OF": {"LF", "CF", "RF", "OF"},
+    "P": {"P", "SP", "RP", "TWP"},
+    "IF": {"1B", "2B", "3B", "SS"},
+}
+
+
+# pylint: disable=too-many-locals
+def build_stat_store(roster_entries, players, season):
+    """
+    Build columnar arrays from roster entries and fetched PlayerStats.
+    roster_entries is a list of dicts with player_id, full_name, team_id,
+    team (abbreviation) and position; players maps player ID to PlayerStats.
+    Every numeric hitting and pitching stat becomes a float64 column of
+    the "stats" matrix, named in "columns" as "group.stat".
+    """
+    column_index = {}
+    rows = []
+    for entry in roster_entries:
+        values = {}
+        player = players.get(entry["player_id"])
+        for group in STORE_GROUPS:
+            for split in player.stat_dicts(group) if player else []:
+                for stat, value in split.items():
+                    try:
+                        number = stat_number(stat, value)
+                    except (TypeError, ValueError):
+                        continue
+                    j = column_index.setdefault(f"{group}.{stat}", len(column_index))
+                    values[j] = values.get(j, 0.0) + number
+        rows.append(values)
+    stats = np.zeros((len(rows), len(column_index)), dtype=np.float64, order="F")
+    for i, values in enumerate(rows):
+        for j, number in values.items():
+            stats[i, j] = number
+    return {
+        "season": np.array(str(season)),
+        "player_id": np.array([e["player_id"] for e in roster_entries], dtype=np.int64),
+        "team_id": np.array([e["team_id"] for e in roster_entries], dtype=np.int64),
+        "name": np.array([e["full_name"] for e in roster_entries], dtype=str),
+        "team": np.array([e.get("team") or "" for e in roster_entries], dtype=str),
+        "position": np.array([e.get("position") or "" for e in roster_entries], dtype=str),
+        "columns": np.array(list(column_index), dtype=str),
+        "stats": stats,
+    }
+
+
+def save_stat_store(store, path=STAT_STORE_PATH):
+    """Write the store's arrays to a compressed .npz file."""
+    tmp_path = f"{path}.tmp.npz"
+    np.savez_compressed(tmp_path, **store)
+    os.replace(tmp_path, path)
+
+
+def load_stat_store(path=STAT_STORE_PATH):
+    """Load the store's arrays, or return None if the store does not exist."""
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+
+def profile_matrix(store, profile):
+    """
+    Select the store columns used by a scoring profile, in profile order.
+    Categories the store has no column for are zero.
+    """
+    positions = {name: j for j, name in enumerate(store["columns"].tolist())}
+    matrix = np.zeros((len(store["player_id"]), len(profile.columns)), dtype=np.float64)
+    for k, name in enumerate(profile.column_names()):
+        if name in positions:
+            matrix[:, k] = store["stats"][:, positions[name]]
+    return matrix
+
+
+def leaderboard(store, profile, top_n=25, position=None, team_id=None):
+    """
+    Rank stored players by fantasy score under a profile.
+    Optionally filter by position (e.g. SS, OF, P) and team ID.
+    Returns up to top_n (player_id, name, team, position, score) tuples,
+    highest score first.
+    """
+    scores = profile_matrix(store, profile) @ profile.weights
+    mask = np.ones(len(scores), dtype=bool)
+    if position:
+        wanted = POSITION_GROUPS.get(position.upper(), {position.upper()})
+        mask &= np.isin(store["position"], list(wanted))
+    if team_id is not None:
+        mask &= store["team_id"] == team_id
+    candidates = np.flatnonzero(mask)
+    if top_n < len(candidates):
+        top = np.argpartition(-scores[candidates], top_n - 1)[:top_n]
+        candidates = candidates[top]
+    candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return [
+        (
+            int(store["player_id"][i]),
+            str(store["name"][i]),
+            str(store["team"][i]),
+            str(store["position"][i]),
+            float(scores[i]),
+        )
+        for i in candidates
+    ]
@@ -0,0 +1,123 @@
+"""Structured player and team statistics parsed from MLB StatsAPI responses."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Display order of stat groups.
+GROUP_ORDER = ("hitting", "pitching", "fielding")
+
+# Stats reported in baseball innings notation, where ".1" and ".2" mean thirds.
+INNINGS_STATS = {"inningsPitched", "innings"}
+
+
+@dataclass
+class StatSplit:
+    """One split of a stat group, e.g. one team's season line for a player."""
+
+    stat: Dict[str, Any]
+    season: Optional[str] = None
+    team: Optional[str] = None
+
+
+@dataclass
+class StatGroup:
+    """All splits for one stat group (hitting, pitching, fielding) and type (season, career)."""
+
+    group: str
+    stat_type: str
+    splits: List[StatSplit] = field(default_factory=list)
+
+
+@dataclass
+class PlayerStats:
+    """
+    A player's identity and stats keyed by (group, type).
+    Split stat dicts are the decoded API dicts themselves, not copies.
+    """
+
+    player_id: int
+    full_name: str
+    position: str
+    groups: Dict[Tuple[str, str], StatGroup] = field(default_factory=dict)
+
+    @classmethod
+    def from_api(cls, person):
+        """Build a PlayerStats from a /people entry hydrated with stats."""
+        return cls(
+            player_id=person["id"],
+            full_name=person.get("fullName", ""),
+            position=person.get("primaryPosition", {}).get("name", ""),
+            groups=stat_groups_from_api(person.get("stats", [])),
+        )
+
+    def get(self, group, stat, stat_type=None, default=None):
+        """
+        Return the value of one stat from the first split of a group.
+        If stat_type is None the first matching type is used.
+        """
+        for (group_name, type_name), stat_group in self.groups.items():
+            if group_name != group or (stat_type and type_name != stat_type):
+                continue
+            for split in stat_group.splits:
+                if stat in split.stat:
+                    return split.stat[stat]
+        return default
+
+    def stat_dicts(self, group=None):
+        """Return every split's stat dict, optionally restricted to one group."""
+        return [
+            split.stat
+            for (group_name, _), stat_group in self.groups.items()
+            if group is None or group_name == group
+            for split in stat_group.splits
+        ]
+
+    def items(self) -> Iterator[Tuple[str, str, str, Any]]:
+        """
+        Yield (group, type, stat, value) for every scalar stat of the first
+        split in each group; nested values such as positions are skipped.
+        """
+        for (group_name, type_name), stat_group in self.groups.items():
+            if not stat_group.splits:
+                continue
+            for stat, value in stat_group.splits[0].stat.items():
+                if not isinstance(value, dict):
+                    yield group_name, type_name, stat, value
+
+
+def group_sort_key(key):
+    """Sort key placing (group, ...) tuples in GROUP_ORDER, unknown groups last."""
+    group_name = key[0]
+    return (GROUP_ORDER.index(group_name) if group_name in GROUP_ORDER else len(GROUP_ORDER), key)
+
+
+def stat_groups_from_api(stats):
+    """
+    Convert the "stats" list of a StatsAPI response into StatGroups keyed
+    by (group, type), e.g. ("hitting", "season").
+    """
+    groups = {}
+    for stat_group in stats:
+        group_name = stat_group.get("group", {}).get("displayName", "")
+        type_name = stat_group.get("type", {}).get("displayName", "")
+        key = (group_name, type_name)
+        target = groups.setdefault(key, StatGroup(group_name, type_name))
+        for split in stat_group.get("splits", []):
+            target.splits.append(
+                StatSplit(
+                    stat=split.get("stat", {}),
+                    season=split.get("season"),
+                    team=split.get("team", {}).get("name"),
+                )
+            )
+    return {key: groups[key] for key in sorted(groups, key=group_sort_key)}
+
+
+def stat_number(stat, value):
+    """Convert a StatsAPI stat value to a float, reading innings as thirds."""
+    if value in (None, "", "-", "-.--"):
+        return 0.0
+    if stat in INNINGS_STATS:
+        whole, _, outs = str(value).partition(".")
+        return float(whole or 0) + int(outs or 0) / 3
+    return float(value)
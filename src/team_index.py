@@ -0,0 +1,173 @@
+"""Local MLB team directory with an alias map for constant-time team name resolution."""
+
+import datetime
+import time
+
+from src.db import DB_PATH, connection, register_schema, transaction
+from src.instrument import timed
+from src.player_index import normalize_name
+
+TEAM_INDEX_DB_PATH = DB_PATH
+TEAM_DIRECTORY_MAX_AGE = 30 * 24 * 3600
+
+# Common nicknames keyed by team abbreviation (old and new abbreviations both listed).
+TEAM_NICKNAMES = {
+    "NYY": ["yanks", "bronx bombers"],
+    "CWS": ["chisox", "south siders"],
+    "CHC": ["cubbies", "north siders"],
+    "STL": ["cards", "redbirds"],
+    "TOR": ["jays"],
+    "AZ": ["dbacks", "d-backs", "snakes"],
+    "ARI": ["dbacks", "d-backs", "snakes"],
+    "BAL": ["os", "orioles"],
+    "BOS": ["bosox", "red sox"],
+    "OAK": ["as", "athletics"],
+    "ATH": ["as", "athletics"],
+    "SD": ["friars"],
+    "PHI": ["phils"],
+    "LAD": ["blue crew"],
+    "TB": ["rays"],
+}
+
+# "directory" caches the directory's season and fetched_at once read, so
+# staleness checks after the first are answered from memory.
+_state = {"aliases_loaded": False, "directory": {}}
+_aliases = {}
+_settings = {"db_path": TEAM_INDEX_DB_PATH}
+
+register_schema(
+    """
+CREATE TABLE IF NOT EXISTS team_directory (
+    team_id INTEGER PRIMARY KEY,
+    name TEXT,
+    team_name TEXT,
+    location_name TEXT,
+    abbreviation TEXT,
+    season TEXT,
+    fetched_at REAL
+);
+CREATE TABLE IF NOT EXISTS team_alias (
+    alias TEXT PRIMARY KEY,
+    team_id INTEGER
+);
+"""
+)
+
+
+def configure_team_index(db_path):
+    """Point the team directory at a different SQLite database file."""
+    _settings["db_path"] = db_path
+    _state["aliases_loaded"] = False
+    _state["directory"] = {}
+
+
+def team_aliases(team):
+    """Return the normalized aliases for a team dict from /api/v1/teams."""
+    names = [
+        team.get("name", ""),
+        team.get("teamName", ""),
+        team.get("locationName", ""),
+        team.get("abbreviation", ""),
+        team.get("shortName", ""),
+        team.get("clubName", ""),
+        team.get("franchiseName", ""),
+    ]
+    names.extend(TEAM_NICKNAMES.get(team.get("abbreviation", ""), []))
+    return [alias for alias in dict.fromkeys(normalize_name(n) for n in names) if alias]
+
+
+@timed("db")
+def store_teams(teams, season=None):
+    """
+    Replace the team directory and its alias map with a /api/v1/teams team list.
+    When two teams share an alias (e.g. a city), the first team listed keeps it.
+    """
+    now = time.time()
+    season = str(season or datetime.date.today().year)
+    directory_rows = []
+    alias_rows = []
+    for team in teams:
+        directory_rows.append(
+            (
+                team["id"],
+                team.get("name"),
+                team.get("teamName"),
+                team.get("locationName"),
+                team.get("abbreviation"),
+                season,
+                now,
+            )
+        )
+        alias_rows.extend((alias, team["id"]) for alias in team_aliases(team))
+    with transaction(_settings["db_path"]) as conn:
+        conn.execute("DELETE FROM team_directory")
+        conn.execute("DELETE FROM team_alias")
+        conn.executemany(
+            "INSERT INTO team_directory VALUES (?, ?, ?, ?, ?, ?, ?)", directory_rows
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO team_alias (alias, team_id) VALUES (?, ?)", alias_rows
+        )
+        _state["aliases_loaded"] = False
+        _state["directory"] = {"season": season, "fetched_at": now}
+
+
+def team_directory_stale(max_age=TEAM_DIRECTORY_MAX_AGE):
+    """
+    Return True if the team directory is empty, was built for an earlier
+    season, or is older than max_age seconds. The database is only read
+    the first time; later calls check the remembered age in memory.
+    """
+    if not _state["directory"]:
+        season, fetched_at = _directory_age()
+        if season is None:
+            return True
+        _state["directory"] = {"season": season, "fetched_at": fetched_at}
+    if int(_state["directory"]["season"]) < datetime.date.today().year:
+        return True
+    return time.time() - _state["directory"]["fetched_at"] > max_age
+
+
+@timed("db")
+def _directory_age():
+    """Return the stored directory's (season, fetched_at), or (None, None) if it is empty."""
+    with connection(_settings["db_path"]) as conn:
+        return conn.execute("SELECT MIN(season), MIN(fetched_at) FROM team_directory").fetchone()
+
+
+def _alias_map():
+    """Return the in-memory alias -> team ID map, loading it from disk on first use."""
+    with connection(_settings["db_path"]) as conn:
+        if not _state["aliases_loaded"]:
+            rows = conn.execute("SELECT alias, team_id FROM team_alias").fetchall()
+            _aliases.clear()
+            _aliases.update(rows)
+            _state["aliases_loaded"] = True
+        return _aliases
+
+
+@timed("db")
+def find_team_id(team_name):
+    """
+    Resolve a team name, abbreviation or nickname to an MLB team ID.
+    Exact aliases are a dictionary hit; otherwise, of the aliases containing
+    the name, the shortest (then the lowest team ID) wins, so ambiguous
+    names always resolve the same way. Returns None if nothing matches.
+    """
+    key = normalize_name(team_name)
+    aliases = _alias_map()
+    if key in aliases:
+        return aliases[key]
+    candidates = [
+        (len(alias), team_id) for alias, team_id in aliases.items() if key and key in alias
+    ]
+    return min(candidates)[1] if candidates else None
+
+
+@timed("db")
+def search_teams(prefix):
+    """Return the full team names whose name starts with prefix."""
+    key = normalize_name(prefix)
+    with connection(_settings["db_path"]) as conn:
+        rows = conn.execute("SELECT name FROM team_directory ORDER BY name").fetchall()
+    return [row[0] for row in rows if normalize_name(row[0]).startswith(key)]
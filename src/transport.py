@@ -0,0 +1,348 @@
+"""HTTP transport for StatsAPI requests: live, record-to-fixtures, or replay-from-fixtures.
+
+Live requests share one pooled keep-alive session, are limited by a token
+bucket (requests per second) and a concurrency cap, are retried with
+jittered exponential backoff on 429/5xx responses and connection errors,
+and identical requests in flight at the same time are sent only once.
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from src.instrument import endpoint_name, span
+
+STATSAPI_BASE_URL = "https://statsapi.mlb.com"
+HTTP_POOL_SIZE = 32
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 30.0
+MAX_RETRIES = 4
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+RATE_LIMIT = 25.0  # requests per second; 0 disables the limit
+RATE_BURST = 50
+MAX_CONCURRENCY = HTTP_POOL_SIZE
+
+# Environment variables that configure the transport without CLI flags.
+API_URL_ENV = "BASEBALL_CLI_API_URL"
+RECORD_ENV = "BASEBALL_CLI_RECORD"
+REPLAY_ENV = "BASEBALL_CLI_REPLAY"
+
+_settings = {
+    "base_url": os.environ.get(API_URL_ENV, STATSAPI_BASE_URL),
+    "record_dir": os.environ.get(RECORD_ENV),
+    "replay_dir": os.environ.get(REPLAY_ENV),
+}
+_client = {
+    "connect_timeout": CONNECT_TIMEOUT,
+    "read_timeout": READ_TIMEOUT,
+    "max_retries": MAX_RETRIES,
+}
+_state = {"session": None, "bucket": None, "slots": threading.BoundedSemaphore(MAX_CONCURRENCY)}
+_session_lock = threading.Lock()
+
+
+class TransportError(IOError):
+    """A live StatsAPI request failed: it could not connect, timed out or was invalid."""
+
+
+# pylint: disable=too-few-public-methods
+class TokenBucket:
+    """
+    Token-bucket rate limiter: allows `rate` requests per second on
+    average, with bursts of up to `burst` requests. Thread-safe.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = float(burst or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# pylint: disable=too-few-public-methods
+class InflightCalls:
+    """
+    Runs identical concurrent calls once: a call whose key matches one
+    already running waits for that call's result (or exception) instead.
+    Thread-safe. `calls` and `coalesced` count calls made and shared.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def run(self, key, func):
+        """Return func()'s result, sharing it with identical calls made meanwhile."""
+        with self.lock:
+            self.calls += 1
+            pending = self.pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self.pending[key] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            return pending.result()
+        try:
+            result = func()
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.pending[key]
+        pending.set_result(result)
+        return result
+
+
+_inflight = InflightCalls()
+
+
+# pylint: disable=too-few-public-methods
+class ContextThreadPool(ThreadPoolExecutor):
+    """
+    A ThreadPoolExecutor whose tasks run in a copy of the submitting
+    thread's context, so context-local state such as the per-request
+    output streams of `baseball-cli serve` follows the work into the workers.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+class StoredResponse:
+    """
+    A minimal requests.Response stand-in holding a decoded body, used for
+    live, replayed and cached responses alike.
+    Exposes status_code, text, content, headers and json().
+    """
+
+    def __init__(self, status_code, text, headers=None, from_cache=False):
+        self.status_code = status_code
+        self.text = text
+        self.headers = dict(headers or {})
+        self.from_cache = from_cache
+
+    @property
+    def content(self):
+        """The body encoded as UTF-8, like requests.Response.content."""
+        return self.text.encode("utf-8")
+
+    def json(self):
+        """Decode the response body as JSON."""
+        with span("decode", "json", bytes=len(self.content)):
+            return json.loads(self.text)
+
+
+def configure_transport(base_url=None, record_dir=None, replay_dir=None):
+    """
+    Configure where StatsAPI requests go, replacing any earlier settings.
+    base_url points requests at another server (e.g. a local stub; None
+    for the StatsAPI itself); record_dir saves every live response as a
+    fixture file; replay_dir answers every request from fixture files
+    without the network.
+    """
+    _settings["base_url"] = (base_url or STATSAPI_BASE_URL).rstrip("/")
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+    _settings["record_dir"] = record_dir
+    _settings["replay_dir"] = replay_dir
+
+
+def using_fixtures():
+    """Return True while responses are recorded to or replayed from fixture files."""
+    return bool(_settings["record_dir"] or _settings["replay_dir"])
+
+
+# pylint: disable=too-many-arguments
+def configure_client(
+    *, rate_limit=None, burst=None, max_concurrency=None, connect_timeout=None,
+    read_timeout=None, max_retries=None,
+):
+    """
+    Tune the live HTTP client: requests per second (0 = unlimited) and
+    burst size, maximum concurrent requests, connect and read timeouts in
+    seconds, and how often 429/5xx responses and connection errors are
+    retried. Arguments left as None keep their current value.
+    """
+    if rate_limit is not None or burst is not None or _state["bucket"] is None:
+        rate = RATE_LIMIT if rate_limit is None else rate_limit
+        _state["bucket"] = TokenBucket(rate, burst or RATE_BURST) if rate > 0 else False
+    if max_concurrency is not None:
+        _state["slots"] = threading.BoundedSemaphore(max(1, max_concurrency))
+    for key, value in (
+        ("connect_timeout", connect_timeout),
+        ("read_timeout", read_timeout),
+        ("max_retries", max_retries),
+    ):
+        if value is not None:
+            _client[key] = value
+
+
+def get_session():
+    """
+    Return the process-wide requests session.
+    The session keeps up to HTTP_POOL_SIZE keep-alive connections so
+    concurrent workers reuse connections instead of reconnecting.
+    """
+    # requests is imported on first use: commands answered from the cache,
+    # fixtures or the local database never pay for loading it.
+    # pylint: disable=import-outside-toplevel
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _session_lock:
+        if _state["session"] is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _state["session"] = session
+    return _state["session"]
+
+
+def fixture_path(directory, url, params=None):
+    """Return the fixture file for a request; the name hashes the URL and sorted params."""
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    digest = hashlib.sha1(f"{url}?{query}".encode("utf-8")).hexdigest()
+    return os.path.join(directory, f"{digest}.json")
+
+
+def _rebase(url):
+    """Point a statsapi.mlb.com URL at the configured base URL."""
+    if url.startswith(STATSAPI_BASE_URL) and _settings["base_url"] != STATSAPI_BASE_URL:
+        return _settings["base_url"] + url[len(STATSAPI_BASE_URL) :]
+    return url
+
+
+def backoff_delay(attempt, response=None):
+    """
+    Seconds to wait before retry number `attempt` (0-based): the server's
+    Retry-After if it sent one, otherwise full-jitter exponential backoff.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def _live_get(url, params, timeout, info, headers=None):
+    """
+    GET a URL through the pooled session under the rate and concurrency
+    limits, retrying 429/5xx responses and connection errors.
+    Returns the last requests.Response; raises TransportError if every
+    attempt failed to connect or the request is invalid.
+    """
+    import requests  # pylint: disable=import-outside-toplevel
+
+    if _state["bucket"] is None:
+        configure_client()
+    timeout = timeout or (_client["connect_timeout"], _client["read_timeout"])
+    attempt = 0
+    while True:
+        if _state["bucket"]:
+            _state["bucket"].acquire()
+        try:
+            with _state["slots"]:
+                res = get_session().get(
+                    _rebase(url), params=params, timeout=timeout, headers=headers
+                )
+        except requests.exceptions.RequestException as e:
+            retryable = isinstance(
+                e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            )
+            if not retryable or attempt >= _client["max_retries"]:
+                raise TransportError(str(e)) from e
+            delay = backoff_delay(attempt)
+        else:
+            if res.status_code not in RETRY_STATUSES or attempt >= _client["max_retries"]:
+                return res
+            delay = backoff_delay(attempt, res)
+        attempt += 1
+        info["retries"] = attempt
+        time.sleep(delay)
+
+
+def _fetch(url, params, timeout, headers=None):
+    """Send one request through the configured transport and return a StoredResponse."""
+    with span("network", endpoint_name(url)) as info:
+        if _settings["replay_dir"]:
+            info["source"] = "replay"
+            path = fixture_path(_settings["replay_dir"], url, params)
+            if not os.path.exists(path):
+                info["status"] = 404
+                return StoredResponse(404, f"No recorded fixture for {url} {params or ''}")
+            with open(path, encoding="utf-8") as f:
+                fixture = json.load(f)
+            info.update(status=fixture["status_code"], bytes=len(fixture["body"].encode("utf-8")))
+            return StoredResponse(fixture["status_code"], fixture["body"])
+        res = _live_get(url, params, timeout, info, headers)
+        info.update(
+            status=res.status_code,
+            bytes=len(res.content),
+            server_ms=round(res.elapsed.total_seconds() * 1000, 3),
+        )
+    if _settings["record_dir"] and res.status_code != 304:
+        fixture = {
+            "url": url,
+            "params": params or {},
+            "status_code": res.status_code,
+            "body": res.text,
+        }
+        path = fixture_path(_settings["record_dir"], url, params)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f)
+    return StoredResponse(res.status_code, res.text, headers=res.headers)
+
+
+def send(url, params=None, timeout=None):
+    """
+    Send a GET request through the configured transport.
+    Returns a StoredResponse. In replay mode a missing fixture is reported
+    as a 404 response. timeout defaults to the configured (connect, read)
+    timeouts. A request identical to one already in flight waits for that
+    request's response instead of being sent again.
+    """
+    return _inflight.run(fixture_path("", url, params), lambda: _fetch(url, params, timeout))
+
+
+def conditional_get(url, params=None, etag=None, last_modified=None):
+    """
+    Send a GET request that bypasses the response cache and in-flight
+    sharing, with If-None-Match/If-Modified-Since validators taken from
+    an earlier response. Returns a StoredResponse; status 304 means the
+    resource has not changed since.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return _fetch(url, params, None, headers or None)
@@ -1,167 +1,287 @@
 """Utility functions for the Fantasy Baseball CLI, including API calls, formatting, and scoring."""
 
-import requests
+
+from src.cache import cached_get
+from src.instrument import timed
+from src.player_index import find_player_id, find_player_name, store_players
+from src.stats import PlayerStats, stat_groups_from_api
+from src.team_index import find_team_id, store_teams, team_directory_stale
+from src.transport import ContextThreadPool, TransportError
+
+PEOPLE_CHUNK_SIZE = 50
+
+
+def api_get(url, params=None, what="data", get=cached_get):
+    """
+    GET a StatsAPI URL (through the response cache unless another get
+    function is given) and decode the JSON body.
+    Connection failures, error statuses and undecodable bodies are printed,
+    naming `what` was being fetched, and return None.
+    """
+    try:
+        res = get(url, params=params)
+    except TransportError as e:
+        print(f"Error fetching {what}: {e}")
+        return None
+    if not handle_api_error(res):
+        return None
+    try:
+        return res.json()
+    except ValueError as e:
+        print(f"Invalid response for {what}: {e}")
+        return None
 
 
 def lookup_player_id(name):
-    """Get a player's name from their MLB player ID."""
+    """
+    Get a player's MLB player ID from their name.
+    The local player index is consulted first; the StatsAPI search is only
+    used on a miss, and its answer is added to the index.
+    """
+    player_id = find_player_id(name)
+    if player_id:
+        return player_id
     url = "https://statsapi.mlb.com/api/v1/people/search"
-    params = {"names": [name]}
-    res = requests.get(url, params=params, timeout=120)
-    data = res.json()
-    if "people" in data and data["people"]:
-        return data["people"][0]["id"]
+    data = api_get(url, params={"names": [name]}, what=f"player '{name}'")
+    if data and data.get("people"):
+        person = data["people"][0]
+        store_players([{"player_id": person["id"], "full_name": person["fullName"]}])
+        return person["id"]
     return None
 
 
+def lookup_player_ids(names, jobs=1):
+    """
+    Resolve many player names at once. Each distinct name is looked up
+    once (index first, then the StatsAPI), by up to `jobs` concurrent
+    workers. Returns a list of (name, player_id or None) in input order.
+    """
+    unique_names = list(dict.fromkeys(names))
+    with ContextThreadPool(max_workers=max(1, jobs)) as pool:
+        return list(zip(unique_names, pool.map(lookup_player_id, unique_names)))
+
+
 def lookup_player_name(player_id):
-    """Get a player's MLB player ID from their name."""
+    """
+    Get a player's name from their MLB player ID.
+    Answered from the local player index when possible.
+    """
+    player_name = find_player_name(player_id)
+    if player_name:
+        return player_name
     url = "https://statsapi.mlb.com/api/v1/people/search"
-    params = {"personIds": [player_id]}
-    res = requests.get(url, params=params, timeout=120)
-    data = res.json()
-    if "people" in data and data["people"]:
-        return data["people"][0]["fullName"]
+    data = api_get(url, params={"personIds": [player_id]}, what=f"player ID {player_id}")
+    if data and data.get("people"):
+        person = data["people"][0]
+        store_players([{"player_id": person["id"], "full_name": person["fullName"]}])
+        return person["fullName"]
     return None
 
 
-def format_player_stats(player_dict):
-    """Nicely format player stats."""
+def format_stat_groups(groups):
+    """Format StatGroups as indented "stat: value" lines under a "Type Group" heading."""
     lines = []
-    lines.append(
-        f"{player_dict['fullName']} ({player_dict['primaryPosition']['name']})"
-    )
-    lines.append("")
-
-    for stat_group in player_dict.get("stats", []):
-        group_name = stat_group["group"]["displayName"].capitalize()
-        type_name = stat_group["type"]["displayName"].capitalize()
-        lines.append(f"{type_name} {group_name}")
-        for split in stat_group.get("splits", []):
-            stat = split.get("stat", {})
-            for k, v in stat.items():
+    for stat_group in groups:
+        lines.append(
+            f"{stat_group.stat_type.capitalize()} {stat_group.group.capitalize()}"
+        )
+        for split in stat_group.splits:
+            for k, v in split.stat.items():
                 if isinstance(v, dict):
                     continue
                 lines.append(f"    {k}: {v}")
             lines.append("")
+    return lines
+
+
+@timed("format")
+def format_player_stats(player):
+    """Nicely format player stats from a PlayerStats (or a raw /people player dict)."""
+    if isinstance(player, dict):
+        player = PlayerStats.from_api(player)
+    lines = [f"{player.full_name} ({player.position})", ""]
+    lines.extend(format_stat_groups(player.groups.values()))
     return "\n".join(lines)
 
 
 def fetch_player_stats(player_id, season=None):
     """
-    Fetch player statistics for a specific season or career.
-    Returns a formatted string for career, or a formatted dict for a specific season.
+    Fetch player statistics for a specific season, or career stats if no
+    season is given.
+    Returns a PlayerStats, or None if the player could not be fetched.
     """
-    try:
-        if season:
-            url = f"https://statsapi.mlb.com/api/v1/people/{player_id}"
-            params = {
-                "hydrate": f"stats(group=[hitting,pitching,fielding],type=season,season={season})",
-                "season": season,
-            }
-            res = requests.get(url, params=params, timeout=120)
-            if res.status_code != 200:
-                print(f"API Error: {res.status_code} - {res.text}")
-                return None
-            data = res.json()
-            if "people" in data and data["people"]:
-                return format_player_stats(data["people"][0])
-            else:
-                print("No player data found.")
-                return None
-        else:
-            url = f"https://statsapi.mlb.com/api/v1/people/{player_id}"
-            params = {"hydrate": "stats(group=[hitting,pitching,fielding],type=career)"}
-            res = requests.get(url, params=params, timeout=120)
-            if res.status_code != 200:
-                print(f"API Error: {res.status_code} - {res.text}")
-                return None
-            data = res.json()
-            if "people" in data and data["people"]:
-                return format_player_stats(data["people"][0])
-            else:
-                print("No player data found.")
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching stats for player ID {player_id}: {e}")
+    url = f"https://statsapi.mlb.com/api/v1/people/{player_id}"
+    data = api_get(
+        url, params=player_stats_params(season), what=f"stats for player ID {player_id}"
+    )
+    if data is None:
         return None
+    if data.get("people"):
+        return PlayerStats.from_api(data["people"][0])
+    print("No player data found.")
+    return None
+
+
+def player_stats_params(season=None):
+    """
+    Build the /people query parameters hydrating season stats, or career
+    stats if no season is given.
+    """
+    if season:
+        return {
+            "hydrate": f"stats(group=[hitting,pitching,fielding],type=season,season={season})",
+            "season": season,
+        }
+    return {"hydrate": "stats(group=[hitting,pitching,fielding],type=career)"}
+
+
+def fetch_people(player_ids, params, get=cached_get):
+    """
+    Fetch several players from /api/v1/people in one request, with extra
+    query params (e.g. a stats hydrate). get is the GET function to use,
+    cached_get by default. Returns a list of player dicts, empty on error.
+    """
+    url = "https://statsapi.mlb.com/api/v1/people"
+    params = dict(params)
+    params["personIds"] = ",".join(str(pid) for pid in player_ids)
+    data = api_get(url, params=params, what=f"player IDs {params['personIds']}", get=get)
+    return data.get("people", []) if data else []
+
+
+def _fetch_people_chunk(chunk, season):
+    """Fetch one chunk of players with hydrated stats. Returns a list of player dicts."""
+    return fetch_people(chunk, player_stats_params(season))
+
+
+def iter_player_chunks(player_ids, season=None, chunk_size=PEOPLE_CHUNK_SIZE, jobs=1):
+    """
+    Fetch hydrated stats for many players using chunked multi-id requests
+    to /api/v1/people (season stats, or career stats if no season is given).
+    Chunks are fetched by up to `jobs` concurrent workers and yielded in
+    input order as soon as each is available, as lists of
+    (player_id, PlayerStats or None) pairs. Duplicate IDs are fetched once.
+    """
+    unique_ids = list(dict.fromkeys(int(pid) for pid in player_ids))
+    chunks = [
+        unique_ids[i : i + chunk_size] for i in range(0, len(unique_ids), chunk_size)
+    ]
+    with ContextThreadPool(max_workers=max(1, jobs)) as pool:
+        results = pool.map(lambda chunk: _fetch_people_chunk(chunk, season), chunks)
+        for chunk, people in zip(chunks, results):
+            found = {person["id"]: PlayerStats.from_api(person) for person in people}
+            yield [(player_id, found.get(player_id)) for player_id in chunk]
+
+
+def fetch_players(player_ids, season=None, chunk_size=PEOPLE_CHUNK_SIZE, jobs=1):
+    """
+    Fetch hydrated stats for many players with batched requests (see
+    iter_player_chunks).
+    Returns a dict mapping player ID to a PlayerStats; players the API
+    did not return are missing from the dict.
+    """
+    players = {}
+    for chunk in iter_player_chunks(player_ids, season, chunk_size, jobs):
+        players.update((player_id, player) for player_id, player in chunk if player)
+    return players
+
+
+def fetch_teams(sport_id=1):
+    """
+    Fetch the list of teams for a sport (1 = MLB) from /api/v1/teams.
+    Returns a list of team dictionaries or None on an API error.
+    """
+    url = "https://statsapi.mlb.com/api/v1/teams"
+    data = api_get(url, params={"sportId": sport_id}, what="the team list")
+    return data.get("teams", []) if data is not None else None
 
 
 def lookup_team_id(team_name):
     """
-    Lookup a team's MLB ID by its name (case-insensitive, supports partial matches).
+    Lookup a team's MLB ID by its name, abbreviation or nickname
+    (case-insensitive, supports partial matches).
+    Resolved from the local team directory, which is re-downloaded only
+    when it is missing, from an earlier season, or older than 30 days.
     """
-    teams_url = "https://statsapi.mlb.com/api/v1/teams"
-    teams_res = requests.get(teams_url, timeout=120)
-    if teams_res.status_code != 200:
-        print(f"API Error: {teams_res.status_code} - {teams_res.text}")
-        return None
-    teams_data = teams_res.json()
-    team_name_lower = team_name.lower()
-    for team in teams_data.get("teams", []):
-        if (
-            team_name_lower == team["name"].lower()
-            or team_name_lower == team.get("teamName", "").lower()
-            or team_name_lower == team.get("locationName", "").lower()
-            or team_name_lower in team["name"].lower()
-            or team_name_lower in team.get("teamName", "").lower()
-        ):
-            return team["id"]
-    print(f"Team '{team_name}' not found.")
-    return None
+    if team_directory_stale():
+        teams = fetch_teams()
+        if teams is None:
+            return None
+        store_teams(teams)
+    team_id = find_team_id(team_name)
+    if team_id is None:
+        print(f"Team '{team_name}' not found.")
+    return team_id
+
+
+def lookup_team_ids(names):
+    """
+    Resolve many team names at once against the local team directory
+    (refreshed at most once). Returns a list of (name, team_id or None)
+    in input order, one per distinct name.
+    """
+    return [(name, lookup_team_id(name)) for name in dict.fromkeys(names)]
 
 
+@timed("format")
 def format_team_stats(stats):
     """
     Nicely format team stats from the /api/v1/teams/{teamId}/stats endpoint.
+    Accepts the raw "stats" list or StatGroups.
     """
     if not stats:
         return "No stats available."
+    if isinstance(stats, list):
+        stats = stat_groups_from_api(stats).values()
+    return "\n".join(format_stat_groups(stats))
 
-    lines = []
-    for stat_group in stats:
-        group_name = stat_group.get("group", {}).get("displayName", "").capitalize()
-        type_name = stat_group.get("type", {}).get("displayName", "").capitalize()
-        lines.append(f"{type_name} {group_name}")
-        for split in stat_group.get("splits", []):
-            stat = split.get("stat", {})
-            for k, v in stat.items():
-                if isinstance(v, dict):
-                    continue
-                lines.append(f"    {k}: {v}")
-            lines.append("")
-    return "\n".join(lines)
+
+def team_stats_request(
+    team_id, season=None, group="hitting,pitching,fielding", stats_type="season"
+):
+    """Return the (url, params) of a team's /api/v1/teams/{teamId}/stats request."""
+    url = f"https://statsapi.mlb.com/api/v1/teams/{team_id}/stats"
+    return url, {"stats": stats_type, "group": group, "season": season or "2025"}
+
+
+def fetch_team_stat_groups(
+    team_id, season=None, group="hitting,pitching,fielding", stats_type="season"
+):
+    """
+    Fetch team stats using /api/v1/teams/{teamId}/stats endpoint.
+    Defaults to season 2025 if not specified.
+    Returns StatGroups keyed by (group, type), or None on an API error.
+    """
+    stats_url, params = team_stats_request(team_id, season, group, stats_type)
+    data = api_get(stats_url, params=params, what=f"stats for team {team_id}")
+    if data is None:
+        return None
+    return stat_groups_from_api(data.get("stats", []))
+
+
+def iter_team_stat_groups(team_ids, season=None, jobs=1):
+    """
+    Fetch season stats for many teams with up to `jobs` concurrent requests.
+    Yields (team_id, StatGroups or None) in input order as each arrives.
+    """
+    with ContextThreadPool(max_workers=max(1, jobs)) as pool:
+        results = pool.map(lambda team_id: fetch_team_stat_groups(team_id, season), team_ids)
+        yield from zip(team_ids, results)
 
 
 def fetch_team_stats(
     team_name, season=None, group="hitting,pitching,fielding", stats_type="season"
 ):
     """
-    Fetch team stats using /api/v1/teams/{teamId}/stats endpoint.
+    Fetch and print team stats using /api/v1/teams/{teamId}/stats endpoint.
     Defaults to season 2025 if not specified.
     """
-    if not season:
-        season = "2025"
     team_id = lookup_team_id(team_name)
     if not team_id:
         return f"Team '{team_name}' not found."
-    stats_url = f"https://statsapi.mlb.com/api/v1/teams/{team_id}/stats"
-    params = {"stats": stats_type, "group": group, "season": season}
-    stats_res = requests.get(stats_url, params=params, timeout=120)
-    if stats_res.status_code != 200:
-        return f"API Error: {stats_res.status_code} - {stats_res.text}"
-    stats_data = dict(stats_res.json())
-    return print(format_team_stats(stats_data.get("stats", [])))
-
-
-def parse_stats(stats_str):
-    """Parse all key-value pairs in the stats string into a dictionary."""
-    lines = stats_str.splitlines()
-    stats = {}
-    for line in lines:
-        if ":" in line:
-            key, value = line.split(":", 1)
-            stats[key.strip()] = value.strip()
-    return stats
+    stat_groups = fetch_team_stat_groups(team_id, season, group, stats_type)
+    if stat_groups is None:
+        return None
+    return print(format_team_stats(stat_groups.values()))
 
 
 def handle_api_error(response):
@@ -172,59 +292,24 @@ def handle_api_error(response):
     return True
 
 
-def calculate_fantasy_score(players_stats):
+def calculate_fantasy_score(player, profile=None):
     """
-    Calculate the total fantasy score for a using a custom fantasy scoring system.
-    Accepts a single dict or a list of dicts.
+    Calculate one player's fantasy score using a scoring profile (the
+    default preset if None).
+    Accepts a PlayerStats or a {group: [stat dicts]} mapping such as
+    {"hitting": [...], "pitching": [...]}; only the profile's groups are
+    scored, so fielding lines never count as batting.
     Returns the total fantasy score (float).
     """
-    scoring = {
-        # Batting
-        "runs": 1,  # R
-        "totalBases": 1,  # TB
-        "rbi": 1,  # RBI
-        "baseOnBalls": 1,  # BB
-        "strikeOuts": -1,  # K
-        "stolenBases": 1,  # SB
-        # Pitching
-        "inningsPitched": 3,  # IP
-        "hits": -1,  # H
-        "earnedRuns": -2,  # ER
-        "holds": 2,  # HD
-        "pitchingBaseOnBalls": -1,  # BB
-        "pitchingStrikeOuts": 1,  # K
-        "wins": 2,  # W
-        "losses": -2,  # L
-        "saves": 2,  # SV
-    }
-
-    if isinstance(players_stats, dict):
-        stats_list = [players_stats]
-    else:
-        stats_list = players_stats
-
-    total = 0.0
-    for stats in stats_list:
-        # Batting
-        total += scoring["runs"] * float(stats.get("runs", 0))
-        total += scoring["totalBases"] * float(stats.get("totalBases", 0))
-        total += scoring["rbi"] * float(stats.get("rbi", 0))
-        total += scoring["baseOnBalls"] * float(stats.get("baseOnBalls", 0))
-        total += scoring["strikeOuts"] * float(stats.get("strikeOuts", 0))
-        total += scoring["stolenBases"] * float(stats.get("stolenBases", 0))
-        # Pitching
-        total += scoring["inningsPitched"] * float(stats.get("inningsPitched", 0))
-        total += scoring["hits"] * float(stats.get("hits", 0))
-        total += scoring["earnedRuns"] * float(stats.get("earnedRuns", 0))
-        total += scoring["holds"] * float(stats.get("holds", 0))
-        # For pitching walks and strikeouts, try to distinguish if possible
-        # If not, use baseOnBalls and strikeOuts for both
-        total += scoring["pitchingBaseOnBalls"] * float(stats.get("baseOnBalls", 0))
-        total += scoring["pitchingStrikeOuts"] * float(stats.get("strikeOuts", 0))
-        total += scoring["wins"] * float(stats.get("wins", 0))
-        total += scoring["losses"] * float(stats.get("losses", 0))
-        total += scoring["saves"] * float(stats.get("saves", 0))
-    return total
+    # NumPy-backed scoring is only loaded by the commands that score.
+    from src.scoring import score_players  # pylint: disable=import-outside-toplevel
+
+    return float(score_players([player], profile)[0])
+
+
+def team_roster_request(team_id, season=None):
+    """Return the (url, params) of a team's /api/v1/teams/{teamId}/roster request."""
+    return f"https://statsapi.mlb.com/api/v1/teams/{team_id}/roster", {"season": season or "2025"}
 
 
 def fetch_team_roster(team_id, season=None):
@@ -233,17 +318,18 @@ def fetch_team_roster(team_id, season=None):
     If season is not provided, defaults to 2025.
     Returns a list of player dictionaries or None if not found.
     """
-    if season is None:
-        season = "2025"
-    url = f"https://statsapi.mlb.com/api/v1/teams/{team_id}/roster"
-    params = {"season": season}
-    try:
-        res = requests.get(url, params=params, timeout=120)
-        if res.status_code != 200:
-            print(f"API Error: {res.status_code} - {res.text}")
-            return None
-        data = res.json()
-        return data.get("roster", [])
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching roster for team {team_id} in season {season}: {e}")
-        return
+    url, params = team_roster_request(team_id, season)
+    data = api_get(
+        url, params=params, what=f"roster for team {team_id} in season {params['season']}"
+    )
+    return data.get("roster", []) if data is not None else None
+
+
+def iter_team_rosters(team_ids, season=None, jobs=1):
+    """
+    Fetch many teams' rosters with up to `jobs` concurrent requests.
+    Yields (team_id, roster list or None) in input order as each arrives.
+    """
+    with ContextThreadPool(max_workers=max(1, jobs)) as pool:
+        results = pool.map(lambda team_id: fetch_team_roster(team_id, season), team_ids)
+        yield from zip(team_ids, results)
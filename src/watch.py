@@ -0,0 +1,195 @@
+"""Watch mode: poll team rosters and stats, printing only what changed.
+
+Each poll is a conditional request (If-None-Match/If-Modified-Since when
+the API sent an ETag or Last-Modified) so an unchanged resource costs a
+bodiless 304; responses without validators are compared by content hash.
+Polls of many teams are staggered over the interval and stretched to stay
+within a request budget.
+"""
+
+import hashlib
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from src.stats import stat_groups_from_api
+from src.transport import TransportError, conditional_get
+from src.utils import team_roster_request, team_stats_request
+
+# Polls per minute across all watched teams.
+WATCH_BUDGET = 60
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class WatchTarget:
+    """
+    One polled resource: its request, how to reduce a response to a
+    comparable state and how to describe the changes between two states,
+    plus the validators and state of the last response.
+    """
+
+    label: str
+    url: str
+    params: dict
+    parse: Callable[[dict], dict]
+    changes: Callable[[dict, dict], list]
+    noun: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    digest: Optional[str] = None
+    state: Optional[Any] = None
+    counts: dict = field(
+        default_factory=lambda: {"polls": 0, "not_modified": 0, "changed": 0, "bytes": 0}
+    )
+
+
+def roster_state(data):
+    """Reduce a roster response to {player_id: (name, jersey number, position)}."""
+    return {
+        entry["person"]["id"]: (
+            entry["person"].get("fullName", ""),
+            entry.get("jerseyNumber", ""),
+            entry.get("position", {}).get("abbreviation", ""),
+        )
+        for entry in data.get("roster", [])
+    }
+
+
+def roster_changes(old, new):
+    """Describe players added to, removed from or moved within a roster."""
+    lines = []
+    for player_id, (name, jersey, position) in new.items():
+        if player_id not in old:
+            lines.append(f"+ {name} (#{jersey}) - {position}")
+        elif old[player_id] != (name, jersey, position):
+            _, old_jersey, old_position = old[player_id]
+            lines.append(f"~ {name}: #{old_jersey} {old_position} -> #{jersey} {position}")
+    lines.extend(f"- {old[player_id][0]}" for player_id in old if player_id not in new)
+    return lines
+
+
+def team_stats_state(data):
+    """Reduce a team stats response to {"group.stat": value}."""
+    state = {}
+    for (group, _), stat_group in stat_groups_from_api(data.get("stats", [])).items():
+        for split in stat_group.splits:
+            for stat, value in split.stat.items():
+                if not isinstance(value, (dict, list)):
+                    state[f"{group}.{stat}"] = value
+    return state
+
+
+def stat_changes(old, new):
+    """Describe stats that moved, appeared or disappeared."""
+    return [
+        f"{stat}: {old.get(stat, '-')} -> {new.get(stat, '-')}"
+        for stat in sorted(old.keys() | new.keys())
+        if old.get(stat) != new.get(stat)
+    ]
+
+
+def roster_target(team_id, team_name, season=None):
+    """Build the WatchTarget for a team's roster."""
+    url, params = team_roster_request(team_id, season)
+    return WatchTarget(
+        f"{team_name} roster", url, params, roster_state, roster_changes, "players"
+    )
+
+
+def team_stats_target(team_id, team_name, season=None):
+    """Build the WatchTarget for a team's season stats."""
+    url, params = team_stats_request(team_id, season)
+    return WatchTarget(
+        f"{team_name} stats", url, params, team_stats_state, stat_changes, "stats"
+    )
+
+
+def poll(target):
+    """
+    Poll a target once. Returns the lines describing what changed since
+    the last poll (empty if nothing did), or None for the first response,
+    which only establishes the baseline.
+    """
+    target.counts["polls"] += 1
+    try:
+        res = conditional_get(target.url, target.params, target.etag, target.last_modified)
+    except TransportError as e:
+        return [f"error: {e}"]
+    if res.status_code == 304:
+        target.counts["not_modified"] += 1
+        return []
+    target.counts["bytes"] += len(res.content)
+    if res.status_code != 200:
+        return [f"error: HTTP {res.status_code}"]
+    target.etag = res.headers.get("ETag")
+    target.last_modified = res.headers.get("Last-Modified")
+    digest = hashlib.sha1(res.text.encode("utf-8")).hexdigest()
+    if digest == target.digest:
+        return []
+    try:
+        state = target.parse(res.json())
+    except ValueError as e:
+        return [f"error: invalid response: {e}"]
+    first = target.state is None
+    lines = [] if first else target.changes(target.state, state)
+    target.digest, target.state = digest, state
+    if lines:
+        target.counts["changed"] += 1
+    return None if first else lines
+
+
+def poll_schedule(count, interval, budget=WATCH_BUDGET):
+    """
+    Return (period, offsets) for polling `count` targets: the seconds
+    between two polls of one target (the interval, stretched so all
+    targets together stay within `budget` polls per minute, 0 for no
+    limit) and each target's offset, spreading the polls evenly over the
+    period.
+    """
+    period = max(interval, count * 60.0 / budget) if budget else interval
+    return period, [i * period / count for i in range(count)]
+
+
+def watch(targets, interval, budget=WATCH_BUDGET, max_polls=None):
+    """
+    Poll targets on a staggered schedule, printing a baseline line for
+    each and then only the changes, until interrupted (or max_polls polls).
+    Prints a summary of requests, 304s and bytes downloaded at the end.
+    """
+    period, offsets = poll_schedule(len(targets), interval, budget)
+    if period > interval:
+        print(
+            f"Polling each of {len(targets)} targets every {period:.0f}s "
+            f"to stay within {budget} requests per minute."
+        )
+    start = time.monotonic()
+    queue = [(start + offset, i) for i, offset in enumerate(offsets)]
+    heapq.heapify(queue)
+    polls = 0
+    try:
+        while queue and (max_polls is None or polls < max_polls):
+            due, i = heapq.heappop(queue)
+            time.sleep(max(0.0, due - time.monotonic()))
+            target = targets[i]
+            lines = poll(target)
+            polls += 1
+            stamp = time.strftime("%H:%M:%S")
+            if lines is None:
+                print(f"[{stamp}] {target.label}: watching {len(target.state)} {target.noun}.")
+            for line in lines or []:
+                print(f"[{stamp}] {target.label}: {line}")
+            heapq.heappush(queue, (due + period, i))
+    except KeyboardInterrupt:
+        print()
+    print_watch_summary(targets)
+
+
+def print_watch_summary(targets):
+    """Print how many polls were made, how many came back unchanged and the bytes downloaded."""
+    totals = {key: sum(t.counts[key] for t in targets) for key in targets[0].counts}
+    print(
+        f"Watched {len(targets)}: {totals['polls']} polls, {totals['changed']} with changes, "
+        f"{totals['not_modified']} not modified (304), {totals['bytes']} bytes downloaded."
+    )